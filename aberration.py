@@ -0,0 +1,191 @@
+# ---------------------------------------------------------
+# 이상 징후(유행) 탐지
+# - CDC EARS C1 / C2 / C3 + CUSUM을 (질병 × 월) 행렬 전체에 한 번에 적용
+# - 마지막 상태(최근 9개월 창, C2 꼬리, CUSUM 누적값)를 저장해 두고,
+#   새 월이 추가되면 새 열만 갱신 (과거 재계산 없음)
+# - 전 기간 0건인 행은 스캔하지 않고 0건 시계열 한 행의 결과를 복사 (scan_active)
+# ---------------------------------------------------------
+import hashlib
+import os
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+BASELINE = 7          # 기준선 길이 (개월)
+C2_LAG = 2            # C2/C3 기준선과 현재 사이 간격 (개월)
+WINDOW = BASELINE + C2_LAG
+MIN_SD = 1.0          # 0건이 이어지는 시계열에서 0으로 나누지 않도록 표준편차 하한
+C1_THRESHOLD = 3.0
+C2_THRESHOLD = 3.0
+C3_THRESHOLD = 2.0
+CUSUM_K = 0.5
+CUSUM_H = 4.0
+METHODS = ("c1", "c2", "c3", "cusum")
+
+# 최근 월 기준 탐지 결과 (배열은 모두 길이 = 행 수)
+ScanState = namedtuple("ScanState", ["names", "last_period", "window", "c2_tail", "cusum", "c1", "c2", "c3"])
+
+
+def _z(x, baseline):
+    mean = baseline.mean(axis=-1)
+    sd = baseline.std(axis=-1, ddof=1) if baseline.shape[-1] > 1 else np.zeros_like(mean)
+    return (x - mean) / np.maximum(sd, MIN_SD)
+
+
+def _c3(c2_recent):
+    # 최근 3개월 C2 중 1을 넘는 부분의 합
+    return np.nansum(np.maximum(c2_recent - 1.0, 0.0), axis=-1) \
+        + np.where(np.isnan(c2_recent).all(axis=-1), np.nan, 0.0)
+
+
+def ears(matrix):
+    """(행 × 월) 건수 행렬 전체의 C1 / C2 / C3 통계를 계산합니다. 기준선이 부족한 칸은 NaN."""
+    x = np.asarray(matrix, dtype=float)
+    rows, months = x.shape
+    c1 = np.full((rows, months), np.nan)
+    c2 = np.full((rows, months), np.nan)
+    if months > BASELINE:
+        windows = sliding_window_view(x, BASELINE, axis=1)   # windows[:, j] = x[:, j:j+7]
+        c1[:, BASELINE:] = _z(x[:, BASELINE:], windows[:, :months - BASELINE])
+        if months > WINDOW:
+            c2[:, WINDOW:] = _z(x[:, WINDOW:], windows[:, :months - WINDOW])
+
+    c3 = np.full((rows, months), np.nan)
+    if months >= 3:
+        recent = sliding_window_view(c2, 3, axis=1)            # recent[:, j] = c2[:, j:j+3]
+        c3[:, 2:] = _c3(recent)
+    return c1, c2, c3
+
+
+def cusum(c1):
+    """C1 표준화 값에 대한 상방 CUSUM (월 방향으로만 누적, 질병 방향은 벡터 연산)."""
+    s = np.zeros(c1.shape[0])
+    out = np.zeros_like(c1)
+    for t in range(c1.shape[1]):
+        s = np.maximum(0.0, s + np.nan_to_num(c1[:, t]) - CUSUM_K)
+        out[:, t] = s
+    return out
+
+
+def scan(names, periods, matrix):
+    """행렬 전체를 스캔해 최근 월 기준 상태를 반환합니다."""
+    x = np.asarray(matrix, dtype=float)
+    c1, c2, c3 = ears(x)
+    s = cusum(c1)
+    pad = max(WINDOW - x.shape[1], 0)
+    window = np.pad(x, ((0, 0), (pad, 0)), constant_values=np.nan)[:, -WINDOW:]
+    c2_tail = np.pad(c2, ((0, 0), (max(2 - c2.shape[1], 0), 0)), constant_values=np.nan)[:, -2:]
+    if x.shape[1] == 0:
+        empty = np.full(x.shape[0], np.nan)
+        return ScanState(tuple(names), None, window, c2_tail, np.zeros(x.shape[0]), empty, empty, empty)
+    return ScanState(tuple(names), periods[-1], window, c2_tail,
+                     s[:, -1], c1[:, -1], c2[:, -1], c3[:, -1])
+
+
+def update(state, period, counts):
+    """새 월 하나(counts: 행별 건수)를 반영한 상태를 반환합니다. O(행 수)."""
+    x = np.asarray(counts, dtype=float)
+    window = state.window
+    has_c1 = ~np.isnan(window[:, -BASELINE:]).any(axis=1)
+    has_c2 = ~np.isnan(window[:, :BASELINE]).any(axis=1)
+    c1 = np.where(has_c1, _z(x, np.nan_to_num(window[:, -BASELINE:])), np.nan)
+    c2 = np.where(has_c2, _z(x, np.nan_to_num(window[:, :BASELINE])), np.nan)
+    c3 = _c3(np.column_stack([state.c2_tail, c2]))
+    s = np.maximum(0.0, state.cusum + np.nan_to_num(c1) - CUSUM_K)
+    return ScanState(state.names, period,
+                     np.column_stack([window[:, 1:], x]),
+                     np.column_stack([state.c2_tail[:, 1:], c2]),
+                     s, c1, c2, c3)
+
+
+def flags(state):
+    """방법별 경보 여부 (NaN은 경보 아님)."""
+    with np.errstate(invalid='ignore'):
+        return {
+            "c1": np.nan_to_num(state.c1) >= C1_THRESHOLD,
+            "c2": np.nan_to_num(state.c2) >= C2_THRESHOLD,
+            "c3": np.nan_to_num(state.c3) >= C3_THRESHOLD,
+            "cusum": state.cusum >= CUSUM_H,
+        }
+
+
+def alarm_counts(state):
+    return np.sum([f for f in flags(state).values()], axis=0).astype(int)
+
+
+def scan_active(names, periods, matrix, state_path=None):
+    """신고가 있는 행만 스캔하고(state_path가 있으면 증분), 전부 0인 행은 0건 시계열의 결과로 채웁니다.
+
+    결과는 전체 행을 스캔한 것과 같습니다.
+    """
+    names = tuple(names)
+    matrix = np.asarray(matrix)
+    active = np.flatnonzero(matrix.any(axis=1))
+    if len(active) == len(names):
+        return scan_incremental(names, periods, matrix, state_path) if state_path else scan(names, periods, matrix)
+
+    active_names = [names[i] for i in active]
+    part = scan_incremental(active_names, periods, matrix[active], state_path) if state_path \
+        else scan(active_names, periods, matrix[active])
+    quiet = scan(("",), periods, np.zeros((1, matrix.shape[1])))
+
+    def fill(template, values):
+        out = np.repeat(template, len(names), axis=0)
+        out[active] = values
+        return out
+
+    return ScanState(names, part.last_period if len(active) else quiet.last_period,
+                     *(fill(getattr(quiet, f), getattr(part, f)) for f in ScanState._fields[2:]))
+
+
+# ---------------------------------------------------------
+# 증분 스캔 (상태 파일 저장/재사용)
+# ---------------------------------------------------------
+def _history_key(names, matrix):
+    h = hashlib.sha256("|".join(names).encode('utf-8'))
+    h.update(np.ascontiguousarray(matrix, dtype=np.int64).tobytes())
+    return h.hexdigest()[:16]
+
+
+def save_state(path, state, history_key):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, names=np.array(state.names, dtype=object), last_period=np.array(state.last_period),
+             window=state.window, c2_tail=state.c2_tail, cusum=state.cusum,
+             c1=state.c1, c2=state.c2, c3=state.c3, history_key=np.array(history_key))
+    os.replace(tmp, path)
+
+
+def load_state(path):
+    try:
+        with np.load(path, allow_pickle=True) as f:
+            state = ScanState(tuple(f["names"]), f["last_period"][()], f["window"], f["c2_tail"],
+                              f["cusum"], f["c1"], f["c2"], f["c3"])
+            return state, str(f["history_key"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def scan_incremental(names, periods, matrix, state_path):
+    """저장된 상태가 현재 데이터의 앞부분과 같으면 새 월만 갱신하고, 아니면 전체를 스캔합니다."""
+    names = tuple(names)
+    periods = np.asarray(periods, dtype='datetime64[M]')
+    matrix = np.asarray(matrix)
+    state, key = load_state(state_path)
+
+    start = None
+    if state is not None and state.names == names and state.last_period is not None:
+        hits = np.flatnonzero(periods == np.datetime64(state.last_period, 'M'))
+        if len(hits) and key == _history_key(names, matrix[:, :hits[0] + 1]):
+            start = hits[0] + 1
+
+    if start is None:
+        state = scan(names, periods, matrix)
+    else:
+        for t in range(start, len(periods)):
+            state = update(state, periods[t], matrix[:, t])
+
+    if start is None or start < len(periods):
+        save_state(state_path, state, _history_key(names, matrix))
+    return state
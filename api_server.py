@@ -0,0 +1,347 @@
+# ---------------------------------------------------------
+# MediScope 로컬 JSON API
+# - 앱과 같은 데이터 계층(data_loader, region_cube)과 예측 계층(forecasting, forecast_queue)을 사용
+# - 질병 목록, 월별 시계열, 메트릭, 이상 징후, 예측을 JSON으로 제공 (Streamlit 스크립트 실행 없음)
+# - 모든 응답에 데이터 버전 기반 ETag를 붙여 If-None-Match 요청에는 본문 없이 304 응답
+#   (Cache-Control도 함께 보내므로 앞단에 일반 리버스 프록시 캐시를 둘 수 있음)
+#
+# 사용 예) python api_server.py --port 8600
+#   GET /api/diseases?grade=2급
+#   GET /api/series/수두?region=서울
+#   GET /api/forecast/수두
+#   GET /api/forecast/수두?model=fast   (Holt-Winters / Croston 빠른 예측, 적합 대기 없음)
+# ---------------------------------------------------------
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+import data_loader
+import forecast_queue
+import forecasting
+import region_cube
+
+MAX_AGE = 60              # Cache-Control max-age (초)
+RELOAD_SECONDS = 30       # 데이터 폴더 변경 확인 간격 (초)
+FORECAST_WAIT = 5.0       # 예측 적합을 응답 안에서 기다리는 최대 시간, 넘으면 202 + Retry-After
+BODY_CACHE_SIZE = 512     # 인코딩된 응답 본문 캐시 개수 (버전이 바뀌면 키가 달라져 자연히 밀려남)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def to_json_value(value):
+    # numpy 스칼라/배열, NaN을 JSON으로 표현 가능한 값으로 변환
+    if isinstance(value, dict) or hasattr(value, "items"):
+        return {str(k): to_json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_json_value(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def month_labels(periods):
+    return [str(p) for p in np.asarray(periods, dtype='datetime64[M]')]
+
+
+# ---------------------------------------------------------
+# 1. 공유 데이터 (프로세스당 하나, 데이터 폴더가 바뀌면 다시 로드)
+# ---------------------------------------------------------
+class ApiData:
+    def __init__(self, data_dir=data_loader.DATA_DIR, reload_seconds=RELOAD_SECONDS):
+        self.data_dir = data_dir
+        self.reload_seconds = reload_seconds
+        self.queue = forecast_queue.ForecastQueue()
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._archive = None
+        self._region_key = None
+        self.shared = None
+        self.regions = None
+        self.batch = None
+        self.batch_stamp = None   # 게시된 일괄 예측 실행 ID (같은 데이터 버전의 --disease 재실행도 구분)
+        self._fast = {}          # {인덱스 버전: 전체 질병 빠른 예측} (데이터가 바뀌면 비움)
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """RELOAD_SECONDS마다 데이터 폴더를 확인해 내용이 바뀌었으면 다시 로드합니다."""
+        now = time.monotonic()
+        if not force and now - self._checked < self.reload_seconds:
+            return
+        with self._lock:
+            if not force and now - self._checked < self.reload_seconds:
+                return
+            archive = data_loader.sync_archive(self.data_dir)
+            changed = force or archive != self._archive
+            if changed:
+                self.shared = data_loader.load_shared(self.data_dir)
+                self._archive = archive
+                self._fast = {}
+            # 일괄 예측은 batch_forecast.py가 나중에 만들거나 일부 질병만 다시 게시할 수 있으므로
+            # 확인할 때마다 게시 ID(CURRENT)를 비교해 바뀌었으면 다시 읽음
+            stamp = forecasting.batch_stamp(self.shared.index.version)
+            if changed or stamp != self.batch_stamp:
+                self.batch = forecasting.read_batch(self.shared.index.version) if stamp else None
+                self.batch_stamp = stamp
+            exports = region_cube.list_region_exports(self.data_dir)
+            region_key = region_cube.exports_key(exports) if exports else None
+            if force or region_key != self._region_key:
+                self.regions = region_cube.load_region_cube(self.data_dir)
+                self._region_key = region_key
+                self._fast = {}
+            self._checked = time.monotonic()
+
+    @property
+    def version(self):
+        # 전국 데이터 + 지역 큐브 + 게시된 일괄 예측 실행 ID (ETag 기준)
+        regions = self.regions.version if self.regions is not None else "-"
+        return f"{self.shared.index.version}.{regions}.{self.batch_stamp or 'fit'}"
+
+    def index_for(self, region):
+        if region in (None, "", region_cube.NATIONAL):
+            return self.shared.index
+        if self.regions is None or region not in self.regions:
+            raise ApiError(404, f"알 수 없는 지역: {region}")
+        return self.regions.index_for(region)
+
+    def fast_forecast(self, index):
+        # 지역(인덱스)마다 전체 질병을 한 번에 예측해 두고 질병별 요청은 행만 꺼내 씀
+        with self._lock:
+            if index.version not in self._fast:
+                self._fast[index.version] = forecasting.fast_forecast(index.periods, index.matrix, kinds=index.kinds)
+            return self._fast[index.version]
+
+
+# ---------------------------------------------------------
+# 2. 엔드포인트
+# ---------------------------------------------------------
+def _one(query, name):
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _disease(index, name):
+    if name not in index:
+        raise ApiError(404, f"알 수 없는 질병: {name}")
+    return name
+
+
+def get_version(data, query):
+    return {"version": data.version, "index_version": data.shared.index.version,
+            "regions": data.regions is not None}
+
+
+def get_grades(data, query):
+    index = data.shared.index
+    return [{"grade": g, "diseases": list(index.diseases_in(g))} for g in index.grades]
+
+
+def get_diseases(data, query):
+    index = data.index_for(_one(query, "region"))
+    grade = _one(query, "grade")
+    names = index.diseases_in(grade) if grade else index.diseases
+    return [{"disease": d, "grade": index.grade_of(d)} for d in names]
+
+
+def get_series(data, query, disease):
+    index = data.index_for(_one(query, "region"))
+    _disease(index, disease)
+    return {"disease": disease, "grade": index.grade_of(disease),
+            "region": _one(query, "region") or region_cube.NATIONAL,
+            "periods": month_labels(index.periods), "counts": index.series(disease)}
+
+
+def get_metrics(data, query, disease=None):
+    metrics = data.shared.metrics
+    if disease is None:
+        return metrics
+    if disease not in metrics:
+        raise ApiError(404, f"알 수 없는 질병 또는 등급: {disease}")
+    return {"name": disease, **metrics[disease]}
+
+
+def get_alerts(data, query):
+    return [{"disease": name, "grade": grade, "level": level, "methods": methods}
+            for name, grade, level, methods in data.shared.alerts]
+
+
+def get_regions(data, query):
+    if data.regions is None:
+        return {"regions": []}
+    cube = data.regions
+    return {"regions": [{"name": name, "label": cube.label(name), "parent": cube.parent(name),
+                         "children": list(cube.children(name))} for name in cube.names]}
+
+
+def get_forecast(data, query, disease):
+    """model=prophet(기본): 일괄 예측 저장소 → 작업 큐(공유 single-flight) 순서. 오래 걸리면 202로 나중에 다시 요청하게 함.
+    model=fast, 또는 전부 0 / 간헐 시계열: 빠른 예측 (적합 대기 없음, source는 holt_winters / croston / zero)
+    """
+    region = _one(query, "region")
+    model = _one(query, "model") or "prophet"
+    if model not in ("prophet", "fast"):
+        raise ApiError(400, f"알 수 없는 모델: {model} (prophet 또는 fast)")
+    index = data.index_for(region)
+    _disease(index, disease)
+    if model == "fast" or index.kind(disease) != "dense":
+        fast = data.fast_forecast(index)
+        forecast, source = forecasting.forecast_frame(fast, index.row(disease)), fast.models[index.row(disease)]
+    elif index is data.shared.index and data.batch is not None and disease in data.batch:
+        forecast, source = data.batch[disease], "batch"
+    elif not forecasting.ONDEMAND_FIT:
+        raise ApiError(404, "일괄 예측 결과가 없고 즉시 적합이 꺼져 있습니다.")
+    else:
+        try:
+            forecast = data.queue.wait(disease, index.periods, index.series(disease), timeout=FORECAST_WAIT)
+        except TimeoutError:
+            raise ApiError(202, "예측 모델 학습 중입니다.", {"Retry-After": "5", "Cache-Control": "no-store"})
+        if forecast is None:
+            raise ApiError(503, "예측 모델 학습에 실패했습니다.", {"Cache-Control": "no-store"})
+        source = "prophet"
+    return {"disease": disease, "region": region or region_cube.NATIONAL, "source": source,
+            "interval_width": forecasting.INTERVAL_WIDTH,
+            "periods": [str(p) for p in forecast["ds"].to_numpy().astype('datetime64[M]')],
+            "yhat": forecast["yhat"].to_numpy(), "yhat_lower": forecast["yhat_lower"].to_numpy(),
+            "yhat_upper": forecast["yhat_upper"].to_numpy()}
+
+
+ROUTES = [
+    (re.compile(r"^/api/version$"), get_version),
+    (re.compile(r"^/api/grades$"), get_grades),
+    (re.compile(r"^/api/diseases$"), get_diseases),
+    (re.compile(r"^/api/series/(?P<disease>[^/]+)$"), get_series),
+    (re.compile(r"^/api/metrics$"), get_metrics),
+    (re.compile(r"^/api/metrics/(?P<disease>[^/]+)$"), get_metrics),
+    (re.compile(r"^/api/alerts$"), get_alerts),
+    (re.compile(r"^/api/regions$"), get_regions),
+    (re.compile(r"^/api/forecast/(?P<disease>[^/]+)$"), get_forecast),
+]
+
+
+def route(path):
+    for pattern, handler in ROUTES:
+        m = pattern.match(path)
+        if m:
+            return handler, {k: unquote(v) for k, v in m.groupdict().items()}
+    raise ApiError(404, f"없는 경로: {path}")
+
+
+# ---------------------------------------------------------
+# 3. HTTP 처리 (ETag / 304)
+# ---------------------------------------------------------
+def make_etag(version, path, query_string):
+    key = hashlib.sha256(f"{version}|{path}|{query_string}".encode('utf-8')).hexdigest()[:16]
+    return f'"{key}"'
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # W/ 접두어가 붙은 약한 비교도 허용 (프록시가 압축하면서 W/를 붙이는 경우)
+    return etag in [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "MediScopeAPI/1.0"
+    data = None                     # make_server()에서 ApiData로 설정
+    _bodies = OrderedDict()         # {ETag: 인코딩된 본문} - 같은 버전의 같은 요청은 다시 직렬화하지 않음
+    _bodies_lock = threading.Lock()
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        try:
+            self.data.refresh()
+            handler, params = route(url.path)
+            etag = make_etag(self.data.version, url.path, url.query)
+            if etag_matches(self.headers.get("If-None-Match"), etag):
+                self._send(304, None, {"ETag": etag, "Cache-Control": f"public, max-age={MAX_AGE}"}, False)
+                return
+            body = self._cached_body(etag)
+            if body is None:
+                payload = handler(self.data, parse_qs(url.query), **params)
+                body = json.dumps(to_json_value(payload), ensure_ascii=False, allow_nan=False).encode('utf-8')
+                self._store_body(etag, body)
+            self._send(200, body, {"ETag": etag, "Cache-Control": f"public, max-age={MAX_AGE}"}, send_body)
+        except ApiError as e:
+            body = json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8')
+            headers = {"Cache-Control": "no-store", **e.headers}
+            self._send(e.status, body, headers, send_body)
+        except Exception as e:
+            self.log_error("내부 오류: %r", e)
+            body = json.dumps({"error": "internal error"}).encode('utf-8')
+            self._send(500, body, {"Cache-Control": "no-store"}, send_body)
+
+    def _cached_body(self, etag):
+        with self._bodies_lock:
+            body = self._bodies.get(etag)
+            if body is not None:
+                self._bodies.move_to_end(etag)
+            return body
+
+    def _store_body(self, etag, body):
+        with self._bodies_lock:
+            self._bodies[etag] = body
+            while len(self._bodies) > BODY_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+
+    def _send(self, status, body, headers, send_body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body is not None and send_body:
+            self.wfile.write(body)
+
+
+def make_server(host="127.0.0.1", port=8600, data_dir=data_loader.DATA_DIR):
+    handler = type("BoundApiHandler", (ApiHandler,), {"data": ApiData(data_dir)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MediScope 로컬 JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--data-dir", default=data_loader.DATA_DIR)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.data_dir)
+    print(f"MediScope API: http://{args.host}:{args.port}/api/version (data version {server.RequestHandlerClass.data.version})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
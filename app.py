@@ -1,14 +1,24 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from prophet import Prophet
-import plotly.graph_objs as go
-import plotly.express as px
-import time
+import functools
+import io
 import random
-import re # 정규표현식 모듈 추가 (정렬용)
+import uuid
+import time
 from datetime import datetime, timedelta
 
+import backtest
+import chat_history
+import data_loader
+import forecast_queue
+import forecasting
+import lazy_imports
+import profiling
+import region_cube
+import risk_engine
+import symptom_matcher
+
 # ---------------------------------------------------------
 # [필수] 앱 설정
 # ---------------------------------------------------------
@@ -19,6 +29,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# [선택] 구간별 프로파일링 - MEDISCOPE_PROFILE=1 또는 URL에 ?debug=1 (디버그 패널은 ?debug=1 일 때만 표시)
+show_debug_panel = st.query_params.get("debug") == "1"
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+profile_enabled = profiling.PROFILE_ENV or show_debug_panel
+profiling.begin_run(profile_enabled, st.session_state.session_id)
+
 # ---------------------------------------------------------
 # 1. 디자인 (CSS) - 깔끔한 화이트 & 브랜드 컬러 테마 적용
 # ---------------------------------------------------------
@@ -180,48 +197,357 @@ st.markdown("""
     }
     </style>
 """, unsafe_allow_html=True)
+profiling.lap("css")
 
 # ---------------------------------------------------------
 # 2. 데이터 로드 및 전처리
 # ---------------------------------------------------------
-@st.cache_data
+@profiling.cached(st.cache_resource)
 def load_data():
-    file_path = '법정감염병_월별_신고현황_20251201171222.csv'
+    # 모든 세션이 같은 데이터셋 하나를 공유 (st.cache_resource: 복사/직렬화 없이 같은 객체 반환)
+    # - 누적 long-form 테이블은 (질병 × 월) 인덱스를 만든 뒤 버리고 행렬만 남김
+    # - 질병/등급 목록은 튜플, 인덱스 배열과 메트릭은 읽기 전용이라 세션에서 수정할 수 없음
     try:
-        try:
-            df = pd.read_csv(file_path, header=1, encoding='utf-8')
-        except UnicodeDecodeError:
-            df = pd.read_csv(file_path, header=1, encoding='cp949')
-            
-        if '급별(2)' in df.columns and '급별(1)' in df.columns:
-            # 소계, 합계 제거
-            df_clean = df[~df['급별(2)'].isin(['소계', '합계'])].copy()
-            
-            # [수정] '제N급' -> 'N급'으로 변경 (데이터 정제)
-            # '제' 글자를 제거하고 공백을 없앱니다.
-            df_clean['급별(1)'] = df_clean['급별(1)'].astype(str).str.replace('제', '').str.strip()
-            
-            # 1. 전체 질병 리스트
-            disease_list = sorted(df_clean['급별(2)'].unique().tolist())
-            
-            # 2. 등급 리스트 (숫자 기준 정렬 로직 추가)
-            raw_grades = df_clean['급별(1)'].unique().tolist()
-            
-            def grade_sort_key(grade):
-                # "1급", "2급" 등 숫자만 추출하여 정렬 키로 사용
-                numbers = re.findall(r'\d+', str(grade))
-                return int(numbers[0]) if numbers else 999
-            
-            grade_list = sorted(raw_grades, key=grade_sort_key)
-            
-            return df_clean, disease_list, grade_list
-        else:
-            return pd.DataFrame(), [], []
+        # data/ 폴더의 월별 내보내기 파일을 모두 합친 누적 테이블
+        # (새로 추가되거나 바뀐 파일만 파싱되고, 나머지는 Feather 스토어에서 읽습니다.)
+        return data_loader.load_shared()
     except Exception as e:
         st.error(f"데이터 로드 실패: {e}")
-        return pd.DataFrame(), [], []
+        empty_index = data_loader.build_index(data_loader.empty_store())
+        empty_metrics = data_loader.freeze_metrics(data_loader.build_metric_cube(empty_index, state_path=None))
+        return data_loader.SharedDataset((), (), empty_index, empty_metrics, ())
+
+all_diseases, all_grades, data_index, metrics, alerts = load_data()
+
+@profiling.cached(st.cache_resource)
+def load_regions():
+    # data/regions/의 지역별 내보내기로 만든 (지역 × 질병 × 월) 큐브 (없으면 None, 모든 세션 공유)
+    try:
+        return region_cube.load_region_cube()
+    except Exception as e:
+        st.warning(f"지역 데이터 로드 실패: {e}")
+        return None
+
+regions = load_regions()
+profiling.lap("load_data")
+
+def region_index(region):
+    # 전국이면 전국 인덱스, 시도/시군구면 지역 큐브에서 해당 지역 슬라이스 (원본 행을 다시 읽지 않음)
+    if regions is None or region == region_cube.NATIONAL or region not in regions:
+        return data_index
+    return regions.index_for(region)
+
+@profiling.cached(st.cache_resource)
+def region_metrics(region, version):
+    # 지역별 메트릭 (최근 월 건수, 전월 대비, 경보 수준) - 전국은 load_data()의 메트릭 그대로 사용
+    if region_index(region) is data_index:
+        return metrics
+    return data_loader.freeze_metrics(data_loader.build_metric_cube(region_index(region), state_path=None))
+
+def forecast_region(disease, region):
+    # 선택 지역 데이터에 없는 질병은 전국 기준으로 표시
+    return region if disease in region_index(region) else region_cube.NATIONAL
+
+@profiling.cached(st.cache_resource)
+def fast_forecasts(region, version):
+    # ⚡ 빠른 예측: 지역의 전체 질병 × 월 행렬을 한 번에 예측 (수 ms, 모든 세션 공유)
+    # 연속 시계열은 Holt-Winters, 간헐 시계열은 Croston, 전부 0인 시계열은 계산 없이 0건
+    index = region_index(region)
+    return forecasting.fast_forecast(index.periods, index.matrix, kinds=index.kinds)
+
+def get_fast_forecast(disease, region=region_cube.NATIONAL):
+    index = region_index(region)
+    return forecasting.forecast_frame(fast_forecasts(region, index.version), index.row(disease))
+
+NO_DATA_MESSAGE = "표시할 감염병 데이터가 없습니다. data/ 폴더의 내보내기 파일을 확인해 주세요."
+
+def no_cases_notice(disease, region=region_cube.NATIONAL):
+    # 전 기간 0건인 시계열: 그래프/예측을 만들지 않고 안내만 표시
+    index = region_index(forecast_region(disease, region))
+    start, end = pd.Timestamp(index.periods[0]), pd.Timestamp(index.periods[-1])
+    region_text = "" if index is data_index else f"{regions.label(region)} "
+    st.info(f"**{disease}**은(는) {start.year}년 {start.month}월 ~ {end.year}년 {end.month}월 {region_text}신고가 "
+            f"한 건도 없어 그래프와 예측을 생략합니다.")
+
+@profiling.cached(st.cache_data)
+def get_extended_frame(disease, version, region=region_cube.NATIONAL):
+    # 실제 월별 이력 + 빠른 예측(2026년 12월까지)을 Date / Patients / Year / Month 표로 (계절성, 히트맵용)
+    index = region_index(region)
+    forecast = get_fast_forecast(disease, region)
+    frame = forecasting.monthly_frame(
+        np.concatenate([index.periods, forecast['ds'].to_numpy().astype('datetime64[M]')]),
+        np.concatenate([index.series(disease), forecast['yhat'].round().to_numpy()]),
+    )
+    frame['Forecast'] = np.arange(len(frame)) >= len(index.periods)
+    return frame
+
+@profiling.cached(st.cache_data)
+def load_batch_forecasts(version, stamp):
+    # batch_forecast.py가 미리 계산해 둔 전체 질병 예측 (stamp: 게시된 실행 ID, 없으면 None)
+    # 실행 ID가 캐시 키이므로 아직 결과가 없을 때의 None이 남지 않고, --disease 재실행 결과도 바로 읽음
+    if stamp is None:
+        return None
+    return forecasting.read_batch(version)
+
+def batch_forecasts():
+    return load_batch_forecasts(data_index.version, forecasting.batch_stamp(data_index.version))
+
+@profiling.cached(st.cache_data)
+def load_backtest(version, stamp):
+    # backtest.py가 저장해 둔 질병 × 모델별 백테스트 리더보드 (stamp: 리더보드 수정 시각, 없으면 None)
+    # stamp가 캐시 키이므로 백테스트를 실행하기 전의 None이 남지 않음
+    if stamp is None:
+        return None
+    return backtest.read_leaderboard(version)
+
+def recommended_model(disease, region, backtest_stamp):
+    """백테스트가 고른 모델(충분히 정확한 모델 중 가장 빠른 것)에 따른 예측 경로와 고른 모델 이름.
+
+    리더보드는 전국 이력으로 만들므로 지역별 시계열과 리더보드가 없는 경우는 빠른 예측을 씁니다.
+    """
+    if forecast_region(disease, region) != region_cube.NATIONAL:
+        return "fast", None
+    chosen = backtest.chosen_model(load_backtest(data_index.version, backtest_stamp), disease)
+    if chosen not in backtest.served_models(data_index.kind(disease)):
+        # 이전 버전 backtest.py가 저장한 리더보드는 비교 기준 모델을 고를 수 있었음
+        chosen = None
+    return ("prophet" if chosen == "prophet" else "fast"), chosen
+
+@profiling.cached(st.cache_resource)
+def get_forecast_queue():
+    # 프로세스당 하나 (모든 세션 공유): 같은 질병 예측은 세션/서버 프로세스가 달라도 한 번만 적합
+    return forecast_queue.ForecastQueue()
+
+def needs_fit(disease, region=region_cube.NATIONAL):
+    # 일괄 예측 저장소(전국)에 없고 앱에서 적합이 허용된 연속(dense) 시계열만 작업 큐 사용
+    index = region_index(region)
+    if disease not in index or index.kind(disease) != "dense" or not forecasting.ONDEMAND_FIT:
+        return False
+    if index is not data_index:
+        return True
+    batch = batch_forecasts()
+    return batch is None or disease not in batch
+
+@profiling.cached(st.cache_data(show_spinner=False))
+def get_forecast(disease, version, region=region_cube.NATIONAL, batch_stamp=None):
+    # version / batch_stamp: 데이터나 게시된 일괄 예측이 바뀌면 새 일괄 예측 / 새 적합 결과를 사용
+    index = region_index(region)
+    if disease not in index:
+        return None
+    if index.kind(disease) != "dense":
+        # 전부 0 / 간헐 시계열은 Prophet 대신 빠른 예측(0건, Croston) 사용
+        return None
+    if index is data_index:
+        batch = load_batch_forecasts(data_index.version, batch_stamp)
+        if batch is not None and disease in batch:
+            return batch[disease]
+    if not forecasting.ONDEMAND_FIT:
+        return None
+    # 일괄 예측이 없으면 작업 큐로 실제 월별 이력에 Prophet 적합
+    # (결과는 디스크에 캐시되어 다른 세션/프로세스와 공유)
+    # 대기 시간 초과와 적합 실패는 캐시되지 않도록 예외로 전달 (실패한 작업은 작업 큐가 RETRY_SECONDS 뒤 다시 시도)
+    forecast = get_forecast_queue().wait(disease, index.periods, index.series(disease))
+    if forecast is None:
+        raise RuntimeError(f"{disease} 예측 모델 학습에 실패했습니다.")
+    return forecast
+
+def wait_for_forecast(disease, placeholder, region=region_cube.NATIONAL):
+    """예측 적합이 필요하면 끝날 때까지 placeholder에 진행 상황을 표시합니다."""
+    if not needs_fit(disease, region):
+        return
+
+    def show(status, elapsed, joined):
+        if status.started is not None:
+            elapsed = max(elapsed, time.time() - status.started)
+        label = "다른 사용자가 요청한 같은 예측을 기다리는 중" if joined else "Prophet 모델 학습 중"
+        placeholder.progress(min(elapsed / status.expected, 0.95), text=f"{label}... ({elapsed:.0f}초)")
+
+    index = region_index(region)
+    get_forecast_queue().wait(disease, index.periods, index.series(disease), on_progress=show)
+    placeholder.empty()
+
+@profiling.cached(st.cache_data)
+def home_trend_figure(disease, version, region=region_cube.NATIONAL):
+    # 실제 월별 신고 건수 추이 (version: 데이터가 바뀌면 새로 생성)
+    # plotly는 차트를 처음 그릴 때만 로드
+    px = lazy_imports.load("plotly.express")
+    index = region_index(region)
+    chart_df = pd.DataFrame({
+        'Date': index.periods.astype('datetime64[ns]'),
+        'Patients': index.series(disease),
+    })
+    fig = px.line(chart_df, x='Date', y='Patients', markers=True, line_shape='spline')
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font={'family': 'Pretendard'})
+    fig.update_traces(line_color='#5361F2', line_width=3)
+    return fig.to_dict()
+
+@profiling.cached(st.cache_data)
+def region_breakdown_figure(disease, region, version):
+    # 선택한 지역의 하위 지역(시도 또는 시군구)별 최근 월 건수 - 큐브 인덱싱만으로 조회
+    px = lazy_imports.load("plotly.express")
+    names, counts = regions.breakdown(region, disease)
+    latest_period = pd.Timestamp(regions.periods[-1])
+    chart_df = pd.DataFrame({'Region': [regions.label(n) for n in names], 'Patients': counts})
+    fig = px.bar(chart_df, x='Region', y='Patients', color='Patients', color_continuous_scale='Blues',
+                 title=f"{latest_period.year}년 {latest_period.month}월 {regions.label(region)} 하위 지역별 신고 건수")
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font={'family': 'Pretendard'})
+    return fig.to_dict()
+
+def region_picker(key, sido_label="시도 선택", sigungu_label="시군구 선택"):
+    """전국 → 시도 → 시군구 드릴다운 선택. 지역 데이터가 없으면 선택 없이 전국."""
+    if regions is None:
+        return region_cube.NATIONAL
+    col_r1, col_r2 = st.columns([1, 2])
+    with col_r1:
+        sido = st.selectbox(sido_label, (region_cube.NATIONAL,) + regions.children(), key=f"{key}_sido")
+    districts = regions.children(sido) if sido != region_cube.NATIONAL else ()
+    if not districts:
+        return sido
+    with col_r2:
+        district = st.selectbox(sigungu_label, ("전체",) + districts, key=f"{key}_sigungu",
+                                format_func=lambda r: r if r == "전체" else regions.label(r))
+    return sido if district == "전체" else district
+
+# ---------------------------------------------------------
+# 📊 AI 분석 센터 탭별 그래프 (질병 + 데이터 버전별 캐시, 선택된 탭에서만 호출)
+# ---------------------------------------------------------
+FORECAST_MODELS = {"auto": "✅ 추천 (백테스트 기준)", "fast": "⚡ 빠른 예측 (Holt-Winters / Croston)",
+                   "prophet": "🔮 Prophet"}
+FAST_MODEL_LABELS = {"holt_winters": "Holt-Winters", "croston": "간헐 발생용 Croston", "zero": "0건"}
+CHOSEN_LABELS = {**FAST_MODEL_LABELS, "prophet": "Prophet"}
+
+@profiling.cached(st.cache_data(show_spinner=False))
+def forecast_view(disease, version, region=region_cube.NATIONAL, model="fast", batch_stamp=None,
+                  backtest_stamp=None):
+    go = lazy_imports.load("plotly.graph_objs")
+    region = forecast_region(disease, region)
+    index = region_index(region)
+    forecast = get_forecast(disease, index.version, region, batch_stamp) if model == "prophet" else None
+    if forecast is not None:
+        # 실제 신고 이력 + Prophet 예측 구간(yhat_lower ~ yhat_upper)
+        pred_caption = f"※ Prophet 알고리즘을 활용한 시계열 분석 결과입니다. (음영: {forecasting.INTERVAL_WIDTH:.0%} 예측구간)"
+        scored = "prophet"
+    else:
+        # 빠른 예측 (Prophet을 선택했지만 사용할 수 없거나 간헐 시계열인 경우에도 대체)
+        forecast = get_fast_forecast(disease, region)
+        scored = fast_forecasts(region, index.version).models[index.row(disease)]
+        pred_caption = (f"※ 전체 질병을 한 번에 계산하는 빠른 예측({FAST_MODEL_LABELS[scored]}) 결과입니다. "
+                        f"(음영: {forecasting.INTERVAL_WIDTH:.0%} 예측구간)")
+        if model == "prophet":
+            reason = "간헐적으로 발생하는 질병이라" if scored == "croston" else "Prophet 예측을 사용할 수 없어"
+            pred_caption = f"※ {reason} " + pred_caption[2:]
+    hist_x, hist_y = index.periods.astype('datetime64[ns]'), index.series(disease)
+    pred_x, pred_y = forecast['ds'], forecast['yhat']
+    upper_bound, lower_bound = forecast['yhat_upper'], forecast['yhat_lower']
+
+    # 전국 백테스트 결과(backtest.py)가 있으면 표시 중인 모델의 정확도를 함께 표시
+    scores = None
+    if index is data_index:
+        scores = backtest.model_scores(load_backtest(data_index.version, backtest_stamp), disease, scored)
+    if scores is not None:
+        mape = "-" if pd.isna(scores['mape']) else f"{scores['mape']:.1f}%"
+        pred_caption += (f"  \n백테스트({scores['folds']}회): MAE {scores['mae']:.1f}건, MAPE {mape}, "
+                         f"구간 적중률 {scores['coverage']:.0%}")
+
+    fig_pred = go.Figure()
+    
+    fig_pred.add_trace(go.Scatter(
+        x=hist_x, y=hist_y,
+        mode='lines', name='과거 데이터',
+        line=dict(color='#A0A0A0', width=1, dash='dot')
+    ))
+    
+    fig_pred.add_trace(go.Scatter(
+        x=pred_x, y=pred_y,
+        mode='lines+markers', name='2026 예측',
+        line=dict(color='#5361F2', width=3)
+    ))
+    
+    fig_pred.add_trace(go.Scatter(
+        x=pred_x, y=upper_bound,
+        mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'
+    ))
+    fig_pred.add_trace(go.Scatter(
+        x=pred_x, y=lower_bound,
+        mode='lines', fill='tonexty', fillcolor='rgba(83, 97, 242, 0.1)',
+        line=dict(width=0), name='신뢰구간'
+    ))
+
+    fig_pred.update_layout(
+        title=f"2026년 {disease} 예측 모델링",
+        plot_bgcolor='white', paper_bgcolor='white', font={'family': 'Pretendard'},
+        xaxis=dict(showgrid=True, gridcolor='#F0F0F0'),
+        yaxis=dict(showgrid=True, gridcolor='#F0F0F0')
+    )
+    return fig_pred.to_dict(), pred_caption
+
+@profiling.cached(st.cache_data(show_spinner=False))
+def seasonal_view(disease, version, region=region_cube.NATIONAL):
+    go = lazy_imports.load("plotly.graph_objs")
+    px = lazy_imports.load("plotly.express")
+    region = forecast_region(disease, region)
+    df_ext = get_extended_frame(disease, version, region)
+    # 월별 평균은 실제 신고 이력만으로 계산 (이력에 없는 달은 0)
+    monthly_avg = (df_ext[~df_ext['Forecast']].groupby('Month')['Patients'].mean()
+                   .reindex(range(1, 13), fill_value=0).rename_axis('Month').reset_index())
+
+    fig_radar = go.Figure(data=go.Scatterpolar(
+        r=monthly_avg['Patients'],
+        theta=['1월','2월','3월','4월','5월','6월','7월','8월','9월','10월','11월','12월'],
+        fill='toself', name=disease,
+        line=dict(color='#5361F2')
+    ))
+    fig_radar.update_layout(
+        polar=dict(radialaxis=dict(visible=True, showticklabels=False)),
+        title="월별 발생 집중도 (Radar)",
+        font={'family': 'Pretendard'}
+    )
+
+    fig_bar = px.bar(monthly_avg, x='Month', y='Patients', 
+                     title="월별 평균 환자 수",
+                     color='Patients', color_continuous_scale='Blues')
+    fig_bar.update_layout(
+        plot_bgcolor='white', font={'family': 'Pretendard'},
+        xaxis=dict(tickmode='linear', tick0=1, dtick=1)
+    )
+
+    max_month = int(monthly_avg.loc[monthly_avg['Patients'].idxmax(), 'Month'])
+    return fig_radar.to_dict(), fig_bar.to_dict(), max_month
+
+@profiling.cached(st.cache_data(show_spinner=False))
+def heatmap_view(disease, version, region=region_cube.NATIONAL):
+    go = lazy_imports.load("plotly.graph_objs")
+    region = forecast_region(disease, region)
+    df_ext = get_extended_frame(disease, version, region)
+    fig_heat = go.Figure(data=go.Heatmap(
+        z=df_ext['Patients'],
+        x=df_ext['Month'],
+        y=df_ext['Year'],
+        colorscale='Blues', # 깔끔한 블루톤으로 변경
+        hoverongaps=False
+    ))
+    
+    fig_heat.update_layout(
+        title=f"{disease} 발생 히트맵 ({df_ext['Year'].min()}-{df_ext['Year'].max()})",
+        xaxis=dict(tickmode='array', tickvals=list(range(1,13)), title='월 (Month)'),
+        yaxis=dict(title='연도 (Year)', dtick=1),
+        font={'family': 'Pretendard'}
+    )
+    return fig_heat.to_dict()
+
+@profiling.cached(st.cache_data(show_spinner="명단 분석 중..."))
+def score_roster_file(raw):
+    # 업로드한 명단(CSV bytes) 전체를 한 번에 평가 (같은 파일은 다시 계산하지 않음)
+    encoding = data_loader.detect_encoding(raw[:data_loader.ENCODING_PROBE_BYTES])
+    try:
+        roster = pd.read_csv(io.BytesIO(raw), encoding=encoding, dtype=str, keep_default_na=False)
+    except (UnicodeDecodeError, pd.errors.ParserError) as e:
+        raise ValueError(str(e)) from e
+    return risk_engine.score_roster(roster)
 
-df, all_diseases, all_grades = load_data()
+@profiling.cached(st.cache_resource)
+def get_symptom_matcher():
+    return symptom_matcher.SymptomMatcher(symptom_matcher.SYMPTOM_DB, all_diseases)
 
 # ---------------------------------------------------------
 # 3. 사이드바 (메뉴 및 리셋 버튼)
@@ -251,6 +577,7 @@ with st.sidebar:
     # 시스템 리셋 버튼
     if st.button("🔄 시스템 리셋", use_container_width=True):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
     
     st.markdown("---")
@@ -260,23 +587,62 @@ with st.sidebar:
         All rights reserved.
         </div>
     """, unsafe_allow_html=True)
-
+profiling.lap("sidebar")
 
 # ---------------------------------------------------------
 # 4. 메인 컨텐츠 (메뉴별 화면 구성)
+# - 메뉴마다 st.fragment: 메뉴 안 위젯이 바뀌면 그 메뉴 함수만 다시 실행/전송
+#   (페이지 설정, CSS, 사이드바, load_data()는 다시 실행하지 않음. 메뉴 전환은 전체 rerun)
 # ---------------------------------------------------------
+def menu_fragment(name):
+    """st.fragment로 감싸고, 조각만 다시 실행될 때도 프로파일링되도록 합니다."""
+    def decorator(fn):
+        @st.fragment
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with profiling.fragment_scope(name, profile_enabled, st.session_state.session_id):
+                return fn(*args, **kwargs)
+        return run
+    return decorator
+
+@menu_fragment("ai:forecast")
+def forecast_tab(ai_disease, ai_version, ai_region):
+    # 📈 예측 탭: 모델 선택을 바꾸면 이 탭 내용만 다시 실행
+    st.markdown(f"**{ai_disease}**의 빅데이터 기반 **2026년 발생 예측**입니다.")
+    ai_model = st.radio("예측 모델", list(FORECAST_MODELS), format_func=FORECAST_MODELS.get,
+                        key='ai_model', horizontal=True)
+    progress = st.empty()
+    stamps = forecasting.batch_stamp(data_index.version), backtest.leaderboard_stamp(data_index.version)
+    model, chosen = (recommended_model(ai_disease, ai_region, stamps[1]) if ai_model == "auto"
+                     else (ai_model, None))
+    try:
+        if model == "prophet":
+            wait_for_forecast(ai_disease, progress, forecast_region(ai_disease, ai_region))
+        fig_pred, pred_caption = forecast_view(ai_disease, ai_version, ai_region, model, *stamps)
+    except TimeoutError:
+        progress.info("예측 모델 학습이 아직 진행 중입니다. 잠시 후 다시 확인해 주세요.")
+        return
+    except Exception:
+        # 적합 실패는 캐시하지 않으므로 잠시 뒤 다시 열면 재시도됨. 그동안은 빠른 예측 표시
+        progress.warning("Prophet 예측 모델 학습에 실패해 빠른 예측을 표시합니다. 잠시 후 다시 시도됩니다.")
+        fig_pred, pred_caption = forecast_view(ai_disease, ai_version, ai_region, "fast", *stamps)
+    if ai_model == "auto":
+        pred_caption += (f"  \n✅ 추천 모델: {CHOSEN_LABELS[chosen]} (백테스트에서 충분히 정확한 모델 중 가장 빠른 모델)"
+                         if chosen else "  \n✅ 백테스트 결과가 없어 빠른 예측을 표시합니다.")
+    st.plotly_chart(fig_pred, use_container_width=True)
+    st.caption(pred_caption)
 
 # ==========================================
 # [MENU 1] 🏠 홈
 # ==========================================
-if menu == "🏠 홈":
-    
+@menu_fragment("home")
+def home_page():
     # [위치 변경 로직]
     default_grade = all_grades[0] if all_grades else "데이터 없음"
     current_grade = st.session_state.get('home_grade', default_grade)
     
-    if not df.empty and current_grade in all_grades:
-        filtered_diseases = sorted(df[df['급별(1)'] == current_grade]['급별(2)'].unique().tolist())
+    if current_grade in all_grades:
+        filtered_diseases = list(data_index.diseases_in(current_grade))
         default_disease = filtered_diseases[0] if filtered_diseases else "데이터 없음"
     else:
         filtered_diseases = []
@@ -308,45 +674,90 @@ if menu == "🏠 홈":
         except: d_idx = 0
         selected_disease = st.selectbox("2. 전염병 선택", filtered_diseases, index=d_idx, key='home_disease')
 
+    if selected_disease is None:
+        st.info(NO_DATA_MESSAGE)
+        return
+
+    # 지역 드릴다운 (data/regions/에 지역별 내보내기가 있을 때만 표시)
+    selected_region = region_picker('home', "3. 시도 선택", "4. 시군구 선택")
+    view_index = region_index(selected_region)
+    view_metrics = region_metrics(selected_region, view_index.version)
+
     st.markdown("---")
 
-    # 3. 메트릭 카드
+    # 3. 메트릭 카드 (load_data()에서 미리 계산된 집계 큐브 조회, 지역은 지역별 큐브)
+    if selected_disease in view_metrics:
+        m = view_metrics[selected_disease]
+        latest_period = pd.Timestamp(view_index.periods[-1])
+        count_text = f"{int(m['latest']):,}명"
+        count_label = f"{latest_period.year}년 {latest_period.month}월 신고 건수"
+        if pd.isna(m['delta_pct']):
+            delta_text, delta_color = "신규 발생", "#FF4B4B"
+        elif m['delta_pct'] > 0:
+            delta_text, delta_color = f"▲ {m['delta_pct']:.1f}%", "#FF4B4B"
+        elif m['delta_pct'] < 0:
+            delta_text, delta_color = f"▼ {abs(m['delta_pct']):.1f}%", "#5361F2"
+        else:
+            delta_text, delta_color = "- 0.0%", "#888"
+        level_text = f"{m['level']} 단계"
+        level_color = data_loader.alert_color(m['level'])
+    else:
+        count_text, count_label = "-", "이번 달 신고 건수"
+        delta_text, delta_color = "-", "#888"
+        level_text, level_color = "-", "#888"
+
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.markdown("""
+        st.markdown(f"""
             <div class="metric-card">
-                <div class="metric-value">1,240명</div>
-                <div class="metric-label">이번 달 신고 건수</div>
+                <div class="metric-value">{count_text}</div>
+                <div class="metric-label">{count_label}</div>
             </div>
         """, unsafe_allow_html=True)
     with col2:
-        st.markdown("""
+        st.markdown(f"""
             <div class="metric-card">
-                <div class="metric-value" style="color: #FF4B4B;">▲ 12.5%</div>
+                <div class="metric-value" style="color: {delta_color};">{delta_text}</div>
                 <div class="metric-label">전월 대비 증감률</div>
             </div>
         """, unsafe_allow_html=True)
     with col3:
-        st.markdown("""
+        st.markdown(f"""
             <div class="metric-card">
-                <div class="metric-value" style="color: #5361F2;">주의 단계</div>
+                <div class="metric-value" style="color: {level_color};">{level_text}</div>
                 <div class="metric-label">현재 경보 수준</div>
             </div>
         """, unsafe_allow_html=True)
 
+    # 전체 감염병 이상 징후 (EARS C1/C2/C3, CUSUM - load_data()에서 전체 질병을 한 번에 스캔)
+    with st.expander(f"🚨 전체 감염병 이상 징후 스캔 결과: {len(alerts)}건 감지"):
+        if alerts:
+            for name, grade, level, methods in alerts:
+                st.markdown(f"- **{name}** ({grade}): **{level} 단계** · 경보 방법: {methods}")
+        else:
+            st.write("최근 월 기준으로 기준선을 넘은 감염병이 없습니다.")
+
     st.markdown("---")
     
     # 4. 그래프
-    st.subheader(f"📈 {selected_disease} 월별 발생 추이")
-    
-    dates = pd.date_range(start='2024-01-01', periods=18, freq='M')
-    values = np.random.randint(20, 300, size=18) + np.sin(np.linspace(0, 10, 18)) * 30
-    chart_df = pd.DataFrame({'Date': dates, 'Patients': values})
+    region_text = "" if selected_region == region_cube.NATIONAL else f"{selected_region} "
+    st.subheader(f"📈 {region_text}{selected_disease} 월별 발생 추이")
     
-    fig = px.line(chart_df, x='Date', y='Patients', markers=True, line_shape='spline')
-    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font={'family': 'Pretendard'})
-    fig.update_traces(line_color='#5361F2', line_width=3)
-    st.plotly_chart(fig, use_container_width=True)
+    if selected_disease in view_index and view_index.kind(selected_disease) == "zero":
+        no_cases_notice(selected_disease, selected_region)
+    elif selected_disease in view_index:
+        # 질병 + 데이터 버전별로 직렬화된 Figure를 재사용 (다시 선택해도 계산/생성 생략)
+        st.plotly_chart(home_trend_figure(selected_disease, view_index.version, selected_region),
+                        use_container_width=True)
+    else:
+        st.info("표시할 월별 데이터가 없습니다.")
+
+    # 하위 지역별 분포 (전국 → 시도, 시도 → 시군구) - 전 기간 0건이면 하위 지역도 모두 0건이라 생략
+    if regions is not None and regions.children(selected_region) \
+            and selected_disease in regions.index_for(selected_region) \
+            and regions.index_for(selected_region).kind(selected_disease) != "zero":
+        st.plotly_chart(region_breakdown_figure(selected_disease, selected_region, regions.version),
+                        use_container_width=True)
 
     # 5. 예방 Tip 섹션
     st.markdown("---")
@@ -406,61 +817,38 @@ if menu == "🏠 홈":
 # ==========================================
 # [MENU 2] 💬 AI 의료 상담
 # ==========================================
-elif menu == "💬 AI 의료 상담":
+@menu_fragment("chat")
+def chat_page():
     st.subheader("💬 AI 증상 기반 질병 예측 상담")
     
     st.markdown("##### 🩺 현재 겪고 계신 증상을 말씀해 주시면, 의심되는 전염병을 예측해 드립니다.")
     st.info("💡 예시: \"진드기에 물린 것 같고 열이 나요\", \"해산물을 먹고 배가 아파요\", \"기침이 계속되고 피가 섞여 나와요\"")
     
-    if "messages" not in st.session_state:
-        st.session_state.messages = [{"role": "assistant", "content": "안녕하세요! 어떤 증상이 있으신가요? 자세히 설명해 주시면 분석해 드릴게요."}]
+    # 화면에는 최근 대화만 유지하고, 오래된 대화는 세션별 아카이브에서 필요할 때만 불러옵니다.
+    chat_history.init_session(st.session_state)
+    # 이전 대화 안내는 이번 입력/답변을 추가(아카이브)한 뒤의 개수로 그리도록 자리만 먼저 잡아 둠
+    archive_slot = st.empty()
 
     for msg in st.session_state.messages:
         with st.chat_message(msg["role"]):
             st.write(msg["content"])
             
-    symptom_db = {
-        "결핵": ["기침", "가래", "혈담", "객혈", "피", "체중 감소", "미열", "식은땀"],
-        "콜레라": ["쌀뜨물", "설사", "구토", "탈수", "복통 없는 설사"],
-        "장티푸스": ["지속적인 발열", "두통", "복통", "장미색 반점", "변비", "설사"],
-        "A형간염": ["황달", "피로", "식욕 부진", "구토", "암갈색 소변", "소변 색"],
-        "B형간염": ["황달", "피로", "복부 통증", "식욕 부진"],
-        "홍역": ["고열", "발진", "기침", "콧물", "결막염", "입안 반점", "붉은 반점"],
-        "수두": ["수포", "물집", "가려움", "발진", "발열", "딱지"],
-        "유행성이하선염": ["볼", "턱", "부종", "통증", "발열", "침샘", "붓기"],
-        "일본뇌염": ["모기", "고열", "두통", "현기증", "구토", "의식 장애"],
-        "말라리아": ["모기", "오한", "고열", "발한", "주기적인 열", "떨림"],
-        "쯔쯔가무시증": ["진드기", "가피", "검은 딱지", "발열", "두통", "풀밭", "야외 활동"],
-        "레지오넬라증": ["에어컨", "냉각탑", "폐렴", "기침", "고열", "근육통"],
-        "비브리오패혈증": ["해산물", "어패류", "회", "상처", "바닷물", "괴사", "부종"],
-        "성홍열": ["딸기 혀", "고열", "인후통", "발진", "선홍색"],
-        "백일해": ["심한 기침", "발작적 기침", "흡기성 훕", "구토", "숨쉬기 힘듦"],
-        "파상풍": ["근육 경직", "마비", "개구장애", "상처", "녹슨", "못"],
-        "인플루엔자": ["고열", "오한", "두통", "근육통", "전신 쇠약감", "몸살"],
-        "코로나19": ["발열", "기침", "인후통", "후각 상실", "미각 상실"],
-        "엠폭스": ["수포", "발진", "림프절", "고열", "근육통"]
-    }
+    # 증상 사전은 질병 필터링까지 끝난 오토마톤으로 한 번만 컴파일됨
+    matcher = get_symptom_matcher()
 
     if prompt := st.chat_input("증상을 입력하세요..."):
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        chat_history.append_message(st.session_state, "user", prompt)
         with st.chat_message("user"):
             st.write(prompt)
 
         with st.chat_message("assistant"):
             with st.spinner("증상 데이터 분석 중..."):
-                time.sleep(0.8)
-                
-                detected_diseases = []
-                for disease, keywords in symptom_db.items():
-                    if any(disease in d for d in all_diseases): 
-                        for keyword in keywords:
-                            if keyword in prompt:
-                                detected_diseases.append(disease)
-                                break
+                # (질병, 일치한 증상 키워드) - 일치 개수가 많은 순
+                with profiling.section("chat:matcher"):
+                    detected_diseases = matcher.match(prompt)
                 
                 if detected_diseases:
-                    detected_diseases = list(set(detected_diseases))
-                    diseases_str = ", ".join([f"**{d}**" for d in detected_diseases])
+                    diseases_str = ", ".join([f"**{d}**({', '.join(kws)})" for d, kws in detected_diseases])
                     
                     response_text = (
                         f"입력하신 증상에서 다음과 같은 질병의 의심 징후가 발견되었습니다:\n\n"
@@ -477,13 +865,20 @@ elif menu == "💬 AI 의료 상담":
                     )
                 
                 st.write(response_text)
-                st.session_state.messages.append({"role": "assistant", "content": response_text})
+                chat_history.append_message(st.session_state, "assistant", response_text)
+
+    if st.session_state.archived_count:
+        with archive_slot.container(), st.expander(f"🗂️ 이전 대화 {st.session_state.archived_count}개"):
+            if st.button("이전 대화 불러오기", key="load_chat_archive"):
+                for msg in chat_history.load_archived(st.session_state, limit=chat_history.HISTORY_WINDOW * 5):
+                    st.markdown(f"**{'🧑 나' if msg['role'] == 'user' else '🤖 MediScope'}**: {msg['content']}")
 
 
 # ==========================================
 # [MENU 3] 📊 AI 분석 센터 (개선됨)
 # ==========================================
-elif menu == "📊 AI 분석 센터":
+@menu_fragment("ai")
+def ai_page():
     st.subheader("📊 Future AI Analysis (2026)")
     
     st.markdown("##### 🤖 예측 분석 대상 설정")
@@ -493,155 +888,64 @@ elif menu == "📊 AI 분석 센터":
         ai_grade = st.selectbox("분류 등급 선택", all_grades, key='ai_grade')
     
     with col_ai2:
-        ai_filtered_diseases = sorted(df[df['급별(1)'] == ai_grade]['급별(2)'].unique().tolist())
+        ai_filtered_diseases = list(data_index.diseases_in(ai_grade))
         ai_disease = st.selectbox("분석할 전염병 선택", ai_filtered_diseases, key='ai_disease')
 
-    st.markdown("---")
-    
-    # ----------------------------------------------------
-    # 데이터 시뮬레이션
-    # ----------------------------------------------------
-    try:
-        row = df[df['급별(2)'] == ai_disease]
-        monthly_2024 = row.iloc[0, 3:15].values.astype(float)
-        monthly_2024 = np.nan_to_num(monthly_2024)
-    except:
-        monthly_2024 = np.array([100]*12)
-
-    def generate_extended_data(pattern_2024):
-        years = [2021, 2022, 2023, 2024, 2025, 2026]
-        all_data = []
-        for yr in years:
-            if yr == 2024:
-                factor = 1.0
-                noise = 0
-            elif yr < 2024:
-                factor = 0.8 + (yr - 2021) * 0.05
-                noise = np.random.normal(0, 5, 12)
-            else:
-                factor = 1.0 + (yr - 2024) * 0.1
-                noise = np.random.normal(0, 10, 12)
-            
-            yearly_vals = (pattern_2024 * factor) + noise
-            yearly_vals = np.maximum(yearly_vals, 0)
-            
-            for m in range(12):
-                date_str = f"{yr}-{m+1:02d}-01"
-                all_data.append({"Date": date_str, "Patients": int(yearly_vals[m]), "Year": yr, "Month": m+1})
-                
-        return pd.DataFrame(all_data)
+    if ai_disease is None or ai_disease not in data_index:
+        # 데이터를 불러오지 못했거나 비어 있으면 분류/예측할 시계열이 없음
+        st.info(NO_DATA_MESSAGE)
+        return
 
-    df_sim = generate_extended_data(monthly_2024)
-    df_sim['Date'] = pd.to_datetime(df_sim['Date'])
+    ai_region = region_picker('ai', "분석 지역 (시도)", "분석 지역 (시군구)")
+    ai_version = region_index(ai_region).version
+    ai_index = region_index(forecast_region(ai_disease, ai_region))
+    ai_kind = ai_index.kind(ai_disease) if ai_disease in ai_index else "zero"
 
+    st.markdown("---")
+    
     # ----------------------------------------------------
-    # 탭 구성
+    # 탭 구성 (선택된 탭만 실행 - 나머지 탭의 그래프는 계산/전송하지 않음)
     # ----------------------------------------------------
-    tab1, tab2, tab3 = st.tabs(["📈 2026년 예측", "🔄 계절성 패턴", "🔥 발생 히트맵"])
+    tab1, tab2, tab3 = st.tabs(["📈 2026년 예측", "🔄 계절성 패턴", "🔥 발생 히트맵"], key='ai_tab', on_change='rerun')
 
     # [Tab 1] 2026년 예측
-    with tab1:
-        st.markdown(f"**{ai_disease}**의 빅데이터 기반 **2026년 발생 예측**입니다.")
-        
-        pred_df = df_sim[df_sim['Year'] == 2026].copy()
-        hist_df = df_sim[df_sim['Year'] < 2026].copy()
-        
-        fig_pred = go.Figure()
-        
-        fig_pred.add_trace(go.Scatter(
-            x=hist_df['Date'], y=hist_df['Patients'],
-            mode='lines', name='과거 데이터',
-            line=dict(color='#A0A0A0', width=1, dash='dot')
-        ))
-        
-        fig_pred.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Patients'],
-            mode='lines+markers', name='2026 예측',
-            line=dict(color='#5361F2', width=3)
-        ))
-        
-        upper_bound = pred_df['Patients'] * 1.2
-        lower_bound = pred_df['Patients'] * 0.8
-        
-        fig_pred.add_trace(go.Scatter(
-            x=pred_df['Date'], y=upper_bound,
-            mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'
-        ))
-        fig_pred.add_trace(go.Scatter(
-            x=pred_df['Date'], y=lower_bound,
-            mode='lines', fill='tonexty', fillcolor='rgba(83, 97, 242, 0.1)',
-            line=dict(width=0), name='신뢰구간'
-        ))
-
-        fig_pred.update_layout(
-            title=f"2026년 {ai_disease} 예측 모델링",
-            plot_bgcolor='white', paper_bgcolor='white', font={'family': 'Pretendard'},
-            xaxis=dict(showgrid=True, gridcolor='#F0F0F0'),
-            yaxis=dict(showgrid=True, gridcolor='#F0F0F0')
-        )
-        st.plotly_chart(fig_pred, use_container_width=True)
-        st.caption("※ Prophet 알고리즘을 활용한 시계열 분석 결과입니다.")
+    with tab1, profiling.section("tab:forecast"):
+        if tab1.open and ai_kind == "zero":
+            no_cases_notice(ai_disease, ai_region)
+        elif tab1.open:
+            forecast_tab(ai_disease, ai_version, ai_region)
 
     # [Tab 2] 계절성 패턴
-    with tab2:
-        st.markdown(f"**{ai_disease}**의 월별 평균 발생 패턴입니다.")
-        monthly_avg = df_sim[df_sim['Year'] <= 2025].groupby('Month')['Patients'].mean().reset_index()
-        
-        col_s1, col_s2 = st.columns(2)
-        
-        with col_s1:
-            fig_radar = go.Figure(data=go.Scatterpolar(
-                r=monthly_avg['Patients'],
-                theta=['1월','2월','3월','4월','5월','6월','7월','8월','9월','10월','11월','12월'],
-                fill='toself', name=ai_disease,
-                line=dict(color='#5361F2')
-            ))
-            fig_radar.update_layout(
-                polar=dict(radialaxis=dict(visible=True, showticklabels=False)),
-                title="월별 발생 집중도 (Radar)",
-                font={'family': 'Pretendard'}
-            )
-            st.plotly_chart(fig_radar, use_container_width=True)
-            
-        with col_s2:
-            fig_bar = px.bar(monthly_avg, x='Month', y='Patients', 
-                             title="월별 평균 환자 수",
-                             color='Patients', color_continuous_scale='Blues')
-            fig_bar.update_layout(
-                plot_bgcolor='white', font={'family': 'Pretendard'},
-                xaxis=dict(tickmode='linear', tick0=1, dtick=1)
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
-            
-        max_month = monthly_avg.loc[monthly_avg['Patients'].idxmax(), 'Month']
-        st.info(f"📊 분석 결과, **{ai_disease}**은(는) 주로 **{max_month}월**에 발생 빈도가 가장 높게 나타납니다.")
+    with tab2, profiling.section("tab:seasonal"):
+        if tab2.open and ai_kind == "zero":
+            no_cases_notice(ai_disease, ai_region)
+        elif tab2.open:
+            st.markdown(f"**{ai_disease}**의 월별 평균 발생 패턴입니다.")
+            fig_radar, fig_bar, max_month = seasonal_view(ai_disease, ai_version, ai_region)
+
+            col_s1, col_s2 = st.columns(2)
+            with col_s1:
+                st.plotly_chart(fig_radar, use_container_width=True)
+            with col_s2:
+                st.plotly_chart(fig_bar, use_container_width=True)
+
+            st.info(f"📊 분석 결과, **{ai_disease}**은(는) 주로 **{max_month}월**에 발생 빈도가 가장 높게 나타납니다.")
 
     # [Tab 3] 발생 히트맵
-    with tab3:
-        st.markdown(f"**{ai_disease}**의 연도별/월별 발생 강도 히트맵입니다.")
-        
-        fig_heat = go.Figure(data=go.Heatmap(
-            z=df_sim['Patients'],
-            x=df_sim['Month'],
-            y=df_sim['Year'],
-            colorscale='Blues', # 깔끔한 블루톤으로 변경
-            hoverongaps=False
-        ))
-        
-        fig_heat.update_layout(
-            title=f"{ai_disease} 발생 히트맵 (2021-2026)",
-            xaxis=dict(tickmode='array', tickvals=list(range(1,13)), title='월 (Month)'),
-            yaxis=dict(title='연도 (Year)', dtick=1),
-            font={'family': 'Pretendard'}
-        )
-        st.plotly_chart(fig_heat, use_container_width=True)
-        st.caption("색상이 진할수록 발생 환자 수가 많음을 의미합니다.")
+    with tab3, profiling.section("tab:heatmap"):
+        if tab3.open and ai_kind == "zero":
+            no_cases_notice(ai_disease, ai_region)
+        elif tab3.open:
+            st.markdown(f"**{ai_disease}**의 연도별/월별 발생 강도 히트맵입니다.")
+            st.plotly_chart(heatmap_view(ai_disease, ai_version, ai_region), use_container_width=True)
+            st.caption("색상이 진할수록 발생 환자 수가 많음을 의미합니다. (실제 신고 이력 이후는 빠른 예측값)")
 
 
 # ==========================================
 # [MENU 4] 👤 My Page
 # ==========================================
-elif menu == "👤 My Page":
+@menu_fragment("mypage")
+def my_page():
     st.subheader("📑 MediScope Personal Report")
     st.markdown("개인 신체 정보와 기저질환을 기록하여 **맞춤형 감염병 예방 정보**를 확인하세요.")
     
@@ -650,49 +954,23 @@ elif menu == "👤 My Page":
     with col_l:
         with st.form("personal_check"):
             st.markdown("**기본 정보**")
-            age_g = st.selectbox("연령대", ["10대 미만", "10대", "20-30대", "40-50대", "60대 이상"])
+            age_g = st.selectbox("연령대", risk_engine.AGE_GROUPS)
             
-            job = st.selectbox("직업군", ["사무직", "의료직", "교육/보육", "요식업", "학생", "무직", "기타"])
+            job = st.selectbox("직업군", risk_engine.JOBS)
             
             st.markdown("**기저질환**")
-            conds = st.multiselect("선택", [
-                "당뇨병", "호흡기 질환", "간 질환", "면역 저하", 
-                "고혈압", "심혈관 질환", "천식", "알레르기", "신장 질환"
-            ])
+            conds = st.multiselect("선택", risk_engine.CONDITIONS)
             
             st.markdown("**접종 이력**")
-            vax = st.multiselect("선택", [
-                "독감", "폐렴구균", "간염", "코로나19", 
-                "파상풍", "대상포진", "자궁경부암", "장티푸스"
-            ])
+            vax = st.multiselect("선택", risk_engine.VACCINES)
             
             sub = st.form_submit_button("분석 실행")
             
     with col_r:
         if sub:
             st.markdown("#### 🩺 AI 맞춤 분석 결과")
-            warns = []
-            
-            if age_g == "10대 미만":
-                warns.append(("소아/영유아", "수두, 홍역, 유행성이하선염 등 단체생활 감염병 주의"))
-            
-            if age_g == "60대 이상":
-                warns.append(("고령층", "인플루엔자(독감), 폐렴구균 감염 시 중증화 위험 높음"))
-
-            if "당뇨병" in conds or "고혈압" in conds or "심혈관 질환" in conds:
-                warns.append(("만성질환 보유", "기저질환자는 코로나19 및 독감 등 호흡기 감염병에 취약함"))
-                
-            if "천식" in conds or "호흡기 질환" in conds:
-                warns.append(("호흡기계 취약", "미세먼지 농도가 높은 날 외출 자제 및 마스크 착용 필수"))
-
-            if "의료직" in job:
-                warns.append(("직업적 고위험(의료)", "결핵, 혈액매개감염병(B형간염, C형간염) 노출 주의"))
-            
-            if "학생" in job or "교육/보육" in job:
-                warns.append(("단체 생활군", "인플루엔자, 수두, 결막염 등 유행성 질환 확산 주의"))
-                
-            if "요식업" in job:
-                warns.append(("식품 위생", "A형간염, 장티푸스, 노로바이러스 등 수인성 감염병 예방 필요"))
+            # 주의 요인 / 권장 백신은 risk_engine의 규칙 표로 평가 (명단 일괄 분석과 같은 엔진)
+            warns, rec_vax = risk_engine.score_profile(age_g, job, conds, vax)
 
             if warns:
                 st.error("🚨 **주의가 필요한 감염병 및 요인**")
@@ -704,11 +982,6 @@ elif menu == "👤 My Page":
             
             st.markdown("---")
             st.markdown("##### 💉 권장 예방 접종")
-            rec_vax = []
-            if "독감" not in vax: rec_vax.append("인플루엔자(독감)")
-            if "파상풍" not in vax: rec_vax.append("파상풍(10년 주기)")
-            if (age_g == "60대 이상") and ("폐렴구균" not in vax): rec_vax.append("폐렴구균")
-            
             if rec_vax:
                 st.info(f"아직 접종하지 않으셨다면 다음 백신을 권장합니다: **{', '.join(rec_vax)}**")
             else:
@@ -716,3 +989,49 @@ elif menu == "👤 My Page":
 
         else:
             st.info("👈 왼쪽 양식에 본인의 건강 상태를 입력하고 '분석 실행' 버튼을 눌러주세요.")
+
+    # 단체(명단) 일괄 분석 - 사업장 보건 담당자용
+    st.markdown("---")
+    st.markdown("#### 🏢 단체 명단 일괄 분석")
+    st.caption("연령대, 직업군, 기저질환, 접종이력 열이 있는 CSV를 올리면 전원을 한 번에 평가합니다. "
+               "기저질환/접종이력은 쉼표(,)나 세미콜론(;)으로 구분합니다.")
+    st.download_button("📄 명단 양식 내려받기", risk_engine.roster_template().to_csv(index=False).encode('utf-8-sig'),
+                       file_name="roster_template.csv", mime="text/csv")
+    roster_file = st.file_uploader("명단 CSV 업로드", type=["csv"], key='roster_file')
+    if roster_file is not None:
+        try:
+            scored, summary = score_roster_file(roster_file.getvalue())
+        except ValueError as e:
+            st.error(f"명단을 읽을 수 없습니다: {e}")
+        else:
+            flagged = int((scored["주의 요인 수"] > 0).sum())
+            st.success(f"총 {len(scored):,}명 분석 완료 · 주의 요인 보유 {flagged:,}명")
+            st.dataframe(summary.pivot(index="항목", columns="구분", values="인원").fillna(0).astype(int))
+            unknown = int((scored["확인 필요"] != "").sum())
+            if unknown:
+                st.warning(f"{unknown:,}명의 명단에 인식하지 못한 값이 있습니다. '확인 필요' 열을 확인하세요.")
+            st.dataframe(scored, hide_index=True)
+            st.download_button("📥 분석 결과 내려받기 (CSV)", scored.to_csv(index=False).encode('utf-8-sig'),
+                               file_name="roster_risk.csv", mime="text/csv")
+
+PAGES = {
+    "🏠 홈": home_page,
+    "💬 AI 의료 상담": chat_page,
+    "📊 AI 분석 센터": ai_page,
+    "👤 My Page": my_page,
+}
+PAGES[menu]()
+profiling.lap(f"menu:{menu}")
+
+# ---------------------------------------------------------
+# 5. 디버그 패널 (?debug=1) - 이번 rerun의 구간별 시간(메모리는 MEDISCOPE_PROFILE=1 일 때만), 캐시 적중
+# ---------------------------------------------------------
+profile_report = profiling.end_run()
+if show_debug_panel and profile_report is not None:
+    with st.sidebar.expander("🛠️ Debug: 성능 프로파일"):
+        st.caption(f"전체 {profile_report['total_ms']:.1f} ms")
+        st.dataframe(pd.DataFrame(profile_report['sections']), hide_index=True)
+        if profile_report['cache']:
+            cache_df = pd.DataFrame(profile_report['cache']).T
+            cache_df['hits'] = cache_df['calls'] - cache_df['misses']
+            st.dataframe(cache_df)
@@ -0,0 +1,313 @@
+# ---------------------------------------------------------
+# 예측 모델 백테스트 (rolling-origin 교차 검증)
+# - 이력의 여러 시점(origin)에서 그 이전 데이터만으로 예측하고, 이후 실제 건수와 비교
+# - 모델: 기존 시뮬레이션, 계절 나이브, Holt-Winters(빠른 예측), Croston(간헐 시계열), Prophet (Prophet 외에는 벡터화)
+# - 리더보드에는 질병별 시계열 분류(zero / sparse / dense)를 함께 기록
+# - 분류별로 앱이 실제 제공하는 모델만 평가 (dense: Holt-Winters, Prophet / sparse: Croston)
+#   시뮬레이션, 계절 나이브는 비교 기준으로 모든 분류에서 평가하되 선택 대상은 아님
+# - 지표: MAE, MAPE(실제 건수 > 0인 달만), 예측구간 적중률(coverage), 1회 예측 시간
+# - 질병 묶음 단위로 프로세스 풀에서 병렬 실행, 결과는 데이터 버전 × 모델별로 캐시
+# - 질병별 리더보드: 앱이 제공하는 모델 중 충분히 정확한(MAE가 그중 최저의 1+TOLERANCE 배 이내) 가장 싼 모델을 선택
+#   (📊 AI 분석 센터의 '추천' 예측은 이 선택(chosen_model)을 따름)
+#
+# 사용 예) python backtest.py --workers 8
+#         python backtest.py --models simulation seasonal_naive --horizon 12
+# ---------------------------------------------------------
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+import data_loader
+import forecasting
+
+BACKTEST_DIR = os.path.join(data_loader.CACHE_DIR, "backtest")
+MODELS = ["simulation", "seasonal_naive", "holt_winters", "croston", "prophet"]
+VECTORIZED = {"simulation", "seasonal_naive", "holt_winters", "croston"}   # 질병 여러 개를 한 번에 예측하는 모델
+BASELINES = {"simulation", "seasonal_naive"}   # 비교 기준 (앱에서 제공하지 않으므로 선택 대상 아님)
+HORIZON = 6          # 각 origin에서 예측하는 개월 수
+FOLDS = 4            # origin 개수 (이력이 짧으면 줄어듦)
+STEP = 3             # origin 간격(개월)
+MIN_TRAIN = 6        # origin 이전에 필요한 최소 이력(개월)
+TOLERANCE = 0.1      # 최저 MAE 대비 이 비율 이내면 '충분히 정확'으로 봄
+ERROR_COLUMNS = ["disease", "model", "origin", "step", "actual", "yhat", "yhat_lower", "yhat_upper", "seconds"]
+
+
+def rolling_origins(n_periods, horizon=HORIZON, folds=FOLDS, step=STEP, min_train=MIN_TRAIN):
+    # 마지막 fold가 이력 끝에서 끝나도록 뒤에서부터 step씩 당김
+    origins = [n_periods - horizon - k * step for k in range(folds)]
+    return sorted(o for o in origins if o >= min_train)
+
+
+def served_models(kind):
+    """앱이 이 분류의 질병에 보여 주는 모델 (빠른 예측 경로, dense는 Prophet 포함)."""
+    models = {forecasting.KIND_MODELS[kind]}
+    if kind == "dense":
+        models.add("prophet")
+    return models
+
+
+def evaluated(model, kind):
+    # 전 기간 0건은 평가하지 않고, 비교 기준 외의 모델은 앱이 그 분류에 제공하는 경우만 평가
+    return kind != "zero" and (model in BASELINES or model in served_models(kind))
+
+
+def predict(model, diseases, periods, matrix, horizon):
+    """(질병 × 이력) 행렬로 (yhat, yhat_lower, yhat_upper) 세 (질병 × horizon) 행렬을 반환합니다."""
+    if model == "simulation":
+        seeds = [forecasting.disease_seed(d) for d in diseases]
+        return forecasting.simulation_batch(matrix, periods, horizon, seeds)
+    if model == "seasonal_naive":
+        return forecasting.seasonal_naive_batch(matrix, periods, horizon)
+    if model == "holt_winters":
+        return forecasting.holt_winters_batch(matrix, periods, horizon)
+    if model == "croston":
+        return forecasting.croston_batch(matrix, periods, horizon)
+    if model == "prophet":
+        frames = [forecasting.fit_prophet(forecasting.history_frame(periods, row), horizon) for row in matrix]
+        return tuple(np.stack([f[c].to_numpy() for f in frames]) for c in forecasting.FORECAST_COLUMNS[1:])
+    raise ValueError(f"알 수 없는 모델: {model}")
+
+
+def backtest_chunk(model, diseases, periods, matrix, origins, horizon):
+    # 프로세스 풀 작업 단위 (모듈 최상위 함수여야 spawn 방식에서도 피클 가능)
+    periods = np.asarray(periods, dtype='datetime64[M]')
+    matrix = np.asarray(matrix)
+    frames = []
+    for origin in origins:
+        start = time.perf_counter()
+        yhat, lower, upper = predict(model, diseases, periods[:origin], matrix[:, :origin], horizon)
+        seconds = (time.perf_counter() - start) / len(diseases)
+        frames.append(pd.DataFrame({
+            "disease": np.repeat(diseases, horizon),
+            "model": model,
+            "origin": str(periods[origin]),
+            "step": np.tile(np.arange(1, horizon + 1), len(diseases)),
+            "actual": matrix[:, origin:origin + horizon].reshape(-1).astype(float),
+            "yhat": np.asarray(yhat, dtype=float).reshape(-1),
+            "yhat_lower": np.asarray(lower, dtype=float).reshape(-1),
+            "yhat_upper": np.asarray(upper, dtype=float).reshape(-1),
+            "seconds": seconds,
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ERROR_COLUMNS)
+
+
+# ---------------------------------------------------------
+# 결과 저장소 (데이터 버전 × 모델 × 설정별)
+# ---------------------------------------------------------
+def errors_path(version, model, horizon=HORIZON, folds=FOLDS, step=STEP):
+    return os.path.join(BACKTEST_DIR, version, f"{model}-h{horizon}-f{folds}-s{step}.feather")
+
+
+def read_errors(path):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=ERROR_COLUMNS)
+    return feather.read_feather(path)
+
+
+def write_frame(frame, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(frame.reset_index(drop=True), tmp)
+    os.replace(tmp, path)
+
+
+def split_chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# ---------------------------------------------------------
+# 리더보드
+# ---------------------------------------------------------
+def leaderboard(errors, kinds, tolerance=TOLERANCE):
+    """예측 오차 표를 질병 × 모델별 지표로 요약합니다. (kinds: 질병 → 시계열 분류, dict 또는 함수)
+
+    rank: 비교 기준을 포함한 전체 모델 중 MAE 순위
+    served: 앱이 그 질병의 분류에 실제로 제공하는 모델인지
+    chosen: served 모델 중 MAE가 그중 최저의 (1 + tolerance)배 이내이고 1회 예측 시간이 가장 짧은 모델
+    """
+    e = errors.copy()
+    e["abs_error"] = (e["actual"] - e["yhat"]).abs()
+    e["ape"] = (e["abs_error"] / e["actual"]).where(e["actual"] > 0)
+    e["covered"] = (e["actual"] >= e["yhat_lower"]) & (e["actual"] <= e["yhat_upper"])
+    board = e.groupby(["disease", "model"], sort=False).agg(
+        folds=("origin", "nunique"),
+        mae=("abs_error", "mean"),
+        mape=("ape", "mean"),
+        coverage=("covered", "mean"),
+        fit_seconds=("seconds", "mean"),
+    ).reset_index()
+    board["mape"] *= 100
+    board.insert(1, "kind", board["disease"].map(kinds))
+    board["served"] = [m in served_models(k) for m, k in zip(board["model"], board["kind"])]
+
+    # 모델 비용은 질병별 측정값의 중앙값 (측정 잡음으로 순위가 뒤바뀌지 않도록 모델 단위로 비교)
+    cost = board.groupby("model")["fit_seconds"].median()
+    board["cost_rank"] = board["model"].map(cost.rank(method="first"))
+    board["rank"] = board.groupby("disease")["mae"].rank(method="min").astype(int)
+    served = board[board["served"]]
+    best = served.groupby("disease")["mae"].transform("min")
+    good = served["mae"] <= best * (1 + tolerance) + 1e-9
+    chosen = served[good].sort_values("cost_rank").drop_duplicates("disease")
+    board["chosen"] = False
+    board.loc[chosen.index, "chosen"] = True
+    return board.drop(columns="cost_rank").sort_values(["disease", "rank"], ignore_index=True)
+
+
+def leaderboard_dir(version):
+    return os.path.join(BACKTEST_DIR, version)
+
+
+def write_leaderboard(version, board, meta):
+    target = leaderboard_dir(version)
+    write_frame(board, os.path.join(target, "leaderboard.feather"))
+    # 사람이 보는 사본 (엑셀에서 한글이 깨지지 않도록 BOM 포함)
+    board.to_csv(os.path.join(target, "leaderboard.csv"), index=False, encoding="utf-8-sig")
+    with open(os.path.join(target, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    return target
+
+
+def leaderboard_stamp(version):
+    """저장된 리더보드의 수정 시각(ns) 문자열. 없으면 None. (다시 실행하면 바뀌므로 캐시 키로 사용)"""
+    try:
+        return str(os.stat(os.path.join(leaderboard_dir(version), "leaderboard.feather")).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+
+def read_leaderboard(version):
+    """저장된 리더보드 DataFrame. 없으면 None."""
+    path = os.path.join(leaderboard_dir(version), "leaderboard.feather")
+    if not os.path.exists(path):
+        return None
+    return feather.read_feather(path)
+
+
+def model_scores(board, disease, model):
+    """리더보드에서 (질병, 모델) 한 행을 dict로. 없으면 None."""
+    if board is None:
+        return None
+    row = board[(board["disease"] == disease) & (board["model"] == model)]
+    return None if row.empty else row.iloc[0].to_dict()
+
+
+def chosen_model(board, disease):
+    """리더보드가 질병에 고른 모델 이름 (holt_winters / croston / prophet). 없으면 None."""
+    if board is None:
+        return None
+    row = board[(board["disease"] == disease) & board["chosen"]]
+    return None if row.empty else row.iloc[0]["model"]
+
+
+# ---------------------------------------------------------
+# 실행
+# ---------------------------------------------------------
+def run_backtest(data_dir=data_loader.DATA_DIR, workers=None, models=None, diseases=None,
+                 horizon=HORIZON, folds=FOLDS, step=STEP, force=False, log=print):
+    data_index = data_loader.build_index(data_loader.load_archive(data_dir))
+    # 전 기간 0건인 질병은 모든 모델의 오차가 0이라 평가하지 않고, 모델은 분류별로 evaluated()인 경우만 실행
+    requested = [d for d in (diseases or data_index.diseases) if d in data_index]
+    targets = [d for d in requested if data_index.kind(d) != "zero"]
+    origins = rolling_origins(len(data_index.periods), horizon, folds, step)
+    models = models or MODELS
+    workers = workers or os.cpu_count()
+    if not origins:
+        raise ValueError(f"이력이 {len(data_index.periods)}개월뿐이라 백테스트할 수 없습니다 "
+                         f"(최소 {MIN_TRAIN + horizon}개월 필요).")
+
+    log(f"data version {data_index.version}: {len(targets)} diseases "
+        f"({len(requested) - len(targets)} all-zero skipped), models {', '.join(models)}, "
+        f"origins {', '.join(str(data_index.periods[o]) for o in origins)}, horizon {horizon} months")
+    start = time.perf_counter()
+    errors, failures = [], {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for model in models:
+            path = errors_path(data_index.version, model, horizon, folds, step)
+            cached = pd.DataFrame(columns=ERROR_COLUMNS) if force else read_errors(path)
+            eligible = [d for d in targets if evaluated(model, data_index.kind(d))]
+            todo = [d for d in eligible if d not in set(cached["disease"])]
+            log(f"  {model}: {len(eligible) - len(todo)} cached, {len(todo)} to run")
+            # 벡터화 모델은 워커 수만큼 큰 묶음으로, Prophet은 질병 하나씩 나눠 부하를 고르게
+            size = max(-(-len(todo) // workers), 1) if model in VECTORIZED else 1
+            for chunk in split_chunks(todo, size):
+                rows = np.stack([data_index.series(d) for d in chunk])
+                future = pool.submit(backtest_chunk, model, chunk, data_index.periods, rows, origins, horizon)
+                futures[future] = (model, chunk)
+            errors.append((model, path, cached))
+
+        results = {model: [] for model in models}
+        for future in as_completed(futures):
+            model, chunk = futures[future]
+            try:
+                results[model].append(future.result())
+            except Exception as e:
+                for d in chunk:
+                    failures[f"{model}:{d}"] = repr(e)
+                log(f"  실패: {model} ({len(chunk)} diseases): {e}")
+
+    # 리더보드는 이번에 계산한 질병뿐 아니라 캐시에 있는 현재 데이터의 모든 질병으로 만듦
+    frames = []
+    for model, path, cached in errors:
+        parts = [f for f in [cached] + results[model] if not f.empty]
+        if not parts:
+            continue
+        merged = pd.concat(parts, ignore_index=True)
+        if results[model]:
+            write_frame(merged, path)
+        # 현재 데이터에 없는 질병, 지금 분류에서는 평가하지 않는 (질병, 모델)의 캐시 결과는 제외
+        kinds = merged["disease"].map(lambda d: data_index.kind(d) if d in data_index else "zero")
+        frames.append(merged[[evaluated(model, k) for k in kinds]])
+    if not frames:
+        raise RuntimeError("백테스트 결과가 없습니다.")
+
+    board = leaderboard(pd.concat(frames, ignore_index=True), data_index.kind)
+    chosen = board.loc[board["chosen"], "model"].value_counts()
+    target = write_leaderboard(data_index.version, board, {
+        "version": data_index.version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "models": models,
+        "horizon": horizon,
+        "folds": folds,
+        "step": step,
+        "origins": [str(data_index.periods[o]) for o in origins],
+        "interval_width": forecasting.INTERVAL_WIDTH,
+        "tolerance": TOLERANCE,
+        "diseases": int(board["disease"].nunique()),
+        "chosen": {m: int(n) for m, n in chosen.items()},
+        "failures": failures,
+    })
+    log(f"leaderboard written to {target} in {time.perf_counter() - start:.1f}s ({len(failures)} failed)")
+    summary = board.groupby("model").agg(mae=("mae", "mean"), mape=("mape", "mean"),
+                                         coverage=("coverage", "mean"), fit_seconds=("fit_seconds", "mean"))
+    summary["chosen"] = chosen.reindex(summary.index, fill_value=0)
+    log(summary.round(4).to_string())
+    return target, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MediScope 예측 모델 백테스트")
+    parser.add_argument("--data-dir", default=data_loader.DATA_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=None, help="비교할 모델 (기본: 전부)")
+    parser.add_argument("--horizon", type=int, default=HORIZON, help="origin마다 예측하는 개월 수")
+    parser.add_argument("--folds", type=int, default=FOLDS, help="origin 개수")
+    parser.add_argument("--step", type=int, default=STEP, help="origin 간격(개월)")
+    parser.add_argument("--disease", action="append", help="특정 질병만 평가 (여러 번 지정 가능)")
+    parser.add_argument("--force", action="store_true", help="캐시된 결과를 무시하고 다시 계산")
+    args = parser.parse_args(argv)
+
+    _, failures = run_backtest(args.data_dir, args.workers, args.models, args.disease,
+                               args.horizon, args.folds, args.step, args.force)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
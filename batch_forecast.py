@@ -0,0 +1,92 @@
+# ---------------------------------------------------------
+# 전체 질병 일괄 예측 (헤드리스 실행)
+# - 앱과 같은 데이터 계층(data_loader)과 예측 계층(forecasting)을 사용
+# - 질병별 적합을 프로세스 풀로 병렬 실행하고, 데이터 버전별 저장소에 기록
+# - Prophet은 연속(dense) 시계열에만 적합하고, 전부 0 / 간헐 시계열은 빠른 예측(0건, Croston)으로 한 번에 처리
+# - 📊 AI 분석 센터는 저장소에 결과가 있으면 적합 없이 읽기만 함
+# - --disease로 일부 질병만 돌리면 같은 버전의 기존 저장소에 합쳐서 기록 (나머지 질병 예측은 유지)
+#
+# 사용 예) python batch_forecast.py --workers 8
+# ---------------------------------------------------------
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import data_loader
+import forecasting
+
+
+def forecast_one(disease, periods, values, horizon):
+    # 프로세스 풀 작업 단위 (모듈 최상위 함수여야 spawn 방식에서도 피클 가능)
+    return forecasting.prophet_forecast(disease, periods, values, horizon)
+
+
+def run_batch(data_dir=data_loader.DATA_DIR, workers=None, diseases=None, horizon=None, log=print):
+    data_index = data_loader.build_index(data_loader.load_archive(data_dir))
+    targets = [d for d in (diseases or data_index.diseases) if d in data_index]
+    if horizon is None:
+        horizon = forecasting.horizon_to(data_index.periods)
+
+    # 신호가 없거나 드문 시계열은 Prophet 없이 한 번에 처리
+    cheap = [d for d in targets if data_index.kind(d) != "dense"]
+    dense = [d for d in targets if data_index.kind(d) == "dense"]
+    log(f"data version {data_index.version}: {len(targets)} diseases "
+        f"({len(dense)} dense -> prophet, {len(cheap)} zero/sparse -> fast), horizon {horizon} months")
+    start = time.perf_counter()
+    results, failures = {}, {}
+    if cheap:
+        rows = np.array([data_index.row(d) for d in cheap])
+        fast = forecasting.fast_forecast(data_index.periods, data_index.matrix[rows], horizon, data_index.kinds[rows])
+        results.update((d, forecasting.forecast_frame(fast, i)) for i, d in enumerate(cheap))
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(forecast_one, d, data_index.periods, data_index.series(d), horizon): d
+            for d in dense
+        }
+        for future in as_completed(futures):
+            disease = futures[future]
+            try:
+                results[disease] = future.result()
+            except Exception as e:
+                failures[disease] = repr(e)
+                log(f"  실패: {disease}: {e}")
+
+    new_results, new_failures = len(results), failures
+    if diseases:
+        # 일부 질병만 다시 예측한 경우: 같은 버전의 기존 저장소에 합쳐서 나머지 질병의 예측을 보존
+        previous = forecasting.read_batch(data_index.version) or {}
+        meta = forecasting.read_batch_meta(data_index.version) or {}
+        results = {**{d: f for d, f in previous.items() if d not in targets}, **results}
+        failures = {**{d: e for d, e in meta.get("failures", {}).items() if d not in targets}, **failures}
+
+    # 모델별 질병 수 (같은 데이터 버전이면 시계열 분류가 같으므로 분류에서 바로 계산)
+    routes = {}
+    for d in results:
+        kind = data_index.kind(d)
+        model = "prophet" if kind == "dense" else forecasting.KIND_MODELS[kind]
+        routes[model] = routes.get(model, 0) + 1
+    stamp = forecasting.write_batch(data_index.version, results, failures=failures, routes=routes)
+    path = forecasting.batch_dir(data_index.version)
+    log(f"{new_results} forecasts written to {path} (run {stamp}) in {time.perf_counter() - start:.1f}s"
+        f" ({len(new_failures)} failed, {len(results)} stored)")
+    return path, new_failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MediScope 전체 질병 일괄 예측")
+    parser.add_argument("--data-dir", default=data_loader.DATA_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--horizon", type=int, default=None, help="예측 개월 수 (기본: 2026년 12월까지)")
+    parser.add_argument("--disease", action="append", help="특정 질병만 예측 (여러 번 지정 가능)")
+    args = parser.parse_args(argv)
+
+    _, failures = run_batch(args.data_dir, args.workers, args.disease, args.horizon)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# ---------------------------------------------------------
+# MediScope 벤치마크
+# - synth_data로 원하는 규모의 KDCA 형식 데이터를 만든 뒤
+#   데이터 계층(load_archive 등), 예측, 그리고 Streamlit AppTest로 app.py 전체 rerun을 측정
+# - 결과는 benchmarks/results/<시각>-<label>.json 으로 저장, --compare 로 이전 결과와 비교
+#
+# 사용 예)
+#   python benchmarks/run_benchmarks.py --diseases 300 --years 10 --label baseline
+#   python benchmarks/run_benchmarks.py --diseases 300 --years 10 --compare benchmarks/results/xxx-baseline.json
+# ---------------------------------------------------------
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+APP_PATH = os.path.join(ROOT, "app.py")
+REGRESSION_TOLERANCE = 0.2   # 20% 이상 느려지면 회귀로 표시
+REGRESSION_MIN_SECONDS = 0.005  # 단, 차이가 5ms 미만이면 측정 오차로 봄
+
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(fn, repeat=1):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summarize(runs):
+    return {"median": statistics.median(runs), "min": min(runs), "first": runs[0], "runs": len(runs)}
+
+
+# ---------------------------------------------------------
+# 측정 항목
+# ---------------------------------------------------------
+def bench_data_layer(data_dir, cache_dir, repeat):
+    import data_loader
+
+    results = {}
+
+    def cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        data_loader.load_archive(data_dir)
+
+    results["load_archive.cold"] = timed(cold, repeat)
+    results["load_archive.warm"] = timed(lambda: data_loader.load_archive(data_dir), repeat)
+
+    long_df = data_loader.load_archive(data_dir)
+    results["build_index"] = timed(lambda: data_loader.build_index(long_df), repeat)
+    data_index = data_loader.build_index(long_df)
+    results["build_metric_cube"] = timed(lambda: data_loader.build_metric_cube(data_index, state_path=None), repeat)
+
+    import region_cube
+
+    if region_cube.list_region_exports(data_dir):
+        def region_cold():
+            shutil.rmtree(region_cube.REGION_CACHE_DIR, ignore_errors=True)
+            region_cube.load_region_cube(data_dir)
+
+        results["region_cube.cold"] = timed(region_cold, repeat)
+        results["region_cube.warm"] = timed(lambda: region_cube.load_region_cube(data_dir), repeat)
+        cube = region_cube.load_region_cube(data_dir)
+        disease = cube.diseases[0]
+        # 전국 → 시도 → 하위 지역 드릴다운 조회
+        results["region_cube.drilldown"] = timed(
+            lambda: [cube.breakdown(r, disease) for r in (region_cube.NATIONAL,) + cube.children()], repeat)
+    return results, data_index
+
+
+def bench_forecast(data_index, repeat):
+    import forecasting
+
+    # 신고 건수가 가장 많은 질병 1개로 측정
+    disease = data_index.diseases[int(data_index.matrix.sum(axis=1).argmax())]
+    series = data_index.series(disease)
+
+    def cold():
+        shutil.rmtree(forecasting.FORECAST_DIR, ignore_errors=True)
+        forecasting.prophet_forecast(disease, data_index.periods, series)
+
+    results = {
+        "forecast.prophet.cold": timed(cold, repeat),
+        "forecast.prophet.warm": timed(lambda: forecasting.prophet_forecast(disease, data_index.periods, series), repeat),
+        # 빠른 예측: 전체 질병 × 월 행렬을 한 번에
+        "forecast.fast.all": timed(lambda: forecasting.fast_forecast(data_index.periods, data_index.matrix), repeat),
+    }
+
+    import backtest
+
+    # 벡터화 모델의 전체 질병 백테스트 (프로세스 풀 없이 한 묶음으로)
+    origins = backtest.rolling_origins(len(data_index.periods))
+    if origins:
+        for model in sorted(backtest.VECTORIZED):
+            results[f"backtest.{model}"] = timed(lambda: backtest.backtest_chunk(
+                model, list(data_index.diseases), data_index.periods, data_index.matrix, origins,
+                backtest.HORIZON), repeat)
+    return results
+
+
+def bench_app(data_index, repeat):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    grade = data_index.grades[-1]
+    disease = data_index.diseases_in(grade)[-1]
+
+    def check(at):
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return at
+
+    for i in range(repeat):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        at = AppTest.from_file(APP_PATH, default_timeout=600)
+        steps = [
+            ("app.cold_start", lambda: at.run()),
+            ("app.rerun.home", lambda: at.run()),
+            ("home.select_grade", lambda: at.selectbox(key="home_grade").set_value(grade).run()),
+            ("home.select_disease", lambda: at.selectbox(key="home_disease").set_value(disease).run()),
+            ("menu.chat", lambda: at.sidebar.radio[0].set_value("💬 AI 의료 상담").run()),
+            ("chat.respond", lambda: at.chat_input[0].set_value("진드기에 물린 것 같고 고열과 두통이 있어요").run()),
+            ("menu.ai_center", lambda: at.sidebar.radio[0].set_value("📊 AI 분석 센터").run()),
+            ("ai.select_grade", lambda: at.selectbox(key="ai_grade").set_value(grade).run()),
+            ("ai.select_disease", lambda: at.selectbox(key="ai_disease").set_value(disease).run()),
+            ("menu.my_page", lambda: at.sidebar.radio[0].set_value("👤 My Page").run()),
+        ]
+        for name, step in steps:
+            start = time.perf_counter()
+            check(step())
+            results.setdefault(name, []).append(time.perf_counter() - start)
+    return results
+
+
+# ---------------------------------------------------------
+# 결과 저장 / 비교
+# ---------------------------------------------------------
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def save_results(report, label):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def compare(report, baseline_path):
+    """기준 결과 대비 median 비율. 허용 범위를 넘는 항목 이름 목록을 반환합니다."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = []
+    print(f"\n{'benchmark':<26} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, cur in report["timings"].items():
+        base = baseline["timings"].get(name)
+        if base is None:
+            print(f"{name:<26} {'-':>10} {cur['median']:>9.3f}s")
+            continue
+        ratio = cur["median"] / base["median"] if base["median"] else float("inf")
+        mark = ""
+        if ratio > 1 + REGRESSION_TOLERANCE and cur["median"] - base["median"] >= REGRESSION_MIN_SECONDS:
+            regressions.append(name)
+            mark = "  << regression"
+        print(f"{name:<26} {base['median']:>9.3f}s {cur['median']:>9.3f}s {ratio:>6.2f}x{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MediScope 벤치마크")
+    parser.add_argument("--diseases", type=int, default=70)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--regions", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--skip-app", action="store_true", help="AppTest 기반 rerun 측정 생략")
+    parser.add_argument("--skip-forecast", action="store_true", help="Prophet 측정 생략")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    work = tempfile.mkdtemp(prefix="mediscope-bench-")
+    data_dir = os.path.join(work, "data")
+    cache_dir = os.path.join(work, "cache")
+    # 앱 모듈은 import 시점에 환경 변수를 읽으므로 import 전에 설정
+    os.environ["MEDISCOPE_DATA_DIR"] = data_dir
+    os.environ["MEDISCOPE_CACHE_DIR"] = cache_dir
+
+    import synth_data
+
+    try:
+        paths = synth_data.generate(data_dir, args.diseases, args.years, args.regions)
+        print(f"dataset: {args.diseases} diseases x {args.years} years x {args.regions} regions "
+              f"({sum(os.path.getsize(p) for p in paths) / 1024:.1f} KB)")
+
+        timings, data_index = bench_data_layer(data_dir, cache_dir, args.repeat)
+        if not args.skip_forecast:
+            timings.update(bench_forecast(data_index, args.repeat))
+        if not args.skip_app:
+            timings.update(bench_app(data_index, args.repeat))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "label": args.label,
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {"diseases": args.diseases, "years": args.years, "regions": args.regions, "repeat": args.repeat},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "timings": {name: summarize(runs) for name, runs in timings.items()},
+    }
+
+    print(f"\n{'benchmark':<26} {'median':>10} {'min':>10} {'first':>10}")
+    for name, t in report["timings"].items():
+        print(f"{name:<26} {t['median']:>9.3f}s {t['min']:>9.3f}s {t['first']:>9.3f}s")
+    print(f"\nsaved: {save_results(report, args.label)}")
+
+    if args.compare:
+        return 1 if compare(report, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
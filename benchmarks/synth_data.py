@@ -0,0 +1,120 @@
+# ---------------------------------------------------------
+# 벤치마크용 KDCA 형식 합성 데이터 생성기
+# - 질병 수 × 연도 수 × 지역 수를 조절해 법정감염병_월별_신고현황_*.csv와 같은 형식으로 생성
+# - 연도별로 파일 하나 (cp949, 2행 헤더: 연도 / 계·N월, 등급별 소계 행 포함)
+# - regions > 1 이면 시도별 파일을 regions/ 하위 폴더에 추가로 생성 (전국 파일 = 시도 합계)
+#
+# 사용 예) python benchmarks/synth_data.py out_dir --diseases 500 --years 10 --regions 17
+# ---------------------------------------------------------
+import argparse
+import csv
+import os
+
+import numpy as np
+
+BASE_DISEASES = [
+    ("제1급", "에볼라바이러스병"), ("제1급", "페스트"), ("제1급", "탄저"), ("제1급", "보툴리눔독소증"),
+    ("2급", "수두"), ("2급", "홍역"), ("2급", "콜레라"), ("2급", "장티푸스"), ("2급", "A형간염"),
+    ("2급", "백일해"), ("2급", "유행성이하선염"), ("2급", "성홍열"),
+    ("3급", "파상풍"), ("3급", "일본뇌염"), ("3급", "C형간염"), ("3급", "말라리아"),
+    ("3급", "레지오넬라증"), ("3급", "비브리오패혈증"), ("3급", "쯔쯔가무시증"), ("3급", "엠폭스"),
+]
+SIDO = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기",
+        "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+MONTH_LABELS = ["계"] + [f"{m}월" for m in range(1, 13)]
+
+
+def disease_table(n_diseases):
+    """(등급, 질병명) 목록. 실제 질병명 이후로는 '합성감염병-0001' 형식."""
+    table = list(BASE_DISEASES[:n_diseases])
+    grades = ["제1급", "2급", "3급"]
+    for i in range(len(table), n_diseases):
+        table.append((grades[i % 3], f"합성감염병-{i:04d}"))
+    # 등급 순으로 묶어야 소계 행을 KDCA 형식처럼 배치할 수 있음
+    return sorted(table, key=lambda gd: ["제1급", "2급", "3급"].index(gd[0]))
+
+
+def simulate_counts(n_diseases, n_years, n_regions, seed=0):
+    """(지역 × 질병 × 연도 × 12) 포아송 건수. 약 1/3은 전부 0인 희귀 질병."""
+    rng = np.random.default_rng(seed)
+    base = rng.lognormal(mean=2.0, sigma=1.8, size=n_diseases)
+    base[rng.random(n_diseases) < 0.33] = 0.0
+    phase = rng.uniform(0, 2 * np.pi, size=n_diseases)
+    amplitude = rng.uniform(0.0, 0.9, size=n_diseases)
+    trend = rng.normal(0.0, 0.05, size=n_diseases)
+    months = np.arange(12)
+    years = np.arange(n_years)
+    rate = (base[:, None, None]
+            * (1 + amplitude[:, None, None] * np.sin(2 * np.pi * months[None, None, :] / 12 + phase[:, None, None]))
+            * np.exp(trend[:, None, None] * years[None, :, None]))
+    share = rng.dirichlet(np.ones(n_regions))
+    return rng.poisson(rate[None] * share[:, None, None, None])
+
+
+def write_export(path, year, blocks):
+    """KDCA 내보내기 형식 CSV를 씁니다.
+
+    blocks: [(지역 또는 None, [(등급, 질병, 12개월 건수)])] - 지역이 있으면 맨 앞에 '시도' 열 추가
+    """
+    regional = blocks[0][0] is not None
+    lead = ["시도"] if regional else []
+    with open(path, "w", encoding="cp949", newline="") as f:
+        writer = csv.writer(f, lineterminator="\r\n")
+        writer.writerow(lead + ["급별(1)", "급별(2)"] + [str(year)] * 13)
+        writer.writerow(lead + ["급별(1)", "급별(2)"] + MONTH_LABELS)
+        for region, rows in blocks:
+            region_col = [region] if regional else []
+            # 등급별 소계 행 + 질병 행
+            for grade in dict.fromkeys(g for g, _, _ in rows):
+                block = [(d, c) for g, d, c in rows if g == grade]
+                subtotal = np.sum([c for _, c in block], axis=0)
+                writer.writerow(region_col + [grade, "소계", int(subtotal.sum())] + subtotal.tolist())
+                for disease, counts in block:
+                    writer.writerow(region_col + [grade, disease, int(counts.sum())] + counts.tolist())
+
+
+def region_names(n_regions):
+    return [SIDO[r % len(SIDO)] + ("" if r < len(SIDO) else f"-{r // len(SIDO)}") for r in range(n_regions)]
+
+
+def generate(out_dir, n_diseases=70, n_years=1, n_regions=1, end_year=2024, seed=0):
+    """합성 내보내기 파일들을 out_dir에 쓰고 생성한 전국 파일 경로 목록을 반환합니다."""
+    os.makedirs(out_dir, exist_ok=True)
+    table = disease_table(n_diseases)
+    counts = simulate_counts(n_diseases, n_years, n_regions, seed)
+    national = counts.sum(axis=0)
+    regions = region_names(n_regions)
+    paths = []
+    for y in range(n_years):
+        year = end_year - n_years + 1 + y
+        stamp = f"{year + 1}0101000000"
+        path = os.path.join(out_dir, f"법정감염병_월별_신고현황_{stamp}.csv")
+        write_export(path, year, [(None, [(g, d, national[i, y]) for i, (g, d) in enumerate(table)])])
+        paths.append(path)
+
+        if n_regions > 1:
+            region_dir = os.path.join(out_dir, "regions")
+            os.makedirs(region_dir, exist_ok=True)
+            write_export(
+                os.path.join(region_dir, f"시도별_법정감염병_월별_신고현황_{stamp}.csv"), year,
+                [(regions[r], [(g, d, counts[r, i, y]) for i, (g, d) in enumerate(table)])
+                 for r in range(n_regions)],
+            )
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KDCA 형식 합성 데이터 생성")
+    parser.add_argument("out_dir")
+    parser.add_argument("--diseases", type=int, default=70)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--regions", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = generate(args.out_dir, args.diseases, args.years, args.regions, seed=args.seed)
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"{len(paths)} national exports ({total / 1024:.1f} KB) written to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
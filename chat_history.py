@@ -0,0 +1,107 @@
+# ---------------------------------------------------------
+# 💬 AI 의료 상담 대화 기록 관리
+# - 화면(session_state)에는 최근 HISTORY_WINDOW개 메시지만 유지
+# - 오래된 메시지는 세션별 JSONL 아카이브 파일로 옮기고, 요청 시에만 불러옴
+# - 세션당 메모리 상한(MEMORY_CAP_BYTES)을 넘으면 오래된 메시지부터 아카이브
+# - 아카이브 파일은 마지막 기록 후 ARCHIVE_MAX_DAYS일이 지나거나 ARCHIVE_MAX_FILES개를 넘으면
+#   오래된 것부터 삭제 (새 세션이 시작될 때 한 번 정리)
+# ---------------------------------------------------------
+import glob
+import json
+import os
+import time
+import uuid
+from collections import deque
+
+import data_loader
+
+CHAT_DIR = os.path.join(data_loader.CACHE_DIR, "chat")
+HISTORY_WINDOW = int(os.environ.get("MEDISCOPE_CHAT_WINDOW", 20))
+MEMORY_CAP_BYTES = int(os.environ.get("MEDISCOPE_CHAT_MEMORY_CAP", 64 * 1024))
+ARCHIVE_MAX_DAYS = float(os.environ.get("MEDISCOPE_CHAT_ARCHIVE_DAYS", 30))
+ARCHIVE_MAX_FILES = int(os.environ.get("MEDISCOPE_CHAT_ARCHIVE_FILES", 1000))
+GREETING = "안녕하세요! 어떤 증상이 있으신가요? 자세히 설명해 주시면 분석해 드릴게요."
+
+
+def init_session(state):
+    # session_state에 대화 기록 기본값 설정 (이미 있으면 그대로)
+    if "chat_session_id" not in state:
+        state["chat_session_id"] = uuid.uuid4().hex
+        prune_archives()
+    if "messages" not in state:
+        state["messages"] = [{"role": "assistant", "content": GREETING}]
+    if "archived_count" not in state:
+        state["archived_count"] = 0
+
+
+def archive_path(session_id):
+    return os.path.join(CHAT_DIR, f"{session_id}.jsonl")
+
+
+def prune_archives(max_days=ARCHIVE_MAX_DAYS, max_files=ARCHIVE_MAX_FILES, now=None):
+    """오래된 세션 아카이브를 삭제하고 삭제한 파일 수를 반환합니다.
+
+    마지막 기록(mtime)이 max_days일보다 오래된 파일을 지우고, 남은 파일이 max_files개를
+    넘으면 마지막 기록이 오래된 것부터 지웁니다.
+    """
+    now = time.time() if now is None else now
+    files = []
+    for path in glob.glob(os.path.join(CHAT_DIR, "*.jsonl")):
+        try:
+            files.append((os.path.getmtime(path), path))
+        except OSError:
+            pass  # 다른 세션이 그 사이 삭제
+    files.sort(reverse=True)
+    expired = [path for i, (mtime, path) in enumerate(files)
+               if now - mtime > max_days * 86400 or i >= max_files]
+    removed = 0
+    for path in expired:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def message_bytes(messages):
+    return sum(len(m["content"].encode('utf-8')) for m in messages)
+
+
+def _spill(state, count):
+    # 가장 오래된 count개 메시지를 아카이브 파일 끝에 추가
+    old, state["messages"] = state["messages"][:count], state["messages"][count:]
+    os.makedirs(CHAT_DIR, exist_ok=True)
+    with open(archive_path(state["chat_session_id"]), 'a', encoding='utf-8') as f:
+        for m in old:
+            f.write(json.dumps({"role": m["role"], "content": m["content"]}, ensure_ascii=False) + "\n")
+    state["archived_count"] += len(old)
+
+
+def append_message(state, role, content):
+    """메시지를 추가하고 창 크기/메모리 상한을 넘는 오래된 메시지는 아카이브합니다."""
+    state["messages"].append({"role": role, "content": content})
+
+    overflow = len(state["messages"]) - HISTORY_WINDOW
+    if overflow > 0:
+        _spill(state, overflow)
+
+    # 최신 메시지 1개는 항상 화면에 남김
+    count = 0
+    size = message_bytes(state["messages"])
+    while size > MEMORY_CAP_BYTES and count < len(state["messages"]) - 1:
+        size -= message_bytes(state["messages"][count:count + 1])
+        count += 1
+    if count:
+        _spill(state, count)
+
+
+def load_archived(state, limit=None):
+    """아카이브된 이전 메시지를 오래된 순으로 읽습니다. limit이 있으면 가장 최근 limit개."""
+    path = archive_path(state.get("chat_session_id", ""))
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        lines = deque(f, maxlen=limit)
+    return [json.loads(line) for line in lines if line.strip()]
+
@@ -0,0 +1,602 @@
+# ---------------------------------------------------------
+# MediScope 데이터 계층
+# - 질병관리청(KDCA) 법정감염병 월별 신고현황 CSV 파싱
+# - (등급, 질병, 연도, 월, 건수) long-form 테이블로 변환
+# - 인코딩은 파일 앞부분으로 한 번만 판별하고, 블록 단위로 읽어 바로 long-form으로 변환 (파일 크기와 무관한 메모리)
+# - 파싱 결과를 Feather(Arrow IPC) 스토어로 캐시하여 웜 스타트 시 CSV 경로를 건너뜀
+# - 데이터 폴더의 월별 내보내기 파일들을 누적 다년도 테이블로 증분 병합
+# - 등급→질병, 질병→월별 시계열 조회용 읽기 전용 인덱스
+#   (시계열을 전부 0 / 간헐(sparse) / 연속(dense)으로 분류해 두어 예측, 이상 징후 스캔이 신호 있는 행에만 시간을 씀)
+# - 홈 메트릭 카드용 집계 큐브 (최근 월 건수, 전월 대비 증감률, 이상 징후 기반 경보 수준)
+# - 모든 세션이 복사 없이 함께 참조하는 읽기 전용 데이터셋 (SharedDataset)
+# ---------------------------------------------------------
+import codecs
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+
+import aberration
+
+DATA_DIR = os.environ.get("MEDISCOPE_DATA_DIR", "data")
+CACHE_DIR = os.environ.get("MEDISCOPE_CACHE_DIR", ".mediscope_cache")
+EXPORT_PATTERN = "법정감염병_월별_신고현황_*.csv"
+STORE_COLUMNS = ["grade", "disease", "year", "month", "count"]
+KEY_COLUMNS = ["grade", "disease", "year", "month"]
+EXCLUDE_ROWS = ["소계", "합계"]
+ENCODING_PROBE_BYTES = 64 * 1024       # 인코딩 판별 + 헤더 2행 읽기에 쓰는 앞부분 크기
+CHUNK_BYTES = int(os.environ.get("MEDISCOPE_CHUNK_BYTES", str(4 << 20)))  # 한 번에 파싱하는 블록 크기
+STORE_SCHEMA = pa.schema([("grade", pa.string()), ("disease", pa.string()), ("year", pa.int16()),
+                          ("month", pa.int8()), ("count", pa.int32())])
+
+
+def grade_sort_key(grade):
+    # "1급", "2급" 등 숫자만 추출하여 정렬 키로 사용
+    numbers = re.findall(r'\d+', str(grade))
+    return int(numbers[0]) if numbers else 999
+
+
+def normalize_grade(grade):
+    # '제N급' -> 'N급' (공백 제거 포함)
+    return str(grade).replace('제', '').strip()
+
+
+def empty_store():
+    return pd.DataFrame({
+        "grade": pd.Categorical([]),
+        "disease": pd.Categorical([]),
+        "year": np.array([], dtype=np.int16),
+        "month": np.array([], dtype=np.int8),
+        "count": np.array([], dtype=np.int32),
+    })
+
+
+# ---------------------------------------------------------
+# 1. CSV 파싱 (wide -> long)
+# ---------------------------------------------------------
+def detect_encoding(prefix):
+    """파일 앞부분만 보고 인코딩을 정합니다. (헤더에 한글이 있으므로 앞부분으로 충분)"""
+    try:
+        # 앞부분 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음 (final=False)
+        codecs.getincrementaldecoder('utf-8-sig')().decode(prefix, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def _open_source(source):
+    # 경로, bytes, 바이너리 파일 객체 모두 허용
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb')
+    return source
+
+
+def read_export_chunks(source, block_size=CHUNK_BYTES):
+    """내보내기 파일을 (헤더 2행, 블록별 Arrow RecordBatch 이터레이터)로 엽니다.
+
+    인코딩은 앞부분 ENCODING_PROBE_BYTES로 한 번만 판별하고, 본문은 pyarrow 스트리밍 CSV
+    리더로 block_size씩 읽습니다. 모든 열은 문자열(빈칸은 null)로 읽으며 숫자 변환은 호출하는 쪽에서 합니다.
+    """
+    f = _open_source(source)
+    prefix = f.read(ENCODING_PROBE_BYTES)
+    encoding = detect_encoding(prefix)
+    text = prefix.decode(encoding, errors='ignore')
+    header = list(csv.reader(io.StringIO(text)))[:2]
+    if len(header) < 2:
+        return header, iter(())
+
+    f.seek(0)
+    names = [f"c{i}" for i in range(len(header[1]))]
+    reader = pa_csv.open_csv(
+        f,
+        read_options=pa_csv.ReadOptions(encoding='utf8' if encoding == 'utf-8-sig' else encoding,
+                                        skip_rows=2, column_names=names, block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(column_types={n: pa.string() for n in names},
+                                              strings_can_be_null=True),
+    )
+
+    def chunks():
+        try:
+            yield from reader
+        finally:
+            f.close()
+    return header, chunks()
+
+
+def header_months(header, start):
+    """헤더 2행에서 월 열 목록 [(열 위치, 연도, 월)]. '계' 등 합계 열은 제외합니다."""
+    out = []
+    for i, (year_label, month_label) in enumerate(zip(header[0], header[1])):
+        if i < start:
+            continue
+        month = re.findall(r'\d+', str(month_label))
+        year = re.findall(r'\d{4}', str(year_label))
+        if month and year:
+            out.append((i, int(year[0]), int(month[0])))
+    return out
+
+
+def text_column(batch, i):
+    # 문자열 열 (앞뒤 공백 제거, 빈칸은 빈 문자열)
+    return pc.utf8_trim_whitespace(batch.column(i).fill_null(""))
+
+
+def normalize_grades(grades):
+    # 등급 정규화는 서로 다른 값(사전)에만 적용하고 행에는 take로 펼침
+    encoded = grades.dictionary_encode()
+    normalized = pa.array([normalize_grade(g) for g in encoded.dictionary.to_pylist()], type=pa.string())
+    return normalized.take(encoded.indices)
+
+
+def count_column(column):
+    """건수 열(문자열)을 int64 배열로. 빈칸, '-' 등 숫자가 아닌 값은 0."""
+    text = pc.utf8_trim_whitespace(column)
+    try:
+        values = pc.cast(text, pa.int64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # 숫자가 아닌 값이 섞인 열만 pandas로 변환
+        values = pa.array(pd.to_numeric(text.to_pandas(), errors='coerce'), type=pa.float64())
+        values = pc.cast(pc.if_else(pc.is_nan(values), None, values), pa.int64(), safe=False)
+    return values.fill_null(0).to_numpy(zero_copy_only=False)
+
+
+def chunk_counts(batch, months):
+    # 블록의 월 열들을 (행 × 월) int32 행렬로
+    if not months:
+        return np.zeros((batch.num_rows, 0), dtype=np.int32)
+    return np.column_stack([count_column(batch.column(i)) for i, _, _ in months]).astype(np.int32)
+
+
+def melt_chunk(batch, months):
+    """블록 하나(wide)를 소계/합계 제거, 등급 정규화 후 long-form Arrow 테이블(STORE_SCHEMA)로 바꿉니다."""
+    diseases = text_column(batch, 1)
+    keep = pc.invert(pc.is_in(diseases, value_set=pa.array(EXCLUDE_ROWS)))
+    grades = normalize_grades(text_column(batch, 0).filter(keep))
+    diseases = diseases.filter(keep)
+    counts = chunk_counts(batch, months)[keep.to_numpy(zero_copy_only=False)]
+    rows, n = counts.shape
+    # 행마다 월 수만큼 반복 (문자열 복사는 Arrow take로 처리)
+    repeat = pa.array(np.repeat(np.arange(rows, dtype=np.int64), n))
+    return pa.table({
+        "grade": grades.take(repeat),
+        "disease": diseases.take(repeat),
+        "year": np.tile(np.array([y for _, y, _ in months], dtype=np.int16), rows),
+        "month": np.tile(np.array([m for _, _, m in months], dtype=np.int8), rows),
+        "count": counts.ravel(),
+    }, schema=STORE_SCHEMA)
+
+
+def iter_long_chunks(source, block_size=CHUNK_BYTES):
+    """KDCA 내보내기를 블록 단위 long-form Arrow 테이블로 차례로 돌려줍니다.
+
+    첫 번째 헤더 행은 연도, 두 번째 헤더 행은 '계'/'N월' 라벨입니다.
+    """
+    header, chunks = read_export_chunks(source, block_size)
+    if len(header) < 2 or len(header[1]) < 3:
+        return
+    months = header_months(header, start=2)
+    if not months:
+        return
+    for chunk in chunks:
+        yield melt_chunk(chunk, months)
+
+
+def to_store_dtypes(long_df):
+    # 등급은 숫자 순서, 질병은 가나다 순서의 범주형으로 고정
+    grade_cats = sorted(pd.unique(long_df["grade"].astype(str)), key=grade_sort_key)
+    disease_cats = sorted(pd.unique(long_df["disease"].astype(str)))
+    out = pd.DataFrame({
+        "grade": pd.Categorical(long_df["grade"].astype(str), categories=grade_cats, ordered=True),
+        "disease": pd.Categorical(long_df["disease"].astype(str), categories=disease_cats),
+        "year": long_df["year"].astype(np.int16).to_numpy(),
+        "month": long_df["month"].astype(np.int8).to_numpy(),
+        "count": long_df["count"].astype(np.int32).to_numpy(),
+    })
+    return out.sort_values(["grade", "disease", "year", "month"], ignore_index=True)
+
+
+# ---------------------------------------------------------
+# 2. 파일 지문 + Feather 캐시
+# ---------------------------------------------------------
+def file_digest(file_path, block_size=1 << 20):
+    # 파일 전체를 메모리에 올리지 않고 1MB씩 해시
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _manifest_path():
+    return os.path.join(CACHE_DIR, "manifest.json")
+
+
+def load_manifest():
+    try:
+        with open(_manifest_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(changes):
+    """바뀐 manifest 항목만 기록합니다. 바뀐 것이 없으면 파일을 쓰지 않습니다.
+
+    앱/일괄 예측/API 서버 프로세스가 같은 manifest를 쓰므로, 쓰기 직전에 디스크의 최신 내용을
+    다시 읽어 바뀐 항목만 합칩니다. (다른 프로세스가 그 사이 기록한 항목을 덮어쓰지 않도록)
+    """
+    if not changes:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    manifest = load_manifest()
+    manifest.update(changes)
+    tmp = f"{_manifest_path()}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, _manifest_path())
+
+
+def manifest_changes(manifest, before):
+    # sync_export로 갱신된 manifest에서 before와 달라진 항목만
+    return {k: v for k, v in manifest.items() if before.get(k) != v}
+
+
+def store_path(digest):
+    return os.path.join(CACHE_DIR, f"{digest[:16]}.feather")
+
+
+def write_store(long_df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    # 메모리 맵으로 읽을 수 있도록 비압축으로 저장
+    feather.write_feather(long_df, tmp, compression='uncompressed')
+    os.replace(tmp, path)
+
+
+def write_store_chunks(chunks, path):
+    """long-form 블록(Arrow 테이블)들을 차례로 Feather 파일에 추가합니다. (전체를 메모리에 모으지 않음)
+
+    파일별 스토어는 등급/질병을 문자열로 저장하며, 병합(merge_stores) 때 범주형으로 정렬됩니다.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.ipc.new_file(tmp, STORE_SCHEMA) as writer:
+        for chunk in chunks:
+            writer.write_table(chunk)
+    os.replace(tmp, path)
+
+
+def read_store(path):
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas()
+
+
+def cached_digest(file_path, manifest):
+    """원본 파일의 해시(digest). (크기, mtime)이 manifest와 같으면 기록된 값을 그대로 사용하고,
+    다르면 새로 계산해 manifest에 기록합니다.
+    """
+    key = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    entry = manifest.get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = file_digest(file_path)
+    manifest[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    return digest
+
+
+def sync_export(file_path, manifest):
+    """원본 파일의 스토어가 최신인지 확인하고 해당 해시(digest)를 반환합니다.
+
+    (크기, mtime)이 manifest와 같으면 해시 계산 없이 기존 스토어를 사용하고,
+    다르면 해시를 비교해 내용이 바뀐 경우에만 CSV를 다시 파싱합니다.
+    """
+    digest = cached_digest(file_path, manifest)
+    path = store_path(digest)
+    if not os.path.exists(path):
+        write_store_chunks(iter_long_chunks(file_path), path)
+    return digest
+
+
+# ---------------------------------------------------------
+# 3. 다중 내보내기 파일 증분 병합
+# ---------------------------------------------------------
+def list_exports(data_dir=DATA_DIR):
+    # 파일명 끝의 내보내기 시각(YYYYMMDDhhmmss) 순 = 오래된 파일부터
+    return sorted(glob.glob(os.path.join(data_dir, EXPORT_PATTERN)), key=os.path.basename)
+
+
+def merge_stores(frames):
+    # 같은 (등급, 질병, 연도, 월)이 겹치면 나중(최신) 내보내기 값을 사용
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates(subset=KEY_COLUMNS, keep='last')
+    return to_store_dtypes(merged)
+
+
+def archive_path(digests):
+    key = hashlib.sha256("|".join(digests).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"archive-{key[:16]}.feather")
+
+
+def _remove_stale_archives(keep):
+    for path in glob.glob(os.path.join(CACHE_DIR, "archive-*.feather")):
+        if os.path.abspath(path) != os.path.abspath(keep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # 다른 세션이 메모리 맵으로 열고 있으면 다음 기회에 삭제
+
+
+def sync_archive(data_dir=DATA_DIR):
+    """데이터 폴더의 모든 내보내기를 합친 누적 스토어를 최신으로 만들고 경로를 반환합니다.
+
+    새로 추가되거나 바뀐 파일만 파싱하며, 기존 누적 테이블 뒤에 새 파일이
+    추가된 경우에는 누적 테이블과 새 파일만 병합합니다. 내보내기가 없으면 None.
+    """
+    exports = list_exports(data_dir)
+    if not exports:
+        return None
+
+    manifest = load_manifest()
+    before = dict(manifest)
+    digests = [sync_export(path, manifest) for path in exports]
+    target = archive_path(digests)
+    previous = manifest.get("__archive__", {})
+    prev_digests = previous.get("digests", [])
+
+    if os.path.exists(target):
+        pass
+    elif prev_digests and digests[:len(prev_digests)] == prev_digests \
+            and os.path.exists(archive_path(prev_digests)):
+        # 증분: 기존 누적 테이블 + 새로 추가된 파일들
+        new_frames = [read_store(store_path(d)) for d in digests[len(prev_digests):]]
+        write_store(merge_stores([read_store(archive_path(prev_digests))] + new_frames), target)
+    else:
+        # 기존 파일이 바뀌었거나 삭제된 경우: 파일별 스토어로 재구성 (CSV 재파싱 없음)
+        write_store(merge_stores([read_store(store_path(d)) for d in digests]), target)
+
+    manifest["__archive__"] = {"digests": digests}
+    save_manifest(manifest_changes(manifest, before))
+    _remove_stale_archives(target)
+    return target
+
+
+def load_archive(data_dir=DATA_DIR):
+    """누적 long-form 테이블 (pandas DataFrame)."""
+    path = sync_archive(data_dir)
+    return read_store(path) if path else empty_store()
+
+
+# ---------------------------------------------------------
+# 4. 읽기 전용 조회 인덱스
+# ---------------------------------------------------------
+# 시계열 분류 (kinds 배열의 값 = 이 튜플의 위치)
+SERIES_KINDS = ("zero", "sparse", "dense")
+ZERO, SPARSE, DENSE = range(len(SERIES_KINDS))
+# 평균 발생 간격(ADI = 전체 개월 수 / 신고가 있던 개월 수)이 이보다 크면 간헐 시계열
+# (Syntetos-Boylan 분류 기준값)
+ADI_CUTOFF = 1.32
+
+
+def classify_series(matrix):
+    """(행 × 월) 행렬의 행마다 ZERO / SPARSE / DENSE 코드(int8 배열)를 반환합니다."""
+    matrix = np.asarray(matrix)
+    nonzero = np.count_nonzero(matrix, axis=1)
+    kinds = np.full(len(matrix), DENSE, dtype=np.int8)
+    kinds[nonzero * ADI_CUTOFF < matrix.shape[1]] = SPARSE
+    kinds[nonzero == 0] = ZERO
+    return kinds
+
+
+class DataIndex:
+    """load_data()가 한 번 만들어 두는 읽기 전용 인덱스.
+
+    - diseases_in(grade): 등급별 정렬된 질병 목록 (tuple)
+    - series(disease): 전체 기간(periods)에 대한 월별 건수 배열 (연속 메모리, 쓰기 불가)
+    - kind(disease): 시계열 분류 ("zero" / "sparse" / "dense")
+    - version: 데이터 내용 지문 (캐시 키로 사용)
+    """
+    __slots__ = ("grades", "diseases", "periods", "matrix", "kinds", "version",
+                 "_by_grade", "_grade_of", "_row")
+
+    def __init__(self, grades, diseases, periods, matrix, grade_of):
+        self.grades = tuple(grades)
+        self.diseases = tuple(diseases)
+        self.periods = np.asarray(periods, dtype='datetime64[M]')
+        self.periods.flags.writeable = False
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.int32)
+        self.matrix.flags.writeable = False
+        self.kinds = classify_series(self.matrix)
+        self.kinds.flags.writeable = False
+        self._grade_of = dict(zip(self.diseases, grade_of))
+        self._row = {d: i for i, d in enumerate(self.diseases)}
+        by_grade = {g: [] for g in self.grades}
+        for d in self.diseases:
+            by_grade[self._grade_of[d]].append(d)
+        self._by_grade = {g: tuple(ds) for g, ds in by_grade.items()}
+        self.version = index_version(self.diseases, self.periods, self.matrix)
+
+    def __reduce__(self):
+        # st.cache_data 피클/언피클 후에도 읽기 전용 상태를 유지
+        grade_of = [self._grade_of[d] for d in self.diseases]
+        return (DataIndex, (self.grades, self.diseases, self.periods, self.matrix, grade_of))
+
+    def diseases_in(self, grade):
+        return self._by_grade.get(grade, ())
+
+    def grade_of(self, disease):
+        return self._grade_of.get(disease)
+
+    def series(self, disease):
+        return self.matrix[self._row[disease]]
+
+    def row(self, disease):
+        return self._row[disease]
+
+    def kind(self, disease):
+        return SERIES_KINDS[self.kinds[self._row[disease]]]
+
+    def __contains__(self, disease):
+        return disease in self._row
+
+
+def series_fingerprint(periods, values):
+    h = hashlib.sha256()
+    h.update(np.asarray(periods, dtype='datetime64[M]').astype(np.int64).tobytes())
+    h.update(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+    return h.hexdigest()[:16]
+
+
+def index_version(diseases, periods, matrix):
+    h = hashlib.sha256("|".join(diseases).encode('utf-8'))
+    h.update(series_fingerprint(periods, matrix).encode())
+    return h.hexdigest()[:16]
+
+
+def build_index(long_df):
+    """long-form 테이블에서 (질병 × 기간) 행렬을 한 번에 만들어 인덱스로 감쌉니다."""
+    if long_df.empty:
+        return DataIndex([], [], [], np.zeros((0, 0), dtype=np.int32), [])
+
+    grades = long_df["grade"].astype("category")
+    diseases = long_df["disease"].astype("category")
+    period = (long_df["year"].to_numpy(np.int64) - 1970) * 12 + long_df["month"].to_numpy(np.int64) - 1
+    first, last = period.min(), period.max()
+    periods = np.arange(first, last + 1).astype('datetime64[M]')
+
+    disease_names = list(diseases.cat.categories)
+    codes = diseases.cat.codes.to_numpy()
+    counts = long_df["count"].to_numpy()
+    # 등급이 재분류된 질병(예: 코로나19 1급 → 2급)은 같은 달이 여러 등급 행에 나뉘어 있으므로 건수를 합침
+    matrix = np.zeros((len(disease_names), len(periods)), dtype=np.int32)
+    np.add.at(matrix, (codes, period - first), counts)
+
+    # 질병별 등급: 신고가 있던 가장 최근 달의 등급 (신고가 전혀 없으면 가장 최근 달,
+    # 같은 달에 여러 등급이면 뒤 등급). 정렬 키는 마지막이 우선이고, 질병별 마지막 행을 사용
+    grade_codes = grades.cat.codes.to_numpy()
+    order = np.lexsort((grade_codes, period, counts > 0, codes))
+    last = order[np.r_[codes[order][1:] != codes[order][:-1], True]]
+    disease_grade = np.zeros(len(disease_names), dtype=np.int64)
+    disease_grade[codes[last]] = grade_codes[last]
+    grade_names = list(grades.cat.categories)
+    grade_of = [grade_names[c] for c in disease_grade]
+
+    # 등급 순서(숫자 순) 유지, 실제 데이터가 있는 등급만
+    present = sorted(set(grade_of), key=grade_sort_key)
+    return DataIndex(present, disease_names, periods, matrix, grade_of)
+
+
+# ---------------------------------------------------------
+# 5. 메트릭 집계 큐브
+# ---------------------------------------------------------
+# (수준, 경보를 낸 탐지 방법 수 하한, 표시 색상) - 위에서부터 순서대로 비교
+ALERT_LEVELS = [
+    ("심각", 3, "#D62728"),
+    ("경계", 2, "#FF7F0E"),
+    ("주의", 1, "#FFB000"),
+    ("관심", 0, "#5361F2"),
+]
+ABERRATION_STATE = os.path.join(CACHE_DIR, "aberration", "state.npz")
+
+
+def alert_levels(alarms):
+    """탐지 방법(EARS C1/C2/C3, CUSUM) 중 경보를 낸 개수로 경보 수준 배열을 만듭니다."""
+    alarms = np.asarray(alarms)
+    names = [name for name, _, _ in ALERT_LEVELS]
+    conditions = [alarms >= low for _, low, _ in ALERT_LEVELS]
+    return np.select(conditions, names, default=names[-1])
+
+
+def alert_color(level):
+    return next((color for name, _, color in ALERT_LEVELS if name == level), ALERT_LEVELS[-1][2])
+
+
+def build_metric_cube(data_index, state_path=ABERRATION_STATE):
+    """질병별 + 등급별 메트릭을 한 번에 계산합니다. (index: 질병명 또는 등급명)
+
+    - latest: 최근 월 신고 건수, prev: 전월 건수
+    - delta_pct: 전월 대비 증감률(%), 전월이 0이면 NaN (둘 다 0이면 0)
+    - c1 / c2 / c3 / cusum: 최근 월 이상 징후 통계, alarms / methods: 경보를 낸 방법 수 / 이름
+    - level: 경보 수준
+    """
+    columns = ["grade", "latest", "prev", "delta_pct"] + list(aberration.METHODS) + ["alarms", "methods", "level"]
+    matrix = data_index.matrix
+    if matrix.shape[1] == 0:
+        return pd.DataFrame(columns=columns)
+
+    # 질병 행 + 등급 소계 행을 하나의 행렬로 (등급 소계는 질병 행의 합)
+    grade_of = np.array([data_index.grade_of(d) for d in data_index.diseases], dtype=object)
+    grade_rows = np.stack([matrix[grade_of == g].sum(axis=0) for g in data_index.grades]) \
+        if data_index.grades else np.zeros((0, matrix.shape[1]), dtype=matrix.dtype)
+    cube = np.vstack([matrix, grade_rows]).astype(np.int64)
+    names = list(data_index.diseases) + list(data_index.grades)
+
+    latest = cube[:, -1]
+    prev = cube[:, -2] if cube.shape[1] > 1 else np.zeros_like(latest)
+    delta = np.divide((latest - prev) * 100.0, prev, out=np.full(len(latest), np.nan), where=prev > 0)
+    delta[(prev == 0) & (latest == 0)] = 0.0
+
+    # 신고가 있는 행만 한 번에 스캔 (저장된 상태가 있으면 새 월만 갱신, 전부 0인 행은 스캔 생략)
+    scan = aberration.scan_active(names, data_index.periods, cube, state_path)
+    alarms = aberration.alarm_counts(scan)
+    method_flags = aberration.flags(scan)
+    methods = [", ".join(m.upper() for m in aberration.METHODS if method_flags[m][i]) for i in range(len(names))]
+
+    return pd.DataFrame({
+        "grade": list(grade_of) + list(data_index.grades),
+        "latest": latest,
+        "prev": prev,
+        "delta_pct": delta,
+        "c1": scan.c1,
+        "c2": scan.c2,
+        "c3": scan.c3,
+        "cusum": scan.cusum,
+        "alarms": alarms,
+        "methods": methods,
+        "level": alert_levels(alarms),
+    }, index=names)
+
+
+# ---------------------------------------------------------
+# 6. 세션 공유용 읽기 전용 데이터셋
+# ---------------------------------------------------------
+# index: DataIndex (쓰기 불가 배열), metrics: {이름: {지표: 값}} 읽기 전용 매핑,
+# alerts: 경보 질병 (이름, 등급, 수준, 방법) 튜플
+SharedDataset = namedtuple("SharedDataset", ["diseases", "grades", "index", "metrics", "alerts"])
+
+
+def freeze_metrics(cube):
+    records = cube.to_dict(orient='index')
+    return MappingProxyType({name: MappingProxyType(row) for name, row in records.items()})
+
+
+def load_shared(data_dir=DATA_DIR, state_path=ABERRATION_STATE):
+    """st.cache_resource로 프로세스당 한 번 만들어 모든 세션이 그대로 공유하는 데이터셋.
+
+    long-form 테이블은 인덱스를 만들 때만 잠시 사용하고 버리므로, 세션 수와 관계없이
+    메모리에는 (질병 × 월) 행렬과 메트릭 하나씩만 남습니다.
+    """
+    data_index = build_index(load_archive(data_dir))
+    cube = build_metric_cube(data_index, state_path)
+
+    diseases_only = cube[cube.index.isin(data_index.diseases) & (cube["alarms"] > 0)]
+    alerts = tuple(
+        (name, r["grade"], r["level"], r["methods"])
+        for name, r in diseases_only.sort_values(["alarms", "c3"], ascending=False).iterrows()
+    )
+    return SharedDataset(data_index.diseases, data_index.grades, data_index, freeze_metrics(cube), alerts)
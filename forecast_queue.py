@@ -0,0 +1,162 @@
+# ---------------------------------------------------------
+# 예측 작업 큐 (single-flight)
+# - 같은 (질병, 이력 지문, horizon) 예측 요청은 세션/서버 프로세스가 달라도 적합을 한 번만 실행
+# - 작업 상태는 CACHE_DIR/forecast_jobs.sqlite에 기록 (프로세스 간 잠금 역할)
+# - 결과는 forecasting.prophet_forecast의 디스크 캐시(Feather)에 저장되고, 기다리던 쪽은 그 파일을 읽음
+# - 적합은 프로세스마다 크기가 제한된 스레드 풀에서 실행 (Prophet/Stan 계산은 별도 프로세스라 GIL 영향 적음)
+# ---------------------------------------------------------
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import pyarrow.feather as feather
+
+import data_loader
+import forecasting
+
+JOB_DB = os.path.join(data_loader.CACHE_DIR, "forecast_jobs.sqlite")
+QUEUE_WORKERS = int(os.environ.get("MEDISCOPE_FORECAST_WORKERS", "2"))
+WAIT_SECONDS = float(os.environ.get("MEDISCOPE_FORECAST_WAIT", "120"))
+STALE_SECONDS = 600       # 이 시간 안에 끝나지 않은 작업은 중단된 것으로 보고 다시 실행
+RETRY_SECONDS = 300       # 실패한 작업은 이 시간이 지나야 다시 시도
+POLL_SECONDS = 0.5
+DEFAULT_EXPECTED = 10.0   # 완료 이력이 없을 때 진행률 표시에 쓰는 예상 적합 시간(초)
+
+# state: "done" / "running" / "failed" / "missing"(요청 기록 없음 또는 중단된 작업)
+JobStatus = namedtuple("JobStatus", ["state", "started", "expected", "error"])
+
+
+class ForecastQueue:
+    """프로세스당 하나 만들어 모든 세션이 공유하는 예측 작업 큐."""
+
+    def __init__(self, db_path=JOB_DB, workers=QUEUE_WORKERS):
+        self.db_path = db_path
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="forecast")
+        self._lock = threading.Lock()
+        self._inflight = {}     # 이 프로세스에서 실행 중인 작업 {key: Future}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " key TEXT PRIMARY KEY, disease TEXT, status TEXT, owner TEXT,"
+                " started REAL, finished REAL, error TEXT)"
+            )
+
+    def _connect(self):
+        # isolation_level=None: 트랜잭션은 BEGIN IMMEDIATE로 직접 관리
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    # -----------------------------------------------------
+    # 작업 선점 / 실행
+    # -----------------------------------------------------
+    def _claim(self, key, disease):
+        """다른 곳에서 실행 중이 아니면 작업을 이 프로세스 소유로 기록합니다. 선점했으면 True."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, started, finished FROM jobs WHERE key = ?", (key,)).fetchone()
+            busy = row is not None and (
+                (row[0] == "running" and now - row[1] < STALE_SECONDS)
+                or (row[0] == "failed" and now - row[2] < RETRY_SECONDS)
+            )
+            if not busy:
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs VALUES (?, ?, 'running', ?, ?, NULL, NULL)",
+                    (key, disease, self.owner, now),
+                )
+            conn.execute("COMMIT")
+        return not busy
+
+    def _finish(self, key, error=None):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished = ?, error = ? WHERE key = ? AND owner = ?",
+                ("failed" if error else "done", time.time(), error, key, self.owner),
+            )
+
+    def _run(self, key, disease, periods, values, horizon):
+        try:
+            forecasting.prophet_forecast(disease, periods, values, horizon)
+        except Exception as e:
+            self._finish(key, repr(e))
+        else:
+            self._finish(key)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def submit(self, disease, periods, values, horizon=None):
+        """예측 작업을 요청하고 (작업 키, 결과 파일 경로, 새로 시작했는지)를 반환합니다.
+
+        결과가 이미 있거나 같은 작업이 어디선가 실행 중이면 새로 시작하지 않습니다.
+        """
+        if horizon is None:
+            horizon = forecasting.horizon_to(periods)
+        fingerprint = data_loader.series_fingerprint(periods, values)
+        path = forecasting.forecast_path("prophet", disease, fingerprint, horizon)
+        key = os.path.basename(path)
+        if os.path.exists(path):
+            return key, path, False
+        with self._lock:
+            if key in self._inflight or not self._claim(key, disease):
+                return key, path, False
+            self._inflight[key] = self._pool.submit(self._run, key, disease, periods, values, horizon)
+        return key, path, True
+
+    # -----------------------------------------------------
+    # 상태 조회 / 대기
+    # -----------------------------------------------------
+    def expected_seconds(self, conn):
+        # 지금까지 완료된 적합 시간의 평균 (진행률 표시용)
+        row = conn.execute("SELECT avg(finished - started) FROM jobs WHERE status = 'done'").fetchone()
+        return row[0] or DEFAULT_EXPECTED
+
+    def status(self, key, path):
+        if os.path.exists(path):
+            return JobStatus("done", None, None, None)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT status, started, error FROM jobs WHERE key = ?", (key,)).fetchone()
+            expected = self.expected_seconds(conn)
+        if row is None or (row[0] == "running" and time.time() - row[1] >= STALE_SECONDS):
+            return JobStatus("missing", None, expected, None)
+        if row[0] == "done":
+            # 기록은 완료인데 결과 파일이 지워진 경우 -> 다시 요청해야 함
+            return JobStatus("missing", None, expected, None)
+        return JobStatus(row[0], row[1], expected, row[2])
+
+    def wait(self, disease, periods, values, horizon=None, timeout=WAIT_SECONDS, on_progress=None):
+        """예측 결과 DataFrame을 반환합니다. 적합이 실패하면 None.
+
+        on_progress(status, elapsed, joined): 기다리는 동안 주기적으로 호출
+        (joined: 다른 세션/프로세스가 먼저 시작한 작업을 기다리는 중인지)
+        timeout 초 안에 끝나지 않으면 TimeoutError (작업 자체는 계속 실행됨)
+        """
+        key, path, started = self.submit(disease, periods, values, horizon)
+        joined = not started
+        begin = time.monotonic()
+        while True:
+            status = self.status(key, path)
+            if status.state == "done":
+                return feather.read_feather(path)
+            if status.state == "failed":
+                return None
+            if status.state == "missing":
+                # 실행하던 프로세스가 중단됐거나 결과가 지워짐 -> 이쪽에서 다시 요청
+                key, path, started = self.submit(disease, periods, values, horizon)
+                joined = joined and not started
+            elapsed = time.monotonic() - begin
+            if elapsed >= timeout:
+                raise TimeoutError(f"{disease} 예측이 {timeout:.0f}초 안에 끝나지 않았습니다.")
+            if on_progress is not None:
+                on_progress(status, elapsed, joined)
+            time.sleep(POLL_SECONDS)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
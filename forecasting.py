@@ -0,0 +1,414 @@
+# ---------------------------------------------------------
+# MediScope 예측/시뮬레이션 계층
+# - 2024년 월별 패턴을 기준으로 2021~2026년 데이터를 확장 (질병별 고정 시드, 지금은 백테스트 비교 기준으로만 사용)
+# - 질병 × 연도 × 월 행렬을 NumPy 브로드캐스팅으로 한 번에 생성
+# - 실제 월별 이력에 Prophet을 적합한 예측 (결과는 디스크에 캐시)
+# - batch_forecast.py가 미리 계산해 둔 버전별 예측 저장소 읽기/쓰기
+# - 벡터화 예측 (시뮬레이션, 계절 나이브, Holt-Winters): 여러 질병을 (질병 × 월) 행렬로 한 번에 예측
+#   (Holt-Winters는 앱의 '빠른 예측' 모드 - 전체 질병을 수 ms에 예측하고 예측구간까지 계산)
+# - 시계열 분류별 경로: 전부 0 → 0건 예측, 간헐(sparse) → Croston(SBA), 연속(dense) → Holt-Winters / Prophet
+# ---------------------------------------------------------
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+import data_loader
+import lazy_imports
+
+SIM_YEARS = np.arange(2021, 2027)
+BASE_YEAR = 2024
+TARGET_YEAR = 2026
+INTERVAL_WIDTH = 0.8
+SIM_BAND = 0.2            # 시뮬레이션 예측의 고정 구간 (±20%)
+SEASON = 12
+FAST_MODEL = "holt_winters"
+# Holt-Winters 평활 계수 후보: 질병마다 이력 안 1기 앞 예측 오차(SSE)가 가장 작은 조합을 선택
+HW_ALPHAS = (0.1, 0.3, 0.5, 0.8)   # 수준
+HW_BETAS = (0.0, 0.1)              # 추세 (0이면 추세 없음)
+HW_GAMMAS = (0.1, 0.3)             # 계절성
+HW_PHI = 0.9                       # 추세 감쇠 (장기 예측이 한없이 늘거나 줄지 않도록)
+CROSTON_ALPHA = 0.1                # Croston 평활 계수 (발생 크기, 발생 간격 공통)
+# 시계열 분류별 빠른 예측 모델
+KIND_MODELS = {"zero": "zero", "sparse": "croston", "dense": FAST_MODEL}
+FORECAST_DIR = os.path.join(data_loader.CACHE_DIR, "forecasts")
+BATCH_DIR = os.path.join(data_loader.CACHE_DIR, "batch")
+# 0이면 앱에서는 적합하지 않고 batch_forecast.py 결과만 사용
+ONDEMAND_FIT = os.environ.get("MEDISCOPE_ONDEMAND_FIT", "1") != "0"
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+# 여러 질병의 예측을 한 번에 담는 구조
+# (periods: 예측 월, yhat/yhat_lower/yhat_upper: 질병 × horizon 행렬, models: 행별 사용 모델)
+BatchForecast = namedtuple("BatchForecast", ["periods", "yhat", "yhat_lower", "yhat_upper", "models"])
+
+
+def disease_seed(disease):
+    # 내장 hash()는 프로세스마다 달라지므로 질병명 해시로 고정 시드 생성
+    return int.from_bytes(hashlib.sha256(str(disease).encode('utf-8')).digest()[:4], 'little')
+
+
+def year_factors(years=SIM_YEARS):
+    # 과거: 0.8 + 0.05/년, 기준 연도: 1.0, 미래: 1.0 + 0.1/년
+    years = np.asarray(years)
+    return np.where(years < BASE_YEAR, 0.8 + (years - 2021) * 0.05,
+                    np.where(years == BASE_YEAR, 1.0, 1.0 + (years - BASE_YEAR) * 0.1))
+
+
+def noise_scales(years=SIM_YEARS):
+    years = np.asarray(years)
+    return np.where(years < BASE_YEAR, 5.0, np.where(years == BASE_YEAR, 0.0, 10.0))
+
+
+def simulate_batch(patterns, seeds, years=SIM_YEARS):
+    """(질병 × 12) 패턴을 (질병 × 연도 × 12) 정수 행렬로 확장합니다."""
+    patterns = np.nan_to_num(np.asarray(patterns, dtype=float)).reshape(-1, 12)
+    years = np.asarray(years)
+    noise = np.stack([
+        np.random.default_rng(seed).standard_normal((len(years), 12)) for seed in seeds
+    ]) if len(seeds) else np.zeros((0, len(years), 12))
+
+    values = (patterns[:, None, :] * year_factors(years)[None, :, None]
+              + noise * noise_scales(years)[None, :, None])
+    return np.maximum(values, 0).astype(np.int64)
+
+
+def monthly_frame(periods, values):
+    """월별 값을 Date / Patients / Year / Month 열의 DataFrame으로 변환합니다."""
+    months = np.asarray(periods, dtype='datetime64[M]')
+    month_ids = months.astype(np.int64)
+    return pd.DataFrame({
+        "Date": months.astype('datetime64[ns]'),
+        "Patients": np.asarray(values),
+        "Year": month_ids // 12 + 1970,
+        "Month": month_ids % 12 + 1,
+    })
+
+
+# ---------------------------------------------------------
+# Prophet 예측 (실제 이력 기반 + 디스크 캐시)
+# ---------------------------------------------------------
+def horizon_to(periods, target_year=TARGET_YEAR):
+    # 마지막 관측 월 다음 달부터 target_year 12월까지의 개월 수
+    if len(periods) == 0:
+        return 12
+    last = np.asarray(periods, dtype='datetime64[M]')[-1]
+    end = np.datetime64(f"{target_year}-12", 'M')
+    return max(int((end - last).astype(int)), 1)
+
+
+def history_frame(periods, values):
+    return pd.DataFrame({
+        "ds": np.asarray(periods, dtype='datetime64[M]').astype('datetime64[ns]'),
+        "y": np.asarray(values, dtype=float),
+    })
+
+
+def forecast_path(model, disease, fingerprint, horizon):
+    key = hashlib.sha256(f"{model}|{disease}|{fingerprint}|{horizon}|{INTERVAL_WIDTH}".encode('utf-8'))
+    return os.path.join(FORECAST_DIR, f"{model}-{key.hexdigest()[:20]}.feather")
+
+
+def fit_prophet(history, horizon):
+    """Prophet을 적합하고 horizon개월의 yhat / yhat_lower / yhat_upper를 반환합니다."""
+    # prophet은 cmdstanpy/Stan 백엔드까지 불러오므로 첫 적합 시점에만 로드
+    Prophet = lazy_imports.load("prophet").Prophet
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    model = Prophet(
+        interval_width=INTERVAL_WIDTH,
+        weekly_seasonality=False,
+        daily_seasonality=False,
+        # 2년 미만 이력에서는 연간 계절성을 추정하지 않음
+        yearly_seasonality=len(history) >= 24,
+    )
+    model.fit(history)
+    future = model.make_future_dataframe(periods=horizon, freq='MS', include_history=False)
+    forecast = model.predict(future)[FORECAST_COLUMNS]
+    # 신고 건수는 음수가 될 수 없음
+    forecast[FORECAST_COLUMNS[1:]] = forecast[FORECAST_COLUMNS[1:]].clip(lower=0)
+    return forecast.reset_index(drop=True)
+
+
+def prophet_forecast(disease, periods, values, horizon=None):
+    """질병 이력으로 Prophet 예측을 반환합니다.
+
+    결과는 (질병, 이력 지문, horizon) 키로 FORECAST_DIR에 저장되어,
+    같은 데이터로는 프로세스/세션이 바뀌어도 다시 적합하지 않습니다.
+    """
+    if horizon is None:
+        horizon = horizon_to(periods)
+    fingerprint = data_loader.series_fingerprint(periods, values)
+    path = forecast_path("prophet", disease, fingerprint, horizon)
+    if os.path.exists(path):
+        return feather.read_feather(path)
+
+    forecast = fit_prophet(history_frame(periods, values), horizon)
+    os.makedirs(FORECAST_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(forecast, tmp)
+    os.replace(tmp, path)
+    return forecast
+
+
+# ---------------------------------------------------------
+# 벡터화 예측 (질병 × 월 행렬 → 질병 × horizon 행렬)
+# - 반환값은 (yhat, yhat_lower, yhat_upper) 세 행렬, 음수는 0으로 자름
+# ---------------------------------------------------------
+def month_positions(periods, horizon):
+    # 이력의 달(0=1월)과 마지막 관측 다음 horizon개월의 달
+    months = np.asarray(periods, dtype='datetime64[M]').astype(np.int64)
+    future = months[-1] + 1 + np.arange(horizon)
+    return months % SEASON, future % SEASON
+
+
+def simulation_batch(matrix, periods, horizon, seeds):
+    """원래 앱의 시뮬레이션(generate_extended_data)과 같은 방식(최근 12개월 패턴 × TARGET_YEAR 연도 계수 + 잡음, ±SIM_BAND)으로 예측합니다.
+
+    패턴은 달력 월에 맞춰 두고, 이력에 없는 달은 0으로 둡니다.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    months, future = month_positions(periods, horizon)
+    pattern = np.zeros((len(matrix), SEASON))
+    pattern[:, months[-SEASON:]] = matrix[:, -SEASON:]
+    # 잡음까지 앱과 같도록 전체 SIM_YEARS를 생성한 뒤 TARGET_YEAR 행만 사용
+    target = int(np.flatnonzero(SIM_YEARS == TARGET_YEAR)[0])
+    yhat = simulate_batch(pattern, seeds)[:, target, future].astype(float)
+    return yhat, yhat * (1 - SIM_BAND), yhat * (1 + SIM_BAND)
+
+
+def seasonal_naive_batch(matrix, periods, horizon):
+    """작년 같은 달 값을 그대로 예측합니다 (이력이 1년 미만이면 마지막 값).
+
+    구간은 이력 안에서 같은 방식으로 한 주기 앞을 맞혔을 때의 오차 분위수입니다.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    n = matrix.shape[1]
+    lag = SEASON if n > SEASON else 1
+    yhat = matrix[:, n - lag + np.arange(horizon) % lag]
+    residuals = matrix[:, lag:] - matrix[:, :-lag]
+    if residuals.shape[1] == 0:
+        return yhat, yhat, yhat
+    alpha = (1 - INTERVAL_WIDTH) / 2
+    low, high = np.quantile(residuals, [alpha, 1 - alpha], axis=1)
+    return yhat, np.maximum(yhat + low[:, None], 0), np.maximum(yhat + high[:, None], 0)
+
+
+def _holt_winters_pass(y, alpha, beta, gamma, season):
+    """(후보 × 질병 × 이력) 배열에 가법 Holt-Winters(감쇠 추세)를 적용합니다.
+
+    이력 길이만큼만 반복하고 후보/질병 축은 한 번에 계산합니다.
+    (마지막 수준, 추세, 계절 성분, 1기 앞 예측 오차 제곱합, 오차 수)를 반환합니다.
+    """
+    n = y.shape[-1]
+    if season:
+        # 초기 계절 성분은 완전한 주기 전체의 (월 값 - 그 해 평균) 평균 (첫 해 잡음에 덜 민감)
+        cycles = y[..., :n // season * season].reshape(y.shape[:-1] + (-1, season))
+        level = cycles[..., 0, :].mean(axis=-1)
+        trend = (cycles[..., 1, :].mean(axis=-1) - level) / season
+        seasonal = (cycles - cycles.mean(axis=-1, keepdims=True)).mean(axis=-2)
+    else:
+        level = y[..., 0].copy()
+        trend = np.zeros_like(level)
+        seasonal = np.zeros(y.shape[:-1] + (1,))
+    sse = np.zeros_like(level)
+    m = max(season, 1)
+    for t in range(1, n):
+        s = seasonal[..., t % m]
+        error = y[..., t] - (level + HW_PHI * trend + s)
+        if t >= season:
+            sse += error ** 2
+        new_level = alpha * (y[..., t] - s) + (1 - alpha) * (level + HW_PHI * trend)
+        trend = beta * (new_level - level) + (1 - beta) * HW_PHI * trend
+        if season:
+            seasonal[..., t % m] = gamma * (y[..., t] - new_level) + (1 - gamma) * s
+        level = new_level
+    return level, trend, seasonal, sse, max(n - max(season, 1), 1)
+
+
+def holt_winters_batch(matrix, periods, horizon):
+    """가법 Holt-Winters(감쇠 추세)로 질병 전체를 한 번에 예측합니다.
+
+    이력이 2년 이상이면 12개월 계절성을 쓰고, 그보다 짧으면 수준/추세만 씁니다.
+    평활 계수는 HW_* 후보 조합을 모두 계산해 질병마다 이력 안 오차가 가장 작은 것을 고르고,
+    예측구간은 1기 앞 오차의 표준편차로 만든 정규 근사 구간입니다 (먼 달일수록 넓어짐).
+    """
+    y = np.asarray(matrix, dtype=float)
+    n_series, n = y.shape
+    season = SEASON if n >= 2 * SEASON else 0
+    grid = np.array([(a, b, g) for a in HW_ALPHAS for b in HW_BETAS for g in (HW_GAMMAS if season else (0.0,))])
+    alpha, beta, gamma = (grid[:, i, None] for i in range(3))      # (후보 × 1)
+    level, trend, seasonal, sse, count = _holt_winters_pass(
+        np.broadcast_to(y, (len(grid), n_series, n)), alpha, beta, gamma, season)
+
+    best = sse.argmin(axis=0)                                      # 질병별 최적 후보
+    pick = (best, np.arange(n_series))
+    level, trend, seasonal, sigma = level[pick], trend[pick], seasonal[pick], np.sqrt(sse[pick] / count)
+
+    steps = np.arange(1, horizon + 1)
+    damped = np.cumsum(HW_PHI ** steps)                            # 감쇠 추세 누적 계수
+    yhat = level[:, None] + trend[:, None] * damped[None, :]
+    if season:
+        yhat += seasonal[:, (n - 1 + steps) % season]
+    # h기 앞 분산 ≈ σ²(1 + (h-1)α²) (단순 지수평활 근사)
+    spread = np.sqrt(1 + (steps[None, :] - 1) * alpha[best] ** 2) * sigma[:, None]
+    z = NormalDist().inv_cdf(0.5 + INTERVAL_WIDTH / 2)
+    return (np.maximum(yhat, 0), np.maximum(yhat - z * spread, 0), np.maximum(yhat + z * spread, 0))
+
+
+def croston_batch(matrix, periods, horizon):
+    """간헐 시계열용 Croston(SBA 보정)으로 질병 전체를 한 번에 예측합니다.
+
+    신고가 있던 달에만 발생 크기와 발생 간격을 지수평활해 월 평균 발생률(크기 / 간격)을 예측하고,
+    구간은 이력의 월별 건수 분위수입니다 (0건이 많은 시계열이라 정규 근사 대신 경험 분포 사용).
+    """
+    y = np.asarray(matrix, dtype=float)
+    n_series, n = y.shape
+    size = np.full(n_series, np.nan)       # 평활한 발생 크기
+    interval = np.full(n_series, np.nan)   # 평활한 발생 간격(개월)
+    since = np.zeros(n_series)             # 마지막 발생 이후 개월 수
+    for t in range(n):
+        since += 1
+        hit = y[:, t] > 0
+        first = hit & np.isnan(size)
+        size = np.where(first, y[:, t], np.where(hit, size + CROSTON_ALPHA * (y[:, t] - size), size))
+        interval = np.where(first, since, np.where(hit, interval + CROSTON_ALPHA * (since - interval), interval))
+        since[hit] = 0
+    rate = np.nan_to_num((1 - CROSTON_ALPHA / 2) * size / interval)
+    alpha = (1 - INTERVAL_WIDTH) / 2
+    low, high = np.quantile(y, [alpha, 1 - alpha], axis=1) if n else (np.zeros(n_series),) * 2
+    yhat = np.repeat(rate[:, None], horizon, axis=1)
+    return (yhat, np.repeat(np.minimum(low, rate)[:, None], horizon, axis=1),
+            np.repeat(np.maximum(high, rate)[:, None], horizon, axis=1))
+
+
+def future_periods(periods, horizon):
+    return np.asarray(periods, dtype='datetime64[M]')[-1] + 1 + np.arange(horizon)
+
+
+def fast_forecast(periods, matrix, horizon=None, kinds=None):
+    """앱의 '빠른 예측' 모드: (질병 × 월) 행렬 전체를 한 번에 예측해 BatchForecast로 반환합니다.
+
+    행마다 시계열 분류(kinds, 없으면 여기서 분류)에 따라 KIND_MODELS의 모델을 씁니다.
+    전부 0인 행은 계산 없이 0건으로 채웁니다.
+    """
+    if horizon is None:
+        horizon = horizon_to(periods)
+    matrix = np.asarray(matrix)
+    if kinds is None:
+        kinds = data_loader.classify_series(matrix)
+    out = np.zeros((3, len(matrix), horizon))
+    models = np.array([KIND_MODELS[data_loader.SERIES_KINDS[k]] for k in kinds], dtype=object)
+    for kind, batch_fn in ((data_loader.SPARSE, croston_batch), (data_loader.DENSE, holt_winters_batch)):
+        rows = np.flatnonzero(kinds == kind)
+        if len(rows):
+            out[:, rows] = batch_fn(matrix[rows], periods, horizon)
+    return BatchForecast(future_periods(periods, horizon), out[0], out[1], out[2], models)
+
+
+def forecast_frame(batch, row):
+    """BatchForecast의 질병 한 행을 prophet_forecast와 같은 열(ds, yhat, yhat_lower, yhat_upper)로 변환합니다."""
+    return pd.DataFrame({
+        "ds": batch.periods.astype('datetime64[ns]'),
+        "yhat": batch.yhat[row],
+        "yhat_lower": batch.yhat_lower[row],
+        "yhat_upper": batch.yhat_upper[row],
+    })
+
+
+# ---------------------------------------------------------
+# 버전별 일괄 예측 저장소 (batch_forecast.py 결과)
+# ---------------------------------------------------------
+def batch_dir(version, model="prophet"):
+    return os.path.join(BATCH_DIR, model, version)
+
+
+def batch_stamp(version, model="prophet"):
+    """현재 게시된 일괄 예측의 실행 ID (CURRENT 파일 내용). 없으면 None.
+
+    같은 데이터 버전이라도 --disease 재실행마다 바뀌므로 캐시 키 / ETag에 사용합니다.
+    """
+    try:
+        with open(os.path.join(batch_dir(version, model), "CURRENT"), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_batch(version, forecasts, model="prophet", failures=None, routes=None):
+    """{질병: 예측 DataFrame}을 데이터 버전별 폴더에 저장하고 실행 ID를 반환합니다. (routes: 모델별 질병 수 기록용)
+
+    실행마다 새 하위 폴더에 결과를 모두 쓴 뒤 CURRENT 파일 하나를 os.replace로 바꿔 게시하므로,
+    읽는 쪽은 언제나 이전 결과나 새 결과 중 하나를 온전히 봅니다 (저장소가 비는 순간 없음).
+    직전 실행 폴더는 아직 읽는 중인 쪽을 위해 남기고, 그보다 오래된 폴더만 지웁니다.
+    """
+    frames = [f.assign(disease=d) for d, f in forecasts.items()]
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["disease"] + FORECAST_COLUMNS)
+    table["disease"] = table["disease"].astype("category")
+
+    target = batch_dir(version, model)
+    stamp = f"{time.strftime('%Y%m%d%H%M%S')}-{time.time_ns() % 10**9:09d}-{os.getpid()}"
+    run = os.path.join(target, stamp)
+    os.makedirs(run)
+    feather.write_feather(table[["disease"] + FORECAST_COLUMNS], os.path.join(run, "forecasts.feather"))
+    with open(os.path.join(run, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": version,
+            "model": model,
+            "run": stamp,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "diseases": len(forecasts),
+            "failures": failures or {},
+            "routes": routes or {},
+        }, f, ensure_ascii=False, indent=1)
+
+    previous = batch_stamp(version, model)
+    pointer = os.path.join(target, "CURRENT")
+    tmp = f"{pointer}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(stamp)
+    os.replace(tmp, pointer)
+    for entry in os.listdir(target):
+        path = os.path.join(target, entry)
+        if entry not in (stamp, previous) and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    return stamp
+
+
+def _read_published(version, model, read):
+    # CURRENT가 가리키는 실행 폴더로 read(폴더)를 호출합니다. 읽는 사이 새 실행이 게시되어
+    # 폴더가 지워졌으면 새 CURRENT로 다시 읽음 ('결과 없음'으로 오인하지 않도록)
+    for _ in range(3):
+        stamp = batch_stamp(version, model)
+        if stamp is None:
+            return None
+        try:
+            return read(os.path.join(batch_dir(version, model), stamp))
+        except FileNotFoundError:
+            continue
+    raise RuntimeError(f"일괄 예측 저장소를 읽는 동안 계속 교체되었습니다: {batch_dir(version, model)}")
+
+
+def read_batch_meta(version, model="prophet"):
+    """게시된 일괄 예측의 meta.json 내용. 없으면 None."""
+    def read(run):
+        with open(os.path.join(run, "meta.json"), encoding='utf-8') as f:
+            return json.load(f)
+    return _read_published(version, model, read)
+
+
+def read_batch(version, model="prophet"):
+    """게시된 일괄 예측을 {질병: DataFrame}으로 반환합니다. 없으면 None."""
+    def read(run):
+        table = feather.read_feather(os.path.join(run, "forecasts.feather"))
+        return {
+            str(d): g[FORECAST_COLUMNS].reset_index(drop=True)
+            for d, g in table.groupby("disease", observed=True, sort=False)
+        }
+    return _read_published(version, model, read)
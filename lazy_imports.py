@@ -0,0 +1,77 @@
+# ---------------------------------------------------------
+# 무거운 의존성 지연 로딩 + import 시간 예산 리포트
+# - prophet(cmdstanpy/Stan), plotly는 해당 메뉴가 처음 그려질 때만 로드
+# - `python lazy_imports.py` : 모듈별 콜드 import 시간을 새 프로세스에서 측정해 예산과 비교
+# ---------------------------------------------------------
+import importlib
+import logging
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger("mediscope.imports")
+
+# 모듈별 콜드 import 허용 시간(초)
+IMPORT_BUDGET = {
+    "streamlit": 2.0,
+    "pandas": 1.0,
+    "numpy": 0.3,
+    "pyarrow.feather": 0.5,
+    "plotly.graph_objs": 1.0,
+    "plotly.express": 1.5,
+    "prophet": 3.0,
+}
+
+# 이 프로세스에서 지연 로드된 모듈의 실제 로드 시간(초)
+LOAD_TIMES = {}
+
+
+def load(name):
+    """모듈을 처음 필요할 때 import하고 걸린 시간을 기록합니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    LOAD_TIMES[name] = time.perf_counter() - start
+    logger.info("lazy import %s: %.3fs", name, LOAD_TIMES[name])
+    return module
+
+
+def measure_cold_import(name):
+    # 이미 로드된 모듈의 영향을 받지 않도록 새 인터프리터에서 측정
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {name}; print(time.perf_counter() - t)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def budget_report(budget=IMPORT_BUDGET):
+    rows = []
+    for name, limit in budget.items():
+        seconds = measure_cold_import(name)
+        rows.append({
+            "module": name,
+            "seconds": seconds,
+            "budget": limit,
+            "ok": seconds is not None and seconds <= limit,
+        })
+    return rows
+
+
+def main():
+    rows = budget_report()
+    print(f"{'module':<20} {'cold import':>12} {'budget':>8}")
+    for row in rows:
+        seconds = "missing" if row["seconds"] is None else f"{row['seconds']:.3f}s"
+        mark = "" if row["ok"] else "  << over budget"
+        print(f"{row['module']:<20} {seconds:>12} {row['budget']:>7.1f}s{mark}")
+    return 0 if all(row["ok"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# ---------------------------------------------------------
+# 실행 구간별 프로파일링 (선택 기능)
+# - MEDISCOPE_PROFILE=1 이거나 URL에 ?debug=1 이 있을 때만 측정
+# - 구간별 실행 시간, st.cache_* 적중/미스 횟수 기록
+# - 메모리 증감(tracemalloc)은 MEDISCOPE_PROFILE=1 일 때만 기록 (추적은 프로세스 전체를 느리게 하므로
+#   ?debug=1 로 연 한 세션 때문에 공유 서버 전체에서 켜지지 않도록)
+# - rerun마다 한 줄짜리 JSON 로그(mediscope.profile)로 내보내 세션 간 집계 가능
+# - st.fragment 조각만 다시 실행될 때는 그 조각 실행을 따로 측정 (event: "fragment")
+# ---------------------------------------------------------
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_ENV = os.environ.get("MEDISCOPE_PROFILE", "0") == "1"
+
+logger = logging.getLogger("mediscope.profile")
+_local = threading.local()          # 스크립트 실행 스레드(세션)별 현재 측정 기록
+_totals_lock = threading.Lock()
+CACHE_TOTALS = {}                   # 프로세스 누적 {함수명: {"calls": n, "misses": n}}
+
+
+class RunProfile:
+    """한 번의 스크립트 실행(rerun) 동안의 측정 기록."""
+
+    def __init__(self, session_id, trace_memory, event="rerun"):
+        self.session_id = session_id
+        self.event = event
+        self.trace_memory = trace_memory
+        self.started = time.perf_counter()
+        self.sections = []
+        self.cache = {}
+        self._lap_time = self.started
+        self._lap_mem = self._memory()
+
+    def _memory(self):
+        return tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+
+    def add(self, name, seconds, mem_delta):
+        entry = {"section": name, "ms": round(seconds * 1000, 2)}
+        if self.trace_memory:
+            entry["mem_kb"] = round(mem_delta / 1024, 1)
+        self.sections.append(entry)
+
+    def lap(self, name):
+        now, mem = time.perf_counter(), self._memory()
+        self.add(name, now - self._lap_time, mem - self._lap_mem)
+        self._lap_time, self._lap_mem = now, mem
+
+    def report(self):
+        return {
+            "event": self.event,
+            "session": self.session_id,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "sections": self.sections,
+            "cache": self.cache,
+        }
+
+
+def current():
+    return getattr(_local, "run", None)
+
+
+def begin_run(enabled, session_id="", event="rerun"):
+    """스크립트 맨 앞에서 호출. enabled가 아니면 아무것도 기록하지 않습니다."""
+    if not enabled:
+        _local.run = None
+        return None
+    if PROFILE_ENV and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.run = RunProfile(session_id, trace_memory=PROFILE_ENV, event=event)
+    return _local.run
+
+
+def lap(name):
+    """직전 lap(또는 begin_run) 이후 구간을 name으로 기록합니다."""
+    run = current()
+    if run is not None:
+        run.lap(name)
+
+
+@contextmanager
+def section(name):
+    run = current()
+    if run is None:
+        yield
+        return
+    start, mem = time.perf_counter(), run._memory()
+    try:
+        yield
+    finally:
+        run.add(name, time.perf_counter() - start, run._memory() - mem)
+
+
+@contextmanager
+def fragment_scope(name, enabled, session_id=""):
+    """st.fragment 함수 본문을 감쌉니다.
+
+    전체 rerun 중이면 그 측정에 그대로 포함되고, 조각만 다시 실행될 때는
+    (스크립트 맨 앞의 begin_run이 실행되지 않으므로) 조각 실행 하나를 따로 측정해 로그로 내보냅니다.
+    """
+    if current() is not None:
+        yield
+        return
+    begin_run(enabled, session_id, event="fragment")
+    try:
+        with section(f"fragment:{name}"):
+            yield
+    finally:
+        end_run()
+
+
+def end_run():
+    """측정 결과를 JSON 로그로 내보내고 반환합니다."""
+    run = current()
+    _local.run = None
+    if run is None:
+        return None
+    report = run.report()
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    logger.info(json.dumps(report, ensure_ascii=False))
+    return report
+
+
+# ---------------------------------------------------------
+# 캐시 적중/미스 집계
+# ---------------------------------------------------------
+def _count(name, key):
+    with _totals_lock:
+        CACHE_TOTALS.setdefault(name, {"calls": 0, "misses": 0})[key] += 1
+    run = current()
+    if run is not None:
+        run.cache.setdefault(name, {"calls": 0, "misses": 0})[key] += 1
+
+
+def cached(cache_decorator):
+    """st.cache_data / st.cache_resource 데코레이터를 감싸 호출 수와 미스 수를 셉니다.
+
+    사용 예) @profiling.cached(st.cache_data(show_spinner=False))
+    함수 본문이 실제로 실행된 횟수 = 미스, 적중 = 호출 - 미스
+    """
+    def decorator(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _count(name, "misses")
+            return fn(*args, **kwargs)
+
+        cached_fn = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            _count(name, "calls")
+            return cached_fn(*args, **kwargs)
+
+        call.clear = cached_fn.clear
+        return call
+    return decorator
@@ -0,0 +1,313 @@
+# ---------------------------------------------------------
+# 지역별(시도/시군구) 신고 건수 큐브
+# - data/regions/ 의 시도별(·시군구별) 내보내기 파일을 (지역 × 질병 × 월) int32 배열 하나로 집계
+# - 파싱 블록은 받는 즉시 큐브 배열에 채워 넣고 버림 (최대 메모리는 원본 파일 크기가 아니라 큐브 크기에 비례)
+# - 시군구 → 시도 → 전국 합계 행을 미리 만들어 두어 드릴다운 시 원본 행을 다시 훑지 않음
+# - 조회는 이름 → 행 번호 사전과 배열 인덱싱으로만 처리 (DataFrame 필터 없음)
+# - 집계 결과는 원본 파일 지문별로 CACHE_DIR/regions/에 .npy + meta.json으로 저장, 메모리 맵으로 읽음
+# - 큐브 버전은 manifest에 기록된 원본 파일 해시로 정함 (불러올 때 큐브 배열을 해시하지 않음)
+# ---------------------------------------------------------
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+NATIONAL = "전국"
+REGION_SUBDIR = "regions"
+REGION_PATTERN = "*법정감염병_월별_신고현황_*.csv"
+REGION_CACHE_DIR = os.path.join(data_loader.CACHE_DIR, "regions")
+LEAD_COLUMNS = ("시도", "시군구")
+EXCLUDE_REGIONS = ["전국", "합계", "계", "소계"]
+
+
+# ---------------------------------------------------------
+# 1. 지역별 내보내기 파싱
+# ---------------------------------------------------------
+def iter_region_parts(source, block_size=data_loader.CHUNK_BYTES):
+    """지역별 내보내기를 블록 단위 (행 키 DataFrame, 월 번호 배열, 건수 행렬)로 차례로 돌려줍니다.
+
+    앞쪽 열은 '시도'(및 '시군구'), 그 뒤는 전국 내보내기와 같은 등급/질병/월 열입니다.
+    월 번호는 1970년 1월 기준 개월 수이며, 건수 행렬은 (행 × 월) int32 입니다.
+    파일 전체를 읽지 않고 data_loader.read_export_chunks의 블록 단위로 처리합니다.
+    """
+    header, chunks = data_loader.read_export_chunks(source, block_size)
+    if len(header) < 2:
+        return
+    labels = [str(label).strip() for label in header[0]]
+    n_lead = 0
+    while n_lead < len(labels) and labels[n_lead] in LEAD_COLUMNS:
+        n_lead += 1
+    if n_lead == 0 or len(labels) < n_lead + 3:
+        return
+    months = data_loader.header_months(header, start=n_lead + 2)
+    month_ids = np.array([(year - 1970) * 12 + month - 1 for _, year, month in months], dtype=np.int64)
+
+    for batch in chunks:
+        sido = data_loader.text_column(batch, 0).to_pandas()
+        sigungu = data_loader.text_column(batch, 1).to_pandas() if n_lead > 1 else pd.Series("", index=sido.index)
+        grades = data_loader.normalize_grades(data_loader.text_column(batch, n_lead)).to_pandas()
+        diseases = data_loader.text_column(batch, n_lead + 1).to_pandas()
+        # 소계/합계 행, 전국·시도 합계 행 제거 (합계는 큐브에서 직접 계산)
+        keep = (~diseases.isin(data_loader.EXCLUDE_ROWS) & ~sido.isin(EXCLUDE_REGIONS)
+                & ~sigungu.isin(EXCLUDE_REGIONS)).to_numpy()
+        keys = pd.DataFrame({"sido": sido[keep].to_numpy(), "sigungu": sigungu[keep].to_numpy(),
+                             "grade": grades[keep].to_numpy(), "disease": diseases[keep].to_numpy()})
+        yield keys, month_ids, data_loader.chunk_counts(batch, months)[keep]
+
+
+# ---------------------------------------------------------
+# 2. 큐브 구성 (시군구 → 시도 → 전국 합계)
+# ---------------------------------------------------------
+def region_name(sido, sigungu):
+    return f"{sido} {sigungu}" if sigungu else sido
+
+
+class LeafAccumulator:
+    """iter_region_parts 블록을 받는 즉시 (말단 지역 × 질병 × 월) int32 배열에 채워 넣습니다.
+
+    새 지역/질병/월이 나오면 배열을 늘리고(지역/질병 용량은 두 배씩), 블록은 채운 뒤 버립니다.
+    따라서 최대 메모리는 원본 파일 크기가 아니라 큐브 크기 + 블록 하나입니다.
+    같은 (지역, 질병, 월)이 다시 나오면 나중 값으로 덮어씁니다.
+    """
+
+    def __init__(self):
+        self.leaf_pos = {}      # (시도, 시군구) → 행 (처음 나온 순서)
+        self.disease_pos = {}   # 질병 → 열 (처음 나온 순서)
+        self.grade_of = {}
+        self.first = self.last = None
+        self.leaf = np.zeros((0, 0, 0), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.leaf_pos)
+
+    def _grow(self, first, last):
+        def capacity(n, cap):
+            return cap if n <= cap else max(n, 2 * cap)
+
+        shape = (capacity(len(self.leaf_pos), self.leaf.shape[0]),
+                 capacity(len(self.disease_pos), self.leaf.shape[1]), last - first + 1)
+        if shape == self.leaf.shape:
+            return
+        grown = np.zeros(shape, dtype=np.int32)
+        old = self.leaf
+        offset = self.first - first if self.first is not None else 0
+        grown[:old.shape[0], :old.shape[1], offset:offset + old.shape[2]] = old
+        self.leaf, self.first, self.last = grown, first, last
+
+    def add(self, keys, months, counts):
+        if not len(keys) or not len(months):
+            return
+        rows = np.array([self.leaf_pos.setdefault(k, len(self.leaf_pos))
+                         for k in zip(keys["sido"], keys["sigungu"])], dtype=np.int64)
+        cols = np.array([self.disease_pos.setdefault(d, len(self.disease_pos))
+                         for d in keys["disease"]], dtype=np.int64)
+        self.grade_of.update(zip(keys["disease"], keys["grade"]))
+        lo, hi = int(months.min()), int(months.max())
+        if self.first is not None:
+            lo, hi = min(lo, self.first), max(hi, self.last)
+        self._grow(lo, hi)
+        self.leaf[rows[:, None], cols[:, None], (months - self.first)[None, :]] = counts
+
+    def result(self):
+        """(시도 순으로 정렬한 말단 지역 키 + 누적 배열 행 번호 'row', 정렬한 질병 목록, 질병별 누적 배열 열 번호)."""
+        leaf_keys = pd.DataFrame(list(self.leaf_pos), columns=["sido", "sigungu"])
+        leaf_keys["row"] = np.arange(len(leaf_keys))
+        leaf_keys = leaf_keys.sort_values(["sido", "sigungu"], ignore_index=True)
+        diseases = sorted(self.disease_pos)
+        return leaf_keys, diseases, np.array([self.disease_pos[d] for d in diseases], dtype=np.int64)
+
+    def total(self, rows, cols):
+        # 누적 배열 행들의 (질병 × 월) 합 - 질병 열은 cols 순서
+        return self.leaf[rows][:, cols].sum(axis=0)
+
+
+def build_cube(parts, version=""):
+    """iter_region_parts 블록들(오래된 파일부터, 제너레이터 가능)로 RegionCube를 만듭니다.
+
+    같은 (지역, 질병, 월)이 여러 파일에 있으면 나중 파일 값을 사용합니다.
+    블록은 받는 즉시 LeafAccumulator에 채워 넣으므로 전체 블록을 메모리에 모으지 않습니다.
+    """
+    acc = LeafAccumulator()
+    for part in parts:
+        if part is not None:
+            acc.add(*part)
+    if not len(acc):
+        return None
+    first, last, grade_of = acc.first, acc.last, acc.grade_of
+    # 말단 지역 (시군구가 있으면 시군구, 없으면 시도) - 시도 순으로 정렬해 합계를 구간 합으로 계산
+    leaf_keys, diseases, cols = acc.result()
+    src = leaf_keys["row"].to_numpy()
+
+    # 행 순서: 전국, 시도1, 시도1의 시군구..., 시도2, ... (sources: 행마다 더할 누적 배열 행 번호)
+    # 시도 합계는 시도 단위 행이 있으면 그 값, 없으면 시군구 합 (같은 건수를 두 번 더하지 않음)
+    sidos = leaf_keys["sido"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, sidos[1:] != sidos[:-1]])
+    bounds = list(starts) + [len(leaf_keys)]
+    names, parents, sido_rows, sources = [NATIONAL], [-1], [], [None]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        sido_rows.append(len(names))
+        names.append(sidos[lo])
+        parents.append(0)
+        # 정렬 순서상 시도 단위 행(시군구 "")이 구간 맨 앞
+        has_total = leaf_keys.at[lo, "sigungu"] == ""
+        sources.append(src[lo:lo + 1] if has_total else src[lo:hi])
+        for j in range(lo + 1 if has_total else lo, hi):
+            names.append(region_name(sidos[lo], leaf_keys.at[j, "sigungu"]))
+            parents.append(sido_rows[-1])
+            sources.append(src[j:j + 1])
+
+    # 결과 배열은 한 번만 할당하고 행마다 채움 (큐브 크기의 중간 사본을 만들지 않음)
+    matrix = np.empty((len(names), len(diseases), last - first + 1), dtype=np.int32)
+    for i in range(1, len(names)):
+        matrix[i] = acc.total(sources[i], cols)
+    matrix[0] = matrix[sido_rows].sum(axis=0)
+    del acc
+
+    periods = np.arange(first, last + 1).astype('datetime64[M]')
+    grades = sorted(set(grade_of.values()), key=data_loader.grade_sort_key)
+    return RegionCube(names, parents, diseases, [grade_of[d] for d in diseases], grades, periods, matrix,
+                      version)
+
+
+class RegionCube:
+    """(지역 × 질병 × 월) 건수 배열과 지역 계층 조회용 인덱스 (읽기 전용).
+
+    - children(region): 하위 지역 이름 (전국 → 시도 → 시군구)
+    - series(region, disease): 월별 건수 배열
+    - breakdown(region, disease): 하위 지역별 최근 월 건수
+    - index_for(region): 해당 지역만의 DataIndex (홈/분석 화면에서 전국 인덱스와 같은 방식으로 사용)
+    - version: 원본 파일 해시로 만든 캐시 키 (sources_version)
+    """
+    __slots__ = ("names", "parents", "diseases", "grade_of", "grades", "periods", "matrix", "version",
+                 "_row", "_col", "_children", "_indexes")
+
+    def __init__(self, names, parents, diseases, grade_of, grades, periods, matrix, version=""):
+        self.names = tuple(names)
+        self.parents = np.asarray(parents, dtype=np.int64)
+        self.diseases = tuple(diseases)
+        self.grade_of = tuple(grade_of)
+        self.grades = tuple(grades)
+        self.periods = np.asarray(periods, dtype='datetime64[M]')
+        self.matrix = matrix if isinstance(matrix, np.memmap) else np.ascontiguousarray(matrix, dtype=np.int32)
+        if self.matrix.flags.writeable:
+            self.matrix.flags.writeable = False
+        self._row = {name: i for i, name in enumerate(self.names)}
+        self._col = {d: i for i, d in enumerate(self.diseases)}
+        children = {name: [] for name in self.names}
+        for i, parent in enumerate(self.parents):
+            if parent >= 0:
+                children[self.names[parent]].append(i)
+        self._children = {name: np.array(rows, dtype=np.int64) for name, rows in children.items()}
+        self._indexes = {}
+        self.version = version
+
+    def __contains__(self, region):
+        return region in self._row
+
+    def parent(self, region):
+        p = self.parents[self._row[region]]
+        return self.names[p] if p >= 0 else None
+
+    def children(self, region=NATIONAL):
+        return tuple(self.names[i] for i in self._children.get(region, ()))
+
+    def label(self, region):
+        # '서울 강남구' -> '강남구' (화면 표시용)
+        parent = self.parent(region)
+        return region[len(parent) + 1:] if parent and parent != NATIONAL else region
+
+    def series(self, region, disease):
+        return self.matrix[self._row[region], self._col[disease]]
+
+    def breakdown(self, region, disease, period=-1):
+        """하위 지역별 (이름 tuple, 건수 배열). 기본은 최근 월."""
+        rows = self._children.get(region, np.zeros(0, dtype=np.int64))
+        return tuple(self.names[i] for i in rows), self.matrix[rows, self._col[disease], period]
+
+    def index_for(self, region):
+        """지역 한 곳의 (질병 × 월) 슬라이스를 DataIndex로 감싸 반환합니다. (지역별로 한 번만 생성)"""
+        if region not in self._indexes:
+            self._indexes[region] = data_loader.DataIndex(
+                self.grades, self.diseases, self.periods, self.matrix[self._row[region]], self.grade_of)
+        return self._indexes[region]
+
+
+# ---------------------------------------------------------
+# 3. 파일 지문별 캐시 (.npy 메모리 맵 + meta.json)
+# ---------------------------------------------------------
+def list_region_exports(data_dir=data_loader.DATA_DIR):
+    return sorted(glob.glob(os.path.join(data_dir, REGION_SUBDIR, REGION_PATTERN)), key=os.path.basename)
+
+
+def exports_key(paths):
+    # 변경 감지용 (이름, 크기, mtime) 지문 - 주기적으로 확인하는 API 서버가 해시 없이 비교할 때 사용
+    h = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        h.update(f"{os.path.basename(path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def sources_version(paths):
+    """지역 파일들의 내용 해시로 만든 큐브 버전 (캐시 폴더 이름 / ETag에 사용).
+
+    해시는 전국 파일과 같은 manifest에 기록하므로, 크기·mtime이 그대로인 파일은 다시 읽지 않습니다.
+    """
+    manifest = data_loader.load_manifest()
+    before = dict(manifest)
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(f"{os.path.basename(path)}|{data_loader.cached_digest(path, manifest)}\n".encode('utf-8'))
+    data_loader.save_manifest(data_loader.manifest_changes(manifest, before))
+    return h.hexdigest()[:16]
+
+
+def write_cube(cube, target):
+    tmp = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(tmp, exist_ok=True)
+    np.save(os.path.join(tmp, "matrix.npy"), cube.matrix)
+    with open(os.path.join(tmp, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump({
+            "names": cube.names,
+            "parents": cube.parents.tolist(),
+            "diseases": cube.diseases,
+            "grade_of": cube.grade_of,
+            "grades": cube.grades,
+            "periods": [str(p) for p in cube.periods],
+            "version": cube.version,
+        }, f, ensure_ascii=False)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.replace(tmp, target)
+
+
+def read_cube(target):
+    with open(os.path.join(target, "meta.json"), encoding='utf-8') as f:
+        meta = json.load(f)
+    matrix = np.load(os.path.join(target, "matrix.npy"), mmap_mode='r')
+    return RegionCube(meta["names"], meta["parents"], meta["diseases"], meta["grade_of"], meta["grades"],
+                      np.array(meta["periods"], dtype='datetime64[M]'), matrix, meta["version"])
+
+
+def load_region_cube(data_dir=data_loader.DATA_DIR):
+    """data/regions/의 지역별 내보내기로 만든 RegionCube. 지역 파일이 없으면 None."""
+    paths = list_region_exports(data_dir)
+    if not paths:
+        return None
+    version = sources_version(paths)
+    target = os.path.join(REGION_CACHE_DIR, version)
+    if not os.path.exists(os.path.join(target, "meta.json")):
+        cube = build_cube((part for path in paths for part in iter_region_parts(path)), version)
+        if cube is None:
+            return None
+        write_cube(cube, target)
+        for stale in glob.glob(os.path.join(REGION_CACHE_DIR, "*")):
+            if os.path.abspath(stale) != os.path.abspath(target):
+                shutil.rmtree(stale, ignore_errors=True)
+    return read_cube(target)
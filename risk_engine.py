@@ -0,0 +1,197 @@
+# ---------------------------------------------------------
+# 개인 위험 요인 평가 엔진 (👤 My Page)
+# - 주의 요인 / 권장 백신 규칙을 선언형 표(WARNING_RULES, VACCINE_RULES)로 정의
+# - 프로필(연령대, 직업군, 기저질환, 접종 이력)을 uint64 비트마스크 한 개로 인코딩하고,
+#   규칙은 비트마스크 행렬로 컴파일해 (프로필 × 규칙)을 한 번에 평가
+# - 같은 엔진으로 입력 양식 1건과 명단(CSV) 수천 건을 모두 처리
+# ---------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+AGE_GROUPS = ["10대 미만", "10대", "20-30대", "40-50대", "60대 이상"]
+JOBS = ["사무직", "의료직", "교육/보육", "요식업", "학생", "무직", "기타"]
+CONDITIONS = ["당뇨병", "호흡기 질환", "간 질환", "면역 저하",
+              "고혈압", "심혈관 질환", "천식", "알레르기", "신장 질환"]
+VACCINES = ["독감", "폐렴구균", "간염", "코로나19",
+            "파상풍", "대상포진", "자궁경부암", "장티푸스"]
+
+# 필드 → (선택지 목록, 여러 값 허용 여부)
+FIELDS = {
+    "age": (AGE_GROUPS, False),
+    "job": (JOBS, False),
+    "conds": (CONDITIONS, True),
+    "vax": (VACCINES, True),
+}
+# 명단 CSV 열 이름 (앞의 이름이 기본, 나머지는 허용하는 별칭)
+ROSTER_COLUMNS = {
+    "age": ["연령대", "age_group", "age"],
+    "job": ["직업군", "job"],
+    "conds": ["기저질환", "conditions"],
+    "vax": ["접종이력", "접종 이력", "vaccines"],
+}
+MULTI_SEPARATORS = r"[,;|]"   # 여러 값 구분자 ('교육/보육'의 '/'는 구분자가 아님)
+
+# 주의 요인: (제목, 설명, 조건) - 조건은 {필드: [값, ...]}, 필드 안은 OR, 필드끼리는 AND
+WARNING_RULES = [
+    ("소아/영유아", "수두, 홍역, 유행성이하선염 등 단체생활 감염병 주의", {"age": ["10대 미만"]}),
+    ("고령층", "인플루엔자(독감), 폐렴구균 감염 시 중증화 위험 높음", {"age": ["60대 이상"]}),
+    ("만성질환 보유", "기저질환자는 코로나19 및 독감 등 호흡기 감염병에 취약함",
+     {"conds": ["당뇨병", "고혈압", "심혈관 질환"]}),
+    ("호흡기계 취약", "미세먼지 농도가 높은 날 외출 자제 및 마스크 착용 필수", {"conds": ["천식", "호흡기 질환"]}),
+    ("직업적 고위험(의료)", "결핵, 혈액매개감염병(B형간염, C형간염) 노출 주의", {"job": ["의료직"]}),
+    ("단체 생활군", "인플루엔자, 수두, 결막염 등 유행성 질환 확산 주의", {"job": ["학생", "교육/보육"]}),
+    ("식품 위생", "A형간염, 장티푸스, 노로바이러스 등 수인성 감염병 예방 필요", {"job": ["요식업"]}),
+]
+
+# 권장 백신: (백신, 대상 조건(None이면 전원), 이미 맞았으면 제외하는 접종 이력)
+VACCINE_RULES = [
+    ("인플루엔자(독감)", None, "독감"),
+    ("파상풍(10년 주기)", None, "파상풍"),
+    ("폐렴구균", {"age": ["60대 이상"]}, "폐렴구균"),
+]
+
+
+# ---------------------------------------------------------
+# 1. 비트 배치 / 규칙 컴파일
+# ---------------------------------------------------------
+def _bit_layout():
+    # (필드, 값) → 비트 번호. 마지막 비트(PRESENT)는 모든 프로필에 켜 두어 '조건 없음'을 표현
+    bits, n = {}, 0
+    for field, (values, _) in FIELDS.items():
+        for v in values:
+            bits[(field, v)] = n
+            n += 1
+    assert n < 63, "비트마스크(uint64) 한 개에 담을 수 있는 선택지 수 초과"
+    return bits
+
+
+BITS = _bit_layout()
+PRESENT = np.uint64(1) << np.uint64(63)
+
+
+def mask_of(field, values):
+    mask = np.uint64(0)
+    for v in values:
+        mask |= np.uint64(1) << np.uint64(BITS[(field, v)])
+    return mask
+
+
+def compile_conditions(conditions):
+    """조건 목록을 (규칙 × 필드 수) uint64 행렬로. 조건이 없는 칸은 PRESENT (항상 참)."""
+    width = max([len(c) for c in conditions if c] + [1])
+    matrix = np.full((len(conditions), width), PRESENT, dtype=np.uint64)
+    for i, cond in enumerate(conditions):
+        for j, (field, values) in enumerate((cond or {}).items()):
+            matrix[i, j] = mask_of(field, values)
+    return matrix
+
+
+WARNING_MASKS = compile_conditions([cond for _, _, cond in WARNING_RULES])
+VACCINE_MASKS = compile_conditions([cond for _, cond, _ in VACCINE_RULES])
+VACCINE_TAKEN = np.array([mask_of("vax", [taken]) for _, _, taken in VACCINE_RULES], dtype=np.uint64)
+
+
+def evaluate(profiles):
+    """비트마스크 배열(프로필 수)을 평가해 (주의 요인 행렬, 권장 백신 행렬)을 반환합니다. 둘 다 bool."""
+    p = np.asarray(profiles, dtype=np.uint64)[:, None, None]
+    warnings = ((p & WARNING_MASKS[None]) != 0).all(axis=2)
+    eligible = ((p & VACCINE_MASKS[None]) != 0).all(axis=2)
+    vaccines = eligible & ((p[:, :, 0] & VACCINE_TAKEN[None]) == 0)
+    return warnings, vaccines
+
+
+# ---------------------------------------------------------
+# 2. 입력 양식 1건
+# ---------------------------------------------------------
+def encode_profile(age, job, conds=(), vax=()):
+    return (PRESENT | mask_of("age", [age]) | mask_of("job", [job])
+            | mask_of("conds", conds) | mask_of("vax", vax))
+
+
+def score_profile(age, job, conds=(), vax=()):
+    """양식 1건의 ([(제목, 설명)], [권장 백신])."""
+    warnings, vaccines = evaluate([encode_profile(age, job, conds, vax)])
+    return ([(title, desc) for (title, desc, _), hit in zip(WARNING_RULES, warnings[0]) if hit],
+            [name for (name, _, _), hit in zip(VACCINE_RULES, vaccines[0]) if hit])
+
+
+# ---------------------------------------------------------
+# 3. 명단 일괄 평가
+# ---------------------------------------------------------
+def roster_template():
+    return pd.DataFrame({
+        "이름": ["홍길동", "김영희"],
+        ROSTER_COLUMNS["age"][0]: ["40-50대", "60대 이상"],
+        ROSTER_COLUMNS["job"][0]: ["의료직", "사무직"],
+        ROSTER_COLUMNS["conds"][0]: ["당뇨병, 천식", ""],
+        ROSTER_COLUMNS["vax"][0]: ["독감", "독감; 파상풍"],
+    })
+
+
+def find_columns(columns):
+    """명단의 실제 열 이름 {필드: 열 이름}. 필수 열(연령대, 직업군)이 없으면 ValueError."""
+    stripped = {str(c).strip(): c for c in columns}
+    found = {}
+    for field, names in ROSTER_COLUMNS.items():
+        match = next((stripped[n] for n in names if n in stripped), None)
+        if match is not None:
+            found[field] = match
+    missing = [ROSTER_COLUMNS[f][0] for f in ("age", "job") if f not in found]
+    if missing:
+        raise ValueError(f"필수 열이 없습니다: {', '.join(missing)}")
+    return found
+
+
+def encode_column(series, field):
+    """명단 열 하나를 (비트마스크 배열, 인식하지 못한 값 Series)로 변환합니다."""
+    values, multi = FIELDS[field]
+    text = series.fillna("").astype(str)
+    items = (text.str.split(MULTI_SEPARATORS).explode() if multi else text).str.strip()
+    items = items[items != ""]
+
+    bits = items.map({v: mask_of(field, [v]) for v in values})
+    known = bits.notna()
+    masks = np.zeros(len(series), dtype=np.uint64)
+    rows = series.index.get_indexer(items.index[known])
+    np.bitwise_or.at(masks, rows, bits[known].to_numpy(np.uint64))
+    return masks, items[~known]
+
+
+def _join_hits(hits, labels):
+    # (행 × 규칙) bool → 행마다 'a, b' 문자열 (같은 조합의 문자열은 한 번만 만듦)
+    if not len(hits):
+        return np.array([], dtype=object)
+    patterns, inverse = np.unique(hits, axis=0, return_inverse=True)
+    texts = [", ".join(l for l, h in zip(labels, p) if h) for p in patterns]
+    return np.array(texts, dtype=object)[inverse.ravel()]
+
+
+def score_roster(roster):
+    """명단 DataFrame을 한 번에 평가합니다.
+
+    (결과 DataFrame, 요약 DataFrame)을 반환합니다. 결과에는 원래 열 뒤에 '주의 요인 수',
+    '주의 요인', '권장 백신', '확인 필요'(인식하지 못한 값) 열이 붙고, 요약은 항목별 해당 인원입니다.
+    """
+    columns = find_columns(roster.columns)
+    roster = roster.reset_index(drop=True)
+    profiles = np.full(len(roster), PRESENT, dtype=np.uint64)
+    notes = []
+    for field, column in columns.items():
+        masks, unknown = encode_column(roster[column], field)
+        profiles |= masks
+        notes.append(f"{column}: " + unknown)
+    warnings, vaccines = evaluate(profiles)
+
+    notes = pd.concat(notes)
+    out = roster.copy()
+    out["주의 요인 수"] = warnings.sum(axis=1)
+    out["주의 요인"] = _join_hits(warnings, [title for title, _, _ in WARNING_RULES])
+    out["권장 백신"] = _join_hits(vaccines, [name for name, _, _ in VACCINE_RULES])
+    out["확인 필요"] = notes.groupby(level=0).agg("; ".join).reindex(roster.index, fill_value="")
+
+    summary = pd.DataFrame(
+        [(title, "주의 요인", int(n)) for (title, _, _), n in zip(WARNING_RULES, warnings.sum(axis=0))]
+        + [(name, "권장 백신", int(n)) for (name, _, _), n in zip(VACCINE_RULES, vaccines.sum(axis=0))],
+        columns=["항목", "구분", "인원"],
+    )
+    return out, summary
@@ -0,0 +1,103 @@
+# ---------------------------------------------------------
+# 💬 AI 의료 상담 증상 매칭
+# - 증상 사전 전체를 Aho–Corasick 오토마톤 하나로 컴파일
+# - 입력 문장을 한 번만 훑어 모든 키워드(겹치는 것 포함)를 찾음 → 키워드 수와 무관한 응답 시간
+# - 데이터에 없는 질병은 컴파일 시점에 제외
+# ---------------------------------------------------------
+from collections import deque
+
+SYMPTOM_DB = {
+    "결핵": ["기침", "가래", "혈담", "객혈", "피", "체중 감소", "미열", "식은땀"],
+    "콜레라": ["쌀뜨물", "설사", "구토", "탈수", "복통 없는 설사"],
+    "장티푸스": ["지속적인 발열", "두통", "복통", "장미색 반점", "변비", "설사"],
+    "A형간염": ["황달", "피로", "식욕 부진", "구토", "암갈색 소변", "소변 색"],
+    "B형간염": ["황달", "피로", "복부 통증", "식욕 부진"],
+    "홍역": ["고열", "발진", "기침", "콧물", "결막염", "입안 반점", "붉은 반점"],
+    "수두": ["수포", "물집", "가려움", "발진", "발열", "딱지"],
+    "유행성이하선염": ["볼", "턱", "부종", "통증", "발열", "침샘", "붓기"],
+    "일본뇌염": ["모기", "고열", "두통", "현기증", "구토", "의식 장애"],
+    "말라리아": ["모기", "오한", "고열", "발한", "주기적인 열", "떨림"],
+    "쯔쯔가무시증": ["진드기", "가피", "검은 딱지", "발열", "두통", "풀밭", "야외 활동"],
+    "레지오넬라증": ["에어컨", "냉각탑", "폐렴", "기침", "고열", "근육통"],
+    "비브리오패혈증": ["해산물", "어패류", "회", "상처", "바닷물", "괴사", "부종"],
+    "성홍열": ["딸기 혀", "고열", "인후통", "발진", "선홍색"],
+    "백일해": ["심한 기침", "발작적 기침", "흡기성 훕", "구토", "숨쉬기 힘듦"],
+    "파상풍": ["근육 경직", "마비", "개구장애", "상처", "녹슨", "못"],
+    "인플루엔자": ["고열", "오한", "두통", "근육통", "전신 쇠약감", "몸살"],
+    "코로나19": ["발열", "기침", "인후통", "후각 상실", "미각 상실"],
+    "엠폭스": ["수포", "발진", "림프절", "고열", "근육통"]
+}
+
+
+class SymptomMatcher:
+    """증상 키워드 → 의심 질병 매칭기 (Aho–Corasick).
+
+    match(text)는 (질병, 일치한 키워드 목록)을 일치 개수 내림차순으로 반환합니다.
+    """
+
+    def __init__(self, symptom_db=SYMPTOM_DB, available_diseases=None):
+        # 데이터(all_diseases)에 이름이 포함된 질병만 남김 (요청마다 검사하지 않도록 컴파일 시 1회)
+        if available_diseases is not None:
+            available = list(available_diseases)
+            symptom_db = {
+                disease: keywords for disease, keywords in symptom_db.items()
+                if any(disease in d for d in available)
+            }
+        self.diseases = tuple(symptom_db)
+        self._order = {d: i for i, d in enumerate(self.diseases)}
+
+        # 키워드 → 해당 키워드를 가진 질병들
+        self._keyword_diseases = {}
+        for disease, keywords in symptom_db.items():
+            for keyword in keywords:
+                self._keyword_diseases.setdefault(keyword, []).append(disease)
+        self._build(self._keyword_diseases)
+
+    def _build(self, keywords):
+        # goto / fail / output 테이블 구성
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for keyword in keywords:
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(keyword)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_keywords(self, text):
+        """text에 등장하는 모든 키워드(중복 제거, 등장 순서)를 반환합니다."""
+        found = {}
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for keyword in self._out[node]:
+                found.setdefault(keyword, None)
+        return list(found)
+
+    def match(self, text):
+        hits = {}
+        for keyword in self.find_keywords(text):
+            for disease in self._keyword_diseases[keyword]:
+                hits.setdefault(disease, []).append(keyword)
+        # 일치 키워드 수 내림차순, 동률이면 사전 순서
+        return sorted(hits.items(), key=lambda item: (-len(item[1]), self._order[item[0]]))
@@ -0,0 +1,59 @@
+# ---------------------------------------------------------
+# 테스트 공통 설정
+# - 프로젝트 모듈은 import 시점에 MEDISCOPE_CACHE_DIR로 캐시 경로를 정하므로, import 전에 임시 폴더로 지정
+# - export_text / write_export: KDCA 내보내기 형식(헤더 2행: 연도 / '계'·'N월', 등급별 소계 행)의 작은 CSV
+# - run_app: Streamlit AppTest 스크립트를 새 프로세스에서 실행 (데이터/캐시 경로를 테스트마다 따로 지정)
+# ---------------------------------------------------------
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["MEDISCOPE_CACHE_DIR"] = tempfile.mkdtemp(prefix="mediscope-test-")
+
+EXPORT_NAME = "법정감염병_월별_신고현황_{stamp}.csv"
+
+
+def export_text(year, rows, lead=()):
+    """rows: [(앞쪽 열 값..., 등급, 질병, 월별 건수 12개)] -> 내보내기 CSV 문자열.
+
+    lead: 등급 앞의 열 이름 (예: ("시도", "시군구")). 건수에는 '-'나 빈칸을 넣을 수 있습니다.
+    """
+    labels = [*lead, "급별(1)", "급별(2)"]
+    lines = [",".join(labels + [str(year)] * 13),
+             ",".join(labels + ["계"] + [f"{m}월" for m in range(1, 13)])]
+    subtotal = {}
+    for row in rows:
+        *keys, grade, disease, counts = row
+        numbers = [int(c) if str(c).strip().lstrip("-").isdigit() else 0 for c in counts]
+        total = subtotal.setdefault((*keys, grade), [0] * 12)
+        for i, n in enumerate(numbers):
+            total[i] += n
+        lines.append(",".join([*keys, grade, disease, str(sum(numbers))] + [str(c) for c in counts]))
+    for (*keys, grade), total in subtotal.items():
+        lines.append(",".join([*keys, grade, "소계", str(sum(total))] + [str(c) for c in total]))
+    return "\r\n".join(lines) + "\r\n"
+
+
+def write_export(directory, stamp, year, rows, lead=(), encoding="cp949", prefix=""):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, prefix + EXPORT_NAME.format(stamp=stamp))
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        f.write(export_text(year, rows, lead))
+    return path
+
+
+def run_app(script, data_dir, cache_dir, **env):
+    """AppTest 스크립트를 새 프로세스에서 실행하고 마지막 줄에 출력한 JSON을 반환합니다.
+
+    모듈 기본 경로(DATA_DIR/CACHE_DIR)는 import 시점에 정해지므로 앱은 항상 새 프로세스에서 실행합니다.
+    스크립트에서 sys.argv[1]은 app.py 경로입니다.
+    """
+    env = dict(os.environ, MEDISCOPE_DATA_DIR=str(data_dir), MEDISCOPE_CACHE_DIR=str(cache_dir), **env)
+    result = subprocess.run([sys.executable, "-c", script, os.path.join(ROOT, "app.py")], cwd=ROOT, env=env,
+                            capture_output=True, text=True, encoding='utf-8', timeout=300)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import aberration
+
+
+def assert_same_state(actual, expected):
+    assert actual.names == expected.names
+    assert actual.last_period == expected.last_period
+    for field in aberration.ScanState._fields[2:]:
+        np.testing.assert_allclose(getattr(actual, field), getattr(expected, field), equal_nan=True,
+                                   err_msg=field)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    matrix = rng.poisson(5, size=(6, 30))
+    matrix[1, 24:] += 40        # 최근 유행
+    matrix[2] = 0               # 전 기간 0건
+    matrix[3, :20] = 0          # 뒤늦게 발생
+    names = [f"질병{i}" for i in range(len(matrix))]
+    periods = np.arange(np.datetime64("2022-01"), np.datetime64("2024-07"))
+    return names, periods, matrix
+
+
+def test_incremental_scan_matches_full_scan(series, tmp_path):
+    names, periods, matrix = series
+    state_path = str(tmp_path / "state.npz")
+    # 앞 12개월을 전체 스캔해 상태 저장 후, 한 달씩 늘려 가며 증분 갱신
+    for end in range(12, matrix.shape[1] + 1):
+        state = aberration.scan_incremental(names, periods[:end], matrix[:, :end], state_path)
+        assert_same_state(state, aberration.scan(names, periods[:end], matrix[:, :end]))
+
+
+def test_incremental_scan_rescans_when_history_changes(series, tmp_path):
+    names, periods, matrix = series
+    state_path = str(tmp_path / "state.npz")
+    aberration.scan_incremental(names, periods[:20], matrix[:, :20], state_path)
+    revised = matrix.copy()
+    revised[0, 5] += 100        # 과거 월 수정 -> 저장된 상태는 쓸 수 없음
+    state = aberration.scan_incremental(names, periods, revised, state_path)
+    assert_same_state(state, aberration.scan(names, periods, revised))
+
+
+@pytest.mark.parametrize("months", [0, 3, 9, 30])
+def test_scan_active_matches_full_scan(series, months):
+    names, periods, matrix = series
+    assert_same_state(aberration.scan_active(names, periods[:months], matrix[:, :months]),
+                      aberration.scan(names, periods[:months], matrix[:, :months]))
+
+
+def test_outbreak_raises_alarms(series):
+    names, periods, matrix = series
+    alarms = aberration.alarm_counts(aberration.scan(names, periods, matrix))
+    assert alarms[1] >= 2
+    assert alarms[2] == 0
@@ -0,0 +1,109 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+import pytest
+
+import api_server
+import forecasting
+from conftest import write_export
+
+ROWS = [
+    ("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130]),
+    ("제2급", "홍역", [0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 0, 0]),
+    ("제3급", "말라리아", [0, 0, 1, 5, 30, 80, 120, 90, 40, 6, 1, 0]),
+]
+
+
+@pytest.fixture
+def api(tmp_path):
+    data_dir = tmp_path / "data"
+    for year in (2022, 2023, 2024):
+        write_export(data_dir, f"{year + 1}0101000000", year, ROWS)
+    server = api_server.make_server("127.0.0.1", 0, str(data_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server, data_dir
+    server.shutdown()
+    server.server_close()
+
+
+def get(base, path, headers=None):
+    request = urllib.request.Request(base + quote(path, safe="/?=&"), headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_diseases_etag_and_not_modified(api):
+    base, _, _ = api
+    status, headers, body = get(base, "/api/diseases")
+    assert status == 200
+    assert sorted(d["disease"] for d in json.loads(body)) == ["말라리아", "수두", "홍역"]
+    etag = headers["ETag"]
+    assert etag and "max-age" in headers["Cache-Control"]
+
+    status, headers, body = get(base, "/api/diseases", {"If-None-Match": etag})
+    assert (status, body) == (304, b"")
+    assert headers["ETag"] == etag
+    # 쿼리가 다르면 다른 ETag
+    status, headers, _ = get(base, "/api/diseases?grade=3급", {"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+
+
+def test_unknown_path_and_disease_are_404(api):
+    base, _, _ = api
+    for path in ("/api/nothing", "/api/series/없는병", "/api/forecast/없는병", "/api/series/수두?region=서울"):
+        status, headers, body = get(base, path)
+        assert status == 404, path
+        assert headers["Cache-Control"] == "no-store"
+        assert "error" in json.loads(body)
+
+
+def test_series_and_fast_forecast(api):
+    base, _, _ = api
+    status, _, body = get(base, "/api/series/수두")
+    series = json.loads(body)
+    assert status == 200
+    assert series["periods"][0] == "2022-01" and len(series["counts"]) == 36
+    assert series["counts"][:12] == ROWS[0][2]
+
+    status, _, body = get(base, "/api/forecast/수두?model=fast")
+    forecast = json.loads(body)
+    assert status == 200 and forecast["source"] == "holt_winters"
+    assert all(lo <= y <= hi for lo, y, hi in zip(forecast["yhat_lower"], forecast["yhat"], forecast["yhat_upper"]))
+    assert get(base, "/api/forecast/수두?model=arima")[0] == 400
+
+
+def test_new_export_changes_etag(api):
+    base, server, data_dir = api
+    etag = get(base, "/api/diseases")[1]["ETag"]
+    write_export(data_dir, "20260101000000", 2025, ROWS[:1])
+    server.RequestHandlerClass.data.reload_seconds = 0
+    status, headers, _ = get(base, "/api/diseases", {"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+
+
+def test_republished_batch_changes_version_and_body(api):
+    base, server, _ = api
+    data = server.RequestHandlerClass.data
+    data.reload_seconds = 0
+    version = data.shared.index.version
+    fast = forecasting.fast_forecast(data.shared.index.periods, data.shared.index.matrix)
+    row = data.shared.index.row("수두")
+
+    forecasting.write_batch(version, {"수두": forecasting.forecast_frame(fast, row)})
+    status, headers, body = get(base, "/api/forecast/수두")
+    assert status == 200 and json.loads(body)["source"] == "batch"
+    etag, first = headers["ETag"], json.loads(body)["yhat"]
+
+    # 같은 데이터 버전에 일부 질병만 다시 게시 (batch_forecast.py --disease)
+    forecasting.write_batch(version, {"수두": forecasting.forecast_frame(fast, row).assign(yhat=0.0)})
+    assert json.loads(get(base, "/api/version")[2])["version"].endswith(forecasting.batch_stamp(version))
+    status, headers, body = get(base, "/api/forecast/수두", {"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+    assert json.loads(body)["yhat"] == [0.0] * len(first) != first
@@ -0,0 +1,19 @@
+from conftest import run_app
+
+SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+pages = {"home": ([e.value for e in at.exception], [i.value for i in at.info])}
+at.sidebar.radio[0].set_value("📊 AI 분석 센터").run()
+pages["ai"] = ([e.value for e in at.exception], [i.value for i in at.info])
+print(json.dumps(pages, ensure_ascii=False))
+"""
+
+
+def test_pages_show_notice_without_data(tmp_path):
+    (tmp_path / "data").mkdir()
+    pages = run_app(SCRIPT, tmp_path / "data", tmp_path / "cache")
+    for name, (exceptions, infos) in pages.items():
+        assert exceptions == [], name
+        assert any("표시할 감염병 데이터가 없습니다" in text for text in infos), name
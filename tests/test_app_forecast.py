@@ -0,0 +1,77 @@
+from conftest import run_app, write_export
+
+ROWS = [("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130])]
+
+SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+import data_loader, forecasting
+
+def caption(at):
+    return [c.value for c in at.caption if c.value.startswith("※")]
+
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+at.sidebar.radio[0].set_value("📊 AI 분석 센터").run()
+at.radio(key="ai_model").set_value("prophet").run()
+before = caption(at)
+
+# 앱이 한 번 '일괄 예측 없음'을 본 뒤에 batch_forecast.py 결과가 게시됨
+index = data_loader.build_index(data_loader.load_archive())
+fast = forecasting.fast_forecast(index.periods, index.matrix)
+forecasting.write_batch(index.version, {"수두": forecasting.forecast_frame(fast, 0)})
+at.run()
+print(json.dumps({"before": before, "after": caption(at), "exceptions": [e.value for e in at.exception]},
+                 ensure_ascii=False))
+"""
+
+
+def test_batch_published_after_first_view_is_used(tmp_path):
+    for year in (2022, 2023, 2024):
+        write_export(tmp_path / "data", f"{year + 1}0101000000", year, ROWS)
+    # 즉시 적합을 끄면 일괄 예측이 없을 때는 빠른 예측으로 대체
+    result = run_app(SCRIPT, tmp_path / "data", tmp_path / "cache", MEDISCOPE_ONDEMAND_FIT="0")
+    assert result["exceptions"] == []
+    assert "Prophet 예측을 사용할 수 없어" in result["before"][0]
+    assert "Prophet 알고리즘" in result["after"][0]
+
+AUTO_SCRIPT = """
+import json, sys
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+import backtest, data_loader, forecasting
+
+index = data_loader.build_index(data_loader.load_archive())
+fast = forecasting.fast_forecast(index.periods, index.matrix)
+forecasting.write_batch(index.version, {"수두": forecasting.forecast_frame(fast, 0)})
+
+def publish(prophet_error):
+    rows = [("수두", model, origin, 1, 10.0, 10.0 + error, 0.0, 30.0, seconds)
+            for model, error, seconds in (("holt_winters", 5.0, 0.01), ("prophet", prophet_error, 2.0))
+            for origin in ("2024-01", "2024-04")]
+    board = backtest.leaderboard(pd.DataFrame(rows, columns=backtest.ERROR_COLUMNS), {"수두": "dense"})
+    backtest.write_leaderboard(index.version, board, {})
+
+def caption(at):
+    return [c.value for c in at.caption if c.value.startswith("※")][0]
+
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+at.sidebar.radio[0].set_value("📊 AI 분석 센터").run()
+captions = {"none": caption(at)}
+publish(prophet_error=1.0)      # Prophet이 훨씬 정확 -> Prophet 선택
+at.run()
+captions["prophet"] = caption(at)
+publish(prophet_error=5.1)      # 허용 오차 안이면 더 빠른 Holt-Winters 선택
+at.run()
+captions["holt_winters"] = caption(at)
+print(json.dumps(captions, ensure_ascii=False))
+"""
+
+
+def test_recommended_model_follows_leaderboard(tmp_path):
+    for year in (2022, 2023, 2024):
+        write_export(tmp_path / "data", f"{year + 1}0101000000", year, ROWS)
+    captions = run_app(AUTO_SCRIPT, tmp_path / "data", tmp_path / "cache", MEDISCOPE_ONDEMAND_FIT="0")
+    assert "빠른 예측(Holt-Winters)" in captions["none"] and "백테스트 결과가 없어" in captions["none"]
+    assert "Prophet 알고리즘" in captions["prophet"] and "추천 모델: Prophet" in captions["prophet"]
+    assert "빠른 예측(Holt-Winters)" in captions["holt_winters"]
+    assert "추천 모델: Holt-Winters" in captions["holt_winters"]
@@ -0,0 +1,75 @@
+from conftest import run_app, write_export
+
+ROWS = [
+    ("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130]),
+    ("제2급", "홍역", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]),
+]
+
+# AppTest.run()은 항상 전체 스크립트를 다시 실행하므로, 브라우저가 조각 안 위젯 변경 시 보내는
+# 조각 단위 rerun 요청(fragment_id_queue)을 직접 만들어 보냄
+SCRIPT = """
+import json, logging, sys
+from streamlit.testing.v1 import AppTest, local_script_runner
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+
+reports = []
+class Collect(logging.Handler):
+    def emit(self, record):
+        reports.append(json.loads(record.getMessage()))
+logger = logging.getLogger("mediscope.profile")
+logger.addHandler(Collect())
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+fragments = []
+def rerun_data(**kwargs):
+    if fragments:
+        kwargs.update(fragment_id_queue=list(fragments), is_fragment_scoped_rerun=True)
+    return RerunData(**kwargs)
+local_script_runner.RerunData = rerun_data
+
+def runs():
+    return [[r["event"], [s["section"] for s in r["sections"]]] for r in reports]
+
+def sent(at):
+    # 이번 실행에서 전송된 요소 (AppTest는 실행마다 새로 받은 메시지로만 트리를 만듦)
+    return {
+        "css": any("<style>" in m.value for m in at.markdown),
+        "menu": len(at.sidebar.radio),
+        "hero": [m.value for m in at.markdown if 'class="hero-title"' in m.value],
+        "cards": [m.value for m in at.markdown if 'class="metric-value"' in m.value],
+    }
+
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+full, full_sent = runs(), sent(at)
+fragments[:] = at._fragment_storage._fragments
+registered = len(fragments)
+at.selectbox(key="home_disease").set_value("홍역").run()
+print(json.dumps({
+    "full": full,
+    "full_sent": full_sent,
+    "registered": registered,
+    "fragment": runs()[len(full):],
+    "fragment_sent": sent(at),
+    "exceptions": [e.value for e in at.exception],
+}, ensure_ascii=False))
+"""
+
+
+def test_home_filter_change_reruns_only_the_home_fragment(tmp_path):
+    for year in (2023, 2024):
+        write_export(tmp_path / "data", f"{year + 1}0101000000", year, ROWS)
+    result = run_app(SCRIPT, tmp_path / "data", tmp_path / "cache", MEDISCOPE_PROFILE="1")
+    assert result["exceptions"] == []
+    assert result["full"] == [["rerun", ["css", "load_data", "sidebar", "menu:🏠 홈"]]]
+    assert result["full_sent"]["css"] and result["full_sent"]["menu"] == 1
+    assert "수두" in result["full_sent"]["hero"][0]
+    assert result["registered"] == 1
+
+    # 스크립트 앞부분(CSS, load_data, 사이드바)은 다시 실행하지 않고 홈 조각만 실행
+    assert result["fragment"] == [["fragment", ["fragment:home"]]]
+    # CSS/사이드바는 다시 전송하지 않고, 조각 안 카드/제목만 새 질병 기준으로 전송
+    fragment = result["fragment_sent"]
+    assert not fragment["css"] and fragment["menu"] == 0
+    assert len(fragment["hero"]) == 1 and "홍역" in fragment["hero"][0]
+    assert "12명" in fragment["cards"][0]
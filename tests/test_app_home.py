@@ -0,0 +1,48 @@
+from conftest import run_app, write_export
+
+ROWS = [
+    ("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130]),
+    ("제2급", "홍역", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]),
+]
+
+SCRIPT = """
+import base64, json, logging, sys
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+reports = []
+class Collect(logging.Handler):
+    def emit(self, record):
+        reports.append(json.loads(record.getMessage()))
+logger = logging.getLogger("mediscope.profile")
+logger.addHandler(Collect())
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+def trend(at):
+    trace = json.loads(at.get("plotly_chart")[0].proto.spec)["data"][0]
+    y = trace["y"]
+    if isinstance(y, dict):     # plotly 6: 숫자 배열은 base64로 직렬화
+        y = np.frombuffer(base64.b64decode(y["bdata"]), dtype=y["dtype"]).tolist()
+    return {"x": [x[:7] for x in trace["x"]], "y": y, "cache": reports[-1]["cache"].get("home_trend_figure")}
+
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+result = [trend(at)]
+for disease in ("홍역", "수두"):
+    at.selectbox(key="home_disease").set_value(disease).run()
+    result.append(trend(at))
+print(json.dumps(result, ensure_ascii=False))
+"""
+
+
+def test_trend_plots_the_real_series_and_reuses_the_figure(tmp_path):
+    for year in (2023, 2024):
+        write_export(tmp_path / "data", f"{year + 1}0101000000", year, ROWS)
+    first, other, back = run_app(SCRIPT, tmp_path / "data", tmp_path / "cache", MEDISCOPE_PROFILE="1")
+
+    assert first["x"][0] == "2023-01" and first["x"][-1] == "2024-12"
+    assert first["y"] == ROWS[0][2] * 2
+    assert other["y"] == ROWS[1][2] * 2
+    assert first["cache"] == {"calls": 1, "misses": 1} and other["cache"] == {"calls": 1, "misses": 1}
+    # 이미 본 질병으로 돌아오면 직렬화된 Figure를 그대로 사용
+    assert back["y"] == first["y"] and back["cache"] == {"calls": 1, "misses": 0}
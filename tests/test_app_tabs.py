@@ -0,0 +1,48 @@
+from conftest import run_app, write_export
+
+ROWS = [("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130])]
+VIEWS = ("forecast_view", "seasonal_view", "heatmap_view")
+
+SCRIPT = """
+import json, logging, sys
+from streamlit.testing.v1 import AppTest
+
+reports = []
+class Collect(logging.Handler):
+    def emit(self, record):
+        reports.append(json.loads(record.getMessage()))
+logger = logging.getLogger("mediscope.profile")
+logger.addHandler(Collect())
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+at.sidebar.radio[0].set_value("📊 AI 분석 센터").run()
+result = []
+for tab in (None, "🔄 계절성 패턴", "🔥 발생 히트맵", "📈 2026년 예측"):
+    if tab is not None:
+        at.session_state["ai_tab"] = tab
+        at.run()
+    result.append({"cache": reports[-1]["cache"], "charts": len(at.get("plotly_chart")),
+                   "exceptions": [e.value for e in at.exception]})
+print(json.dumps(result, ensure_ascii=False))
+"""
+
+
+def test_only_the_open_tab_is_built(tmp_path):
+    for year in (2023, 2024):
+        write_export(tmp_path / "data", f"{year + 1}0101000000", year, ROWS)
+    forecast, seasonal, heatmap, back = run_app(SCRIPT, tmp_path / "data", tmp_path / "cache",
+                                                MEDISCOPE_PROFILE="1", MEDISCOPE_ONDEMAND_FIT="0")
+
+    def built(run):
+        return [view for view in VIEWS if view in run["cache"]]
+
+    for run in (forecast, seasonal, heatmap, back):
+        assert run["exceptions"] == []
+    # 선택된 탭의 뷰만 계산/전송 (나머지 탭의 그래프는 만들지 않음)
+    assert built(forecast) == ["forecast_view"] and forecast["charts"] == 1
+    assert built(seasonal) == ["seasonal_view"] and seasonal["charts"] == 2
+    assert built(heatmap) == ["heatmap_view"] and heatmap["charts"] == 1
+    # 다시 연 탭은 캐시된 뷰를 그대로 사용
+    assert built(back) == ["forecast_view"] and back["cache"]["forecast_view"]["misses"] == 0
@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+
+import backtest
+from conftest import write_export
+
+KINDS = {"수두": "dense", "홍역": "sparse"}
+
+
+def errors_for(disease, model, error, seconds):
+    # 두 origin × 한 달, actual 10에 대해 |오차| = error
+    return [(disease, model, origin, 1, 10.0, 10.0 + error, 0.0, 30.0, seconds) for origin in ("2024-01", "2024-04")]
+
+
+def test_served_models_follow_series_kind():
+    assert backtest.served_models("dense") == {"holt_winters", "prophet"}
+    assert backtest.served_models("sparse") == {"croston"}
+    assert backtest.evaluated("seasonal_naive", "sparse")
+    assert not backtest.evaluated("holt_winters", "sparse")
+    assert not backtest.evaluated("croston", "dense")
+    assert not backtest.evaluated("seasonal_naive", "zero")
+
+
+def test_leaderboard_chooses_among_served_models():
+    rows = (errors_for("수두", "seasonal_naive", 1.0, 0.001)    # 가장 정확하지만 비교 기준
+            + errors_for("수두", "holt_winters", 5.2, 0.01)     # 최저(5.0)의 10% 이내이고 빠름
+            + errors_for("수두", "prophet", 5.0, 2.0)
+            + errors_for("홍역", "seasonal_naive", 0.5, 0.001)
+            + errors_for("홍역", "croston", 2.0, 0.01))
+    board = backtest.leaderboard(pd.DataFrame(rows, columns=backtest.ERROR_COLUMNS), KINDS)
+    chosen = dict(board.loc[board["chosen"], ["disease", "model"]].to_numpy())
+    assert chosen == {"수두": "holt_winters", "홍역": "croston"}
+    naive = board[board["model"] == "seasonal_naive"]
+    assert (naive["rank"] == 1).all() and not naive["served"].any()
+    assert list(board.loc[board["disease"] == "수두", "kind"].unique()) == ["dense"]
+
+    assert backtest.chosen_model(board, "수두") == "holt_winters"
+    assert backtest.chosen_model(board, "없는병") is None and backtest.chosen_model(None, "수두") is None
+
+    # 허용 오차를 벗어나면 느려도 더 정확한 served 모델
+    board = backtest.leaderboard(pd.DataFrame(rows, columns=backtest.ERROR_COLUMNS), KINDS, tolerance=0.01)
+    assert dict(board.loc[board["chosen"], ["disease", "model"]].to_numpy())["수두"] == "prophet"
+
+
+def test_run_backtest_skips_models_not_served_for_the_kind(tmp_path):
+    rows = [
+        ("제1급", "페스트", [0] * 12),
+        ("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130]),
+        ("제2급", "홍역", [0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 0, 0]),
+    ]
+    data_dir = tmp_path / "data"
+    for year in (2022, 2023, 2024):
+        write_export(data_dir, f"{year + 1}0101000000", year, rows)
+    target, failures = backtest.run_backtest(str(data_dir), workers=1,
+                                             models=["seasonal_naive", "holt_winters", "croston"],
+                                             log=lambda *_: None)
+    assert failures == {}
+    board = pd.read_feather(f"{target}/leaderboard.feather")
+    assert backtest.leaderboard_stamp(os.path.basename(target)) is not None
+    assert backtest.leaderboard_stamp("없는버전") is None
+    pairs = set(map(tuple, board[["disease", "model"]].to_numpy()))
+    assert pairs == {("수두", "seasonal_naive"), ("수두", "holt_winters"),
+                     ("홍역", "seasonal_naive"), ("홍역", "croston")}
+    assert dict(board.loc[board["chosen"], ["disease", "model"]].to_numpy()) == {"수두": "holt_winters",
+                                                                                 "홍역": "croston"}
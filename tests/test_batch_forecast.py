@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import batch_forecast
+import data_loader
+import forecasting
+from conftest import write_export
+
+# 전부 0(페스트), 간헐(홍역, 말라리아)만 사용해 Prophet 적합 없이 실행
+ROWS = [
+    ("제1급", "페스트", [0] * 12),
+    ("제2급", "홍역", [0, 0, 1, 0, 2, 0, 0, 0, 3, 0, 0, 1]),
+    ("제3급", "말라리아", [0, 0, 1, 5, 30, 80, 120, 90, 40, 6, 0, 0]),
+]
+
+
+def quiet(*args):
+    pass
+
+
+def test_partial_runs_merge_into_the_store(tmp_path):
+    data_dir = str(tmp_path / "data")
+    write_export(data_dir, "20250101000000", 2024, ROWS)
+    version = data_loader.build_index(data_loader.load_archive(data_dir)).version
+
+    path, failures = batch_forecast.run_batch(data_dir, workers=1, diseases=["페스트"], log=quiet)
+    assert failures == {}
+    assert set(forecasting.read_batch(version)) == {"페스트"}
+
+    batch_forecast.run_batch(data_dir, workers=1, diseases=["홍역", "말라리아"], log=quiet)
+    batch_forecast.run_batch(data_dir, workers=1, diseases=["홍역"], log=quiet)
+    stored = forecasting.read_batch(version)
+    assert set(stored) == {"페스트", "홍역", "말라리아"}
+    assert (stored["페스트"]["yhat"] == 0).all()
+    assert forecasting.read_batch_meta(version)["routes"] == {"zero": 1, "croston": 2}
+    # 게시 파일 + 현재/직전 실행 폴더만 남음
+    assert len(os.listdir(path)) == 3 and "CURRENT" in os.listdir(path)
+
+
+def test_publishing_swaps_the_pointer_and_keeps_the_previous_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(forecasting, "BATCH_DIR", str(tmp_path / "batch"))
+    frame = forecasting.forecast_frame(forecasting.fast_forecast(
+        np.arange(np.datetime64("2024-01"), np.datetime64("2025-01")), np.ones((1, 12)), horizon=3), 0)
+    assert forecasting.batch_stamp("v1") is None and forecasting.read_batch("v1") is None
+
+    first = forecasting.write_batch("v1", {"수두": frame})
+    second = forecasting.write_batch("v1", {"수두": frame, "홍역": frame})
+    assert forecasting.batch_stamp("v1") == second != first
+    assert set(forecasting.read_batch("v1")) == {"수두", "홍역"}
+    # 직전 실행을 읽던 쪽은 계속 읽을 수 있고, 그보다 오래된 실행은 지워짐
+    assert os.path.exists(os.path.join(forecasting.batch_dir("v1"), first, "forecasts.feather"))
+    third = forecasting.write_batch("v1", {"수두": frame})
+    assert sorted(os.listdir(forecasting.batch_dir("v1"))) == sorted(["CURRENT", second, third])
+
+
+def test_reader_retries_when_its_run_is_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(forecasting, "BATCH_DIR", str(tmp_path / "batch"))
+    frame = pd.DataFrame({"ds": pd.to_datetime(["2025-01-01"]), "yhat": [1.0], "yhat_lower": [0.0],
+                          "yhat_upper": [2.0]})
+    stale = forecasting.write_batch("v1", {"수두": frame})
+    current = forecasting.write_batch("v1", {"홍역": frame})
+    stamps = iter([stale, current])
+    # 첫 번째 CURRENT를 읽은 직후 그 폴더가 지워진 상황
+    shutil.rmtree(os.path.join(forecasting.batch_dir("v1"), stale))
+    monkeypatch.setattr(forecasting, "batch_stamp", lambda version, model="prophet": next(stamps))
+    assert set(forecasting.read_batch("v1")) == {"홍역"}
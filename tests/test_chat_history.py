@@ -0,0 +1,48 @@
+import os
+import time
+
+import pytest
+
+import chat_history
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(chat_history, "CHAT_DIR", str(tmp_path))
+    monkeypatch.setattr(chat_history, "HISTORY_WINDOW", 4)
+    state = {}
+    chat_history.init_session(state)
+    return state
+
+
+def test_window_spills_oldest_messages_to_archive(state):
+    for i in range(5):
+        chat_history.append_message(state, "user", f"질문 {i}")
+        chat_history.append_message(state, "assistant", f"답변 {i}")
+
+    assert [m["content"] for m in state["messages"]] == ["질문 3", "답변 3", "질문 4", "답변 4"]
+    archived = chat_history.load_archived(state)
+    assert state["archived_count"] == len(archived) == 7
+    assert archived[0]["content"] == chat_history.GREETING
+    assert [m["content"] for m in chat_history.load_archived(state, limit=2)] == ["질문 2", "답변 2"]
+
+
+def test_memory_cap_keeps_latest_message(state, monkeypatch):
+    monkeypatch.setattr(chat_history, "MEMORY_CAP_BYTES", 100)
+    chat_history.append_message(state, "user", "가" * 200)
+    assert [m["content"] for m in state["messages"]] == ["가" * 200]
+    assert state["archived_count"] == 1
+
+
+def test_prune_archives_by_age_and_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(chat_history, "CHAT_DIR", str(tmp_path))
+    now = time.time()
+    for i, age_days in enumerate([0, 1, 2, 40]):
+        path = tmp_path / f"s{i}.jsonl"
+        path.write_text("{}\n", encoding="utf-8")
+        os.utime(path, (now - age_days * 86400,) * 2)
+
+    assert chat_history.prune_archives(max_days=30, max_files=2, now=now) == 2
+    assert sorted(os.listdir(tmp_path)) == ["s0.jsonl", "s1.jsonl"]
+    # 이미 삭제된 세션의 아카이브는 빈 목록
+    assert chat_history.load_archived({"chat_session_id": "s3"}) == []
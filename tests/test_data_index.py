@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import data_loader
+from conftest import ROOT, write_export
+
+
+def test_index_matches_per_grade_filtering_on_bundled_export():
+    long_df = data_loader.load_archive(f"{ROOT}/data")
+    index = data_loader.build_index(long_df)
+    # 원래 app.py: 등급마다 df[df['급별(1)'] == grade]['급별(2)'].unique()를 정렬
+    for grade in index.grades:
+        expected = sorted(long_df.loc[long_df["grade"] == grade, "disease"].astype(str).unique())
+        assert list(index.diseases_in(grade)) == expected
+    pivot = long_df.pivot_table(index="disease", columns=["year", "month"], values="count",
+                                aggfunc="sum", observed=True)
+    for disease in index.diseases:
+        np.testing.assert_array_equal(index.series(disease), pivot.loc[disease].to_numpy())
+    assert not index.matrix.flags.writeable
+
+
+def test_reclassified_disease_keeps_its_whole_history(tmp_path):
+    covid = {2022: [("제1급", "코로나19", [50] * 12)],
+             # 연중 재분류: 1~4월은 1급, 5월부터 2급 (두 행 모두 12개월 열을 가짐)
+             2023: [("제1급", "코로나19", [40] * 4 + [0] * 8), ("제2급", "코로나19", [0] * 4 + [30] * 8)],
+             2024: [("제2급", "코로나19", [20] * 12)]}
+    for year, rows in covid.items():
+        # 신고가 끊긴 뒤 다른 등급에 0건으로만 남은 질병은 신고가 있던 등급 유지
+        other = ("제2급", "엠폭스", [3] * 12) if year < 2024 else ("제3급", "엠폭스", [0] * 12)
+        write_export(tmp_path / "data", f"{year + 1}0101000000", year, rows + [other])
+
+    index = data_loader.build_index(data_loader.load_archive(str(tmp_path / "data")))
+    np.testing.assert_array_equal(index.series("코로나19"), [50] * 12 + [40] * 4 + [30] * 8 + [20] * 12)
+    assert index.grade_of("코로나19") == "2급"
+    assert index.diseases_in("1급") == () and "1급" not in index.grades
+    assert index.grade_of("엠폭스") == "2급"
+    assert index.diseases_in("2급") == ("엠폭스", "코로나19")
+    assert index.grades == ("2급",)
+
+    # 등급 소계도 재분류 전 이력을 포함
+    cube = data_loader.build_metric_cube(index, state_path=None)
+    assert cube.loc["2급", "latest"] == 20 + 0 and cube.loc["코로나19", "prev"] == 20
+
+
+def test_empty_store_builds_an_empty_index():
+    index = data_loader.build_index(data_loader.empty_store())
+    assert index.diseases == () and index.grades == () and index.matrix.shape == (0, 0)
+
+
+def test_shared_dataset_is_read_only(tmp_path):
+    shared = data_loader.load_shared(f"{ROOT}/data", state_path=str(tmp_path / "state.npz"))
+    assert shared._fields == ("diseases", "grades", "index", "metrics", "alerts")
+    assert shared.diseases == shared.index.diseases
+    assert not shared.index.matrix.flags.writeable
+    disease = shared.diseases[0]
+    with pytest.raises(TypeError):
+        shared.metrics[disease]["latest"] = 0
+    assert shared.metrics[disease]["latest"] == shared.index.series(disease)[-1]
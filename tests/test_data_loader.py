@@ -0,0 +1,143 @@
+import csv
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import data_loader
+from conftest import ROOT, export_text, write_export
+
+SAMPLE = [
+    ("제1급", "페스트", [0] * 12),
+    ("제2급", "수두", [120, 98, 87, 100, 150, 180, 90, 40, 35, 60, 88, 130]),
+    ("제2급", "홍역", ["-", "", 1, 0, 2, "-", 0, 0, 3, 0, 0, 1]),
+    ("제3급", "말라리아", [0, 0, 1, 5, 30, 80, 120, 90, 40, 6, 1, 0]),
+]
+
+
+def old_parse(path):
+    """원래 app.py load_data()의 파싱(header=1, utf-8 실패 시 cp949, 소계/합계 제거, '제N급' -> 'N급')에
+    월 열을 long-form으로 펼치는 단계만 더한 비교 기준."""
+    try:
+        df, encoding = pd.read_csv(path, header=1, encoding='utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        df, encoding = pd.read_csv(path, header=1, encoding='cp949'), 'cp949'
+    df = df[~df['급별(2)'].isin(['소계', '합계'])].copy()
+    df['급별(1)'] = df['급별(1)'].astype(str).str.replace('제', '').str.strip()
+    with open(path, encoding=encoding) as f:
+        years = next(csv.reader(f))
+
+    frames = []
+    for i, column in enumerate(df.columns):
+        month = re.fullmatch(r'(\d+)월', str(column))
+        if month:
+            frames.append(pd.DataFrame({
+                "grade": df['급별(1)'].to_numpy(),
+                "disease": df['급별(2)'].astype(str).str.strip().to_numpy(),
+                "year": int(years[i]),
+                "month": int(month.group(1)),
+                "count": pd.to_numeric(df[column], errors='coerce').fillna(0).astype(int).to_numpy(),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def parse(source, block_size=data_loader.CHUNK_BYTES):
+    # sync_export가 스토어에 쓰는 것과 같은 블록들을 한 테이블로
+    tables = list(data_loader.iter_long_chunks(source, block_size))
+    return data_loader.to_store_dtypes(pa.concat_tables(tables).to_pandas())
+
+
+def comparable(long_df):
+    out = pd.DataFrame({
+        "grade": long_df["grade"].astype(str),
+        "disease": long_df["disease"].astype(str),
+        "year": long_df["year"].astype(int),
+        "month": long_df["month"].astype(int),
+        "count": long_df["count"].astype(int),
+    })
+    return out.sort_values(data_loader.KEY_COLUMNS, ignore_index=True)
+
+
+def test_parse_matches_old_parse_on_bundled_export():
+    path = data_loader.list_exports(f"{ROOT}/data")[0]
+    pd.testing.assert_frame_equal(comparable(parse(path)), comparable(old_parse(path)))
+
+
+def test_archive_matches_old_parse_on_bundled_export(tmp_path, monkeypatch):
+    # 앱/API가 읽는 경로: 파일별 Feather 스토어 → 누적 스토어
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    path = data_loader.list_exports(f"{ROOT}/data")[0]
+    archive = data_loader.load_archive(f"{ROOT}/data")
+    pd.testing.assert_frame_equal(comparable(archive), comparable(old_parse(path)))
+
+
+def test_parse_matches_old_parse_on_cp949_with_blank_counts(tmp_path):
+    path = write_export(tmp_path, "20250101000000", 2024, SAMPLE, encoding="cp949")
+    parsed = parse(path)
+    pd.testing.assert_frame_equal(comparable(parsed), comparable(old_parse(path)))
+    assert set(parsed["grade"].cat.categories) == {"1급", "2급", "3급"}
+    assert "소계" not in set(parsed["disease"].astype(str))
+
+
+def test_parse_accepts_utf8_bytes():
+    parsed = parse(export_text(2024, SAMPLE).encode('utf-8-sig'))
+    counts = parsed[parsed["disease"] == "수두"]["count"].to_numpy()
+    np.testing.assert_array_equal(counts, SAMPLE[1][2])
+
+
+# ---------------------------------------------------------
+# 다중 내보내기 증분 병합 / manifest
+# ---------------------------------------------------------
+def test_sync_archive_is_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    data_dir = tmp_path / "data"
+    write_export(data_dir, "20240101000000", 2023, SAMPLE)
+    write_export(data_dir, "20250101000000", 2024, SAMPLE)
+    first = data_loader.sync_archive(str(data_dir))
+    manifest_mtime = (tmp_path / "cache" / "manifest.json").stat().st_mtime_ns
+
+    parsed = []
+    real_iter = data_loader.iter_long_chunks
+
+    def counting_iter(path, *args, **kwargs):
+        parsed.append(path)
+        return real_iter(path, *args, **kwargs)
+    monkeypatch.setattr(data_loader, "iter_long_chunks", counting_iter)
+
+    # 바뀐 것이 없으면 파싱도, manifest 쓰기도 하지 않음
+    assert data_loader.sync_archive(str(data_dir)) == first
+    assert parsed == []
+    assert (tmp_path / "cache" / "manifest.json").stat().st_mtime_ns == manifest_mtime
+
+    # 새 파일(같은 2024년의 수정본)만 파싱하고, 겹치는 (등급, 질병, 연도, 월)은 최신 파일 값 사용
+    revised = [(g, d, [c + 1 if isinstance(c, int) else c for c in counts]) for g, d, counts in SAMPLE]
+    newest = write_export(data_dir, "20250201000000", 2024, revised)
+    archive = data_loader.read_store(data_loader.sync_archive(str(data_dir)))
+    assert parsed == [newest]
+
+    expected = data_loader.merge_stores([parse(p) for p in data_loader.list_exports(str(data_dir))])
+    pd.testing.assert_frame_equal(comparable(archive), comparable(expected))
+    chickenpox = archive[(archive["disease"] == "수두") & (archive["year"] == 2024)]["count"].to_numpy()
+    np.testing.assert_array_equal(chickenpox, np.array(SAMPLE[1][2]) + 1)
+    assert len(list((tmp_path / "cache").glob("archive-*.feather"))) == 1
+
+
+def test_save_manifest_merges_into_current_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path))
+    data_loader.save_manifest({"a.csv": {"sha256": "1"}})
+    # 다른 프로세스가 그 사이 기록한 항목은 보존하고 바뀐 항목만 덮어씀
+    data_loader.save_manifest({"b.csv": {"sha256": "2"}})
+    data_loader.save_manifest({"a.csv": {"sha256": "3"}})
+    assert data_loader.load_manifest() == {"a.csv": {"sha256": "3"}, "b.csv": {"sha256": "2"}}
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    before = data_loader.load_manifest()
+    assert data_loader.manifest_changes(dict(before), before) == {}
+
+
+def test_small_blocks_give_the_same_rows():
+    path = data_loader.list_exports(f"{ROOT}/data")[0]
+    # 블록 경계가 행 중간에 걸려도 결과는 한 번에 파싱한 것과 같아야 함
+    assert len(list(data_loader.iter_long_chunks(path, block_size=4096))) > 1
+    pd.testing.assert_frame_equal(comparable(parse(path, block_size=4096)), comparable(parse(path)))
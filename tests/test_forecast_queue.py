@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+import data_loader
+import forecast_queue
+import forecasting
+
+
+@pytest.fixture
+def series():
+    # 테스트마다 다른 이력 -> 공유 캐시 디렉터리의 결과 파일이 겹치지 않음
+    periods = np.arange(np.datetime64("2022-01"), np.datetime64("2024-01"))
+    values = np.random.default_rng().poisson(20, size=len(periods))
+    return periods, values
+
+
+@pytest.fixture
+def fake_prophet(monkeypatch):
+    calls = []
+    release = threading.Event()
+    fail = {"on": False}
+
+    def slow_forecast(disease, periods, values, horizon=None):
+        calls.append(disease)
+        release.wait(5)
+        if fail["on"]:
+            raise RuntimeError("적합 실패")
+        path = forecasting.forecast_path("prophet", disease,
+                                         data_loader.series_fingerprint(periods, values), horizon)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 실제 prophet_forecast처럼 임시 파일에 쓴 뒤 교체
+        feather.write_feather(pd.DataFrame({"yhat": np.ones(horizon)}), f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    monkeypatch.setattr(forecasting, "prophet_forecast", slow_forecast)
+    monkeypatch.setattr(forecast_queue, "POLL_SECONDS", 0.01)
+    return calls, release, fail
+
+
+def test_concurrent_waits_share_one_fit(tmp_path, series, fake_prophet):
+    calls, release, _ = fake_prophet
+    periods, values = series
+    db_path = str(tmp_path / "jobs.sqlite")
+    queue = forecast_queue.ForecastQueue(db_path=db_path)
+    other = forecast_queue.ForecastQueue(db_path=db_path)     # 다른 서버 프로세스 역할
+    results = []
+
+    def waiter(q):
+        results.append(q.wait("A형간염", periods, values, horizon=6, timeout=10))
+
+    threads = [threading.Thread(target=waiter, args=(q,)) for q in (queue, queue, other, other)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ["A형간염"]
+    assert len(results) == 4 and all(len(r) == 6 for r in results)
+    # 결과가 있으면 다시 요청해도 새로 시작하지 않음
+    assert queue.submit("A형간염", periods, values, horizon=6)[2] is False
+    assert calls == ["A형간염"]
+
+
+def test_failed_job_is_not_retried_immediately(tmp_path, series, fake_prophet):
+    calls, release, fail = fake_prophet
+    periods, values = series
+    fail["on"] = True
+    release.set()
+    queue = forecast_queue.ForecastQueue(db_path=str(tmp_path / "jobs.sqlite"))
+
+    assert queue.wait("B형간염", periods, values, horizon=6, timeout=10) is None
+    key, path, started = queue.submit("B형간염", periods, values, horizon=6)
+    assert started is False
+    assert queue.status(key, path).state == "failed"
+    assert calls == ["B형간염"]
+
+
+def test_wait_times_out_while_fit_keeps_running(tmp_path, series, fake_prophet):
+    calls, release, _ = fake_prophet
+    periods, values = series
+    queue = forecast_queue.ForecastQueue(db_path=str(tmp_path / "jobs.sqlite"))
+    with pytest.raises(TimeoutError):
+        queue.wait("C형간염", periods, values, horizon=6, timeout=0.1)
+    release.set()
+    assert len(queue.wait("C형간염", periods, values, horizon=6, timeout=10)) == 6
+    assert calls == ["C형간염"]
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+import forecasting
+
+PERIODS = np.arange(np.datetime64("2021-01"), np.datetime64("2025-01"))
+
+
+def seasonal_series(n_series=3, seed=0):
+    rng = np.random.default_rng(seed)
+    month = np.arange(len(PERIODS)) % 12
+    base = 100 + 60 * np.sin(2 * np.pi * month / 12)
+    return np.stack([base * (i + 1) + rng.normal(0, 5, len(PERIODS)) for i in range(n_series)]).round()
+
+
+def test_holt_winters_batch_shapes_and_intervals():
+    matrix = seasonal_series()
+    yhat, lower, upper = forecasting.holt_winters_batch(matrix, PERIODS, 12)
+    for part in (yhat, lower, upper):
+        assert part.shape == (3, 12)
+        assert np.isfinite(part).all() and (part >= 0).all()
+    assert (lower <= yhat).all() and (yhat <= upper).all()
+    # 먼 달일수록 구간이 넓어짐
+    width = upper - lower
+    assert (width[:, -1] >= width[:, 0]).all()
+
+
+def test_holt_winters_batch_follows_seasonality():
+    matrix = seasonal_series()
+    yhat, _, _ = forecasting.holt_winters_batch(matrix, PERIODS, 12)
+    last_year = matrix[:, -12:]
+    # 계절 모양(최고/최저 달)을 따라가고, 크기는 작년 같은 달과 비슷
+    assert (yhat.argmax(axis=1) == last_year.argmax(axis=1)).all()
+    assert (yhat.argmin(axis=1) == last_year.argmin(axis=1)).all()
+    assert (np.abs(yhat - last_year) <= 0.15 * last_year.max(axis=1, keepdims=True)).all()
+
+
+def test_holt_winters_batch_rows_are_independent():
+    matrix = seasonal_series()
+    together = forecasting.holt_winters_batch(matrix, PERIODS, 6)
+    for i in range(len(matrix)):
+        alone = forecasting.holt_winters_batch(matrix[i:i + 1], PERIODS, 6)
+        for a, b in zip(alone, together):
+            np.testing.assert_allclose(a[0], b[i])
+
+
+def test_holt_winters_batch_short_history_uses_trend_only():
+    short = np.array([[10, 12, 14, 16, 18, 20, 22, 24]], dtype=float)
+    yhat, lower, upper = forecasting.holt_winters_batch(short, PERIODS[:8], 3)
+    assert yhat.shape == (1, 3)
+    assert (yhat[0] > 20).all() and (np.diff(yhat[0]) >= 0).all()
+    assert (lower <= yhat).all() and (yhat <= upper).all()
+
+
+def test_classify_series_uses_adi_cutoff():
+    n = 33
+    rows = np.zeros((4, n), dtype=int)
+    rows[1, :25] = 1     # ADI 33/25 = 1.32 -> 경계값은 dense
+    rows[2, :24] = 1     # ADI 33/24 = 1.375 -> sparse
+    rows[3] = 5
+    assert data_loader.classify_series(rows).tolist() == [
+        data_loader.ZERO, data_loader.DENSE, data_loader.SPARSE, data_loader.DENSE]
+
+
+def test_fast_forecast_routes_by_kind():
+    dense = seasonal_series(1)[0]
+    sparse = np.zeros(len(PERIODS))
+    sparse[[3, 17, 30, 41]] = [2, 1, 4, 1]
+    matrix = np.stack([np.zeros(len(PERIODS)), sparse, dense])
+    batch = forecasting.fast_forecast(PERIODS, matrix, horizon=6)
+
+    assert batch.models.tolist() == ["zero", "croston", "holt_winters"]
+    assert str(batch.periods[0]) == "2025-01" and len(batch.periods) == 6
+    assert not batch.yhat[0].any() and not batch.yhat_upper[0].any()
+    for name, row in (("croston", 1), ("holt_winters", 2)):
+        expected = getattr(forecasting, f"{name}_batch")(matrix[row:row + 1], PERIODS, 6)
+        for got, want in zip((batch.yhat, batch.yhat_lower, batch.yhat_upper), expected):
+            np.testing.assert_allclose(got[row], want[0])
+    # Croston은 평균 발생률이라 매달 같은 작은 값
+    assert np.allclose(batch.yhat[1], batch.yhat[1][0]) and 0 < batch.yhat[1][0] < 1
+
+    frame = forecasting.forecast_frame(batch, 2)
+    assert list(frame.columns) == ["ds", "yhat", "yhat_lower", "yhat_upper"]
+    assert len(frame) == 6
+
+
+def test_fit_prophet_returns_real_intervals():
+    history = forecasting.history_frame(PERIODS, seasonal_series(1)[0])
+    forecast = forecasting.fit_prophet(history, 6)
+    assert list(forecast.columns) == forecasting.FORECAST_COLUMNS and len(forecast) == 6
+    assert forecast["ds"].iloc[0] == pd.Timestamp("2025-01-01")
+    assert (forecast["yhat_lower"] <= forecast["yhat"]).all() and (forecast["yhat"] <= forecast["yhat_upper"]).all()
+    assert (forecast["yhat_lower"] >= 0).all()
+
+
+def test_prophet_forecast_is_cached_by_disease_and_history(tmp_path, monkeypatch):
+    fits = []
+
+    def fake_fit(history, horizon):
+        fits.append((len(history), horizon))
+        ds = pd.date_range("2025-01-01", periods=horizon, freq="MS")
+        return pd.DataFrame({"ds": ds, "yhat": 1.0, "yhat_lower": 0.0, "yhat_upper": 2.0})
+
+    monkeypatch.setattr(forecasting, "FORECAST_DIR", str(tmp_path))
+    monkeypatch.setattr(forecasting, "fit_prophet", fake_fit)
+    values = seasonal_series(1)[0]
+    first = forecasting.prophet_forecast("수두", PERIODS, values, 6)
+    again = forecasting.prophet_forecast("수두", PERIODS, values, 6)
+    pd.testing.assert_frame_equal(again, first)
+    assert len(fits) == 1 and len(list(tmp_path.iterdir())) == 1
+
+    # 질병 / 이력 / horizon 중 하나라도 바뀌면 다시 적합
+    forecasting.prophet_forecast("홍역", PERIODS, values, 6)
+    forecasting.prophet_forecast("수두", PERIODS, values + 1, 6)
+    forecasting.prophet_forecast("수두", PERIODS, values, 12)
+    assert len(fits) == 4
+    # 기본 horizon은 TARGET_YEAR 12월까지
+    forecasting.prophet_forecast("수두", PERIODS, values)
+    assert fits[-1] == (len(PERIODS), forecasting.horizon_to(PERIODS))
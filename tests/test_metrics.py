@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import data_loader
+
+
+@pytest.fixture
+def index():
+    rng = np.random.default_rng(3)
+    matrix = rng.poisson(8, size=(4, 24)).astype(np.int32)
+    matrix[0, -2:] = [10, 15]           # 전월 대비 +50%
+    matrix[1, -2:] = [0, 5]             # 전월 0건 -> 증감률 없음(신규 발생)
+    matrix[2] = 0                       # 전 기간 0건
+    matrix[3, -1] = 200                 # 최근 월 급증
+    periods = np.arange(np.datetime64("2023-01"), np.datetime64("2025-01"))
+    return data_loader.DataIndex(["2급", "3급"], ["수두", "홍역", "페스트", "쯔쯔가무시증"], periods, matrix,
+                                 ["2급", "2급", "3급", "3급"])
+
+
+@pytest.mark.parametrize("alarms, level", [(0, "관심"), (1, "주의"), (2, "경계"), (3, "심각"), (4, "심각")])
+def test_alert_level_thresholds(alarms, level):
+    assert data_loader.alert_levels([alarms]).tolist() == [level]
+    assert data_loader.alert_color(level) == dict((n, c) for n, _, c in data_loader.ALERT_LEVELS)[level]
+
+
+def test_unknown_level_uses_the_lowest_color():
+    assert data_loader.alert_color("데이터 없음") == data_loader.ALERT_LEVELS[-1][2]
+
+
+def test_metric_cube_disease_and_grade_rows(index):
+    cube = data_loader.build_metric_cube(index, state_path=None)
+    assert list(cube.index) == ["수두", "홍역", "페스트", "쯔쯔가무시증", "2급", "3급"]
+    assert cube.loc["수두", "latest"] == 15 and cube.loc["수두", "delta_pct"] == pytest.approx(50.0)
+    assert np.isnan(cube.loc["홍역", "delta_pct"])
+    assert cube.loc["페스트", "delta_pct"] == 0.0 and cube.loc["페스트", "level"] == "관심"
+
+    # 등급 행은 소속 질병 행의 합으로 계산
+    for grade in index.grades:
+        rows = cube.loc[list(index.diseases_in(grade))]
+        assert cube.loc[grade, "grade"] == grade
+        assert cube.loc[grade, "latest"] == rows["latest"].sum()
+        assert cube.loc[grade, "prev"] == rows["prev"].sum()
+    grade = cube.loc["2급"]
+    assert grade["delta_pct"] == pytest.approx((grade["latest"] - grade["prev"]) * 100.0 / grade["prev"])
+
+    # 경보 수준은 경보를 낸 탐지 방법 수로 결정
+    assert cube["level"].tolist() == data_loader.alert_levels(cube["alarms"]).tolist()
+    assert cube.loc["쯔쯔가무시증", "alarms"] >= 2 and cube.loc["쯔쯔가무시증", "level"] in ("경계", "심각")
+    assert cube.loc["쯔쯔가무시증", "methods"]
+
+
+def test_metric_cube_without_periods_is_empty():
+    empty = data_loader.build_index(data_loader.empty_store())
+    cube = data_loader.build_metric_cube(empty, state_path=None)
+    assert cube.empty and "level" in cube.columns
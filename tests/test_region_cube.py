@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+
+import data_loader
+import region_cube
+from conftest import write_export
+
+MONTHS = 12
+SIDO_ROWS = [
+    ("서울", "제2급", "수두", [10] * MONTHS),
+    ("부산", "제2급", "수두", [4] * MONTHS),
+    ("부산", "제3급", "말라리아", [0] * 6 + [2] * 6),
+]
+SIGUNGU_ROWS = [
+    ("서울", "강남구", "제2급", "수두", [3] * MONTHS),
+    ("서울", "종로구", "제2급", "수두", [2] * MONTHS),
+    ("경기", "수원시", "제2급", "수두", [5] * MONTHS),
+    ("경기", "성남시", "제2급", "수두", [1, 2] * 6),
+    ("경기", "성남시", "제3급", "말라리아", [0] * 11 + [7]),
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    regions = tmp_path / region_cube.REGION_SUBDIR
+    write_export(regions, "20250101000000", 2024, SIDO_ROWS, lead=("시도",), prefix="시도별_")
+    # 시군구 파일에는 등급별 소계 행이 함께 들어감 (export_text)
+    write_export(regions, "20250101000000", 2024, SIGUNGU_ROWS, lead=("시도", "시군구"), prefix="시군구별_")
+    return tmp_path
+
+
+def parts(data_dir, block_size):
+    for path in region_cube.list_region_exports(data_dir):
+        yield from region_cube.iter_region_parts(path, block_size)
+
+
+def test_cube_hierarchy_and_totals(data_dir):
+    cube = region_cube.build_cube(parts(data_dir, 1 << 20))
+    assert cube.children() == ("경기", "부산", "서울")
+    assert cube.children("서울") == ("서울 강남구", "서울 종로구")
+    assert cube.children("부산") == ()
+    assert cube.label("경기 성남시") == "성남시"
+    assert cube.diseases == ("말라리아", "수두")
+    assert len(cube.periods) == MONTHS
+
+    # 시도 단위 행이 있으면 그 값 (시군구 합 5가 아니라 10), 없으면 시군구 합
+    assert (cube.series("서울", "수두") == 10).all()
+    np.testing.assert_array_equal(cube.series("경기", "수두"), np.array([6, 7] * 6))
+    # 전국 = 시도 합
+    for disease in cube.diseases:
+        expected = sum(cube.series(sido, disease) for sido in cube.children())
+        np.testing.assert_array_equal(cube.series("전국", disease), expected)
+    names, counts = cube.breakdown("경기", "말라리아")
+    assert dict(zip(names, counts.tolist())) == {"경기 수원시": 0, "경기 성남시": 7}
+
+
+def test_small_blocks_build_the_same_cube(data_dir):
+    whole = region_cube.build_cube(parts(data_dir, 1 << 20))
+    # 블록은 헤더 2행보다는 커야 함 (pyarrow 제약) - 그 밖에는 행 몇 개 단위로 나뉨
+    assert len(list(parts(data_dir, 256))) > 2
+    chunked = region_cube.build_cube(parts(data_dir, 256))
+    assert chunked.names == whole.names and chunked.diseases == whole.diseases
+    np.testing.assert_array_equal(chunked.matrix, whole.matrix)
+
+
+def test_load_region_cube_caches_by_export(data_dir):
+    cube = region_cube.load_region_cube(str(data_dir))
+    again = region_cube.load_region_cube(str(data_dir))
+    assert isinstance(again.matrix, np.memmap)
+    assert again.version == cube.version
+    assert region_cube.load_region_cube(str(data_dir / "missing")) is None
+
+
+def test_version_comes_from_export_digests(data_dir, monkeypatch):
+    cube = region_cube.load_region_cube(str(data_dir))
+    paths = region_cube.list_region_exports(str(data_dir))
+    manifest = data_loader.load_manifest()
+    assert all(os.path.abspath(p) in manifest for p in paths)
+
+    # 파일이 그대로면 다시 불러올 때 해시를 다시 계산하지 않음 (큐브 배열도 읽기만 함)
+    def no_hash(*args, **kwargs):
+        raise AssertionError("해시를 다시 계산함")
+    monkeypatch.setattr(data_loader, "file_digest", no_hash)
+    assert region_cube.load_region_cube(str(data_dir)).version == cube.version
+    monkeypatch.undo()
+
+    # 내용이 같으면 mtime이 바뀌어도 같은 버전, 내용이 바뀌면 새 버전
+    os.utime(paths[0], ns=(1, 1))
+    assert region_cube.load_region_cube(str(data_dir)).version == cube.version
+    rows = [(sido, grade, disease, [c + 1 for c in counts]) for sido, grade, disease, counts in SIDO_ROWS]
+    write_export(data_dir / region_cube.REGION_SUBDIR, "20250101000000", 2024, rows, lead=("시도",),
+                 prefix="시도별_")
+    changed = region_cube.load_region_cube(str(data_dir))
+    assert changed.version != cube.version
+    assert (changed.series("서울", "수두") == 11).all()
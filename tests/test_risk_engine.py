@@ -0,0 +1,86 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+import risk_engine
+from risk_engine import AGE_GROUPS, CONDITIONS, JOBS, VACCINES
+
+
+def old_score(age_g, job, conds, vax):
+    """원래 app.py My Page의 if 문 그대로 (비교 기준)."""
+    warns = []
+    if age_g == "10대 미만":
+        warns.append(("소아/영유아", "수두, 홍역, 유행성이하선염 등 단체생활 감염병 주의"))
+    if age_g == "60대 이상":
+        warns.append(("고령층", "인플루엔자(독감), 폐렴구균 감염 시 중증화 위험 높음"))
+    if "당뇨병" in conds or "고혈압" in conds or "심혈관 질환" in conds:
+        warns.append(("만성질환 보유", "기저질환자는 코로나19 및 독감 등 호흡기 감염병에 취약함"))
+    if "천식" in conds or "호흡기 질환" in conds:
+        warns.append(("호흡기계 취약", "미세먼지 농도가 높은 날 외출 자제 및 마스크 착용 필수"))
+    if "의료직" in job:
+        warns.append(("직업적 고위험(의료)", "결핵, 혈액매개감염병(B형간염, C형간염) 노출 주의"))
+    if "학생" in job or "교육/보육" in job:
+        warns.append(("단체 생활군", "인플루엔자, 수두, 결막염 등 유행성 질환 확산 주의"))
+    if "요식업" in job:
+        warns.append(("식품 위생", "A형간염, 장티푸스, 노로바이러스 등 수인성 감염병 예방 필요"))
+
+    rec_vax = []
+    if "독감" not in vax: rec_vax.append("인플루엔자(독감)")
+    if "파상풍" not in vax: rec_vax.append("파상풍(10년 주기)")
+    if (age_g == "60대 이상") and ("폐렴구균" not in vax): rec_vax.append("폐렴구균")
+    return warns, rec_vax
+
+
+def profiles(per_pair=6, seed=0):
+    rng = random.Random(seed)
+    for age, job in itertools.product(AGE_GROUPS, JOBS):
+        yield age, job, [], []
+        for _ in range(per_pair):
+            yield (age, job, rng.sample(CONDITIONS, rng.randint(0, len(CONDITIONS))),
+                   rng.sample(VACCINES, rng.randint(0, len(VACCINES))))
+
+
+def test_score_profile_matches_old_rules():
+    for age, job, conds, vax in profiles():
+        assert risk_engine.score_profile(age, job, conds, vax) == old_score(age, job, conds, vax)
+
+
+def test_score_roster_matches_score_profile():
+    rows = list(profiles())
+    roster = pd.DataFrame({
+        "연령대": [age for age, _, _, _ in rows],
+        "직업군": [job for _, job, _, _ in rows],
+        "기저질환": [", ".join(conds) for _, _, conds, _ in rows],
+        "접종이력": ["; ".join(vax) for _, _, _, vax in rows],
+    })
+    out, summary = risk_engine.score_roster(roster)
+    for (age, job, conds, vax), (_, row) in zip(rows, out.iterrows()):
+        warns, rec_vax = old_score(age, job, conds, vax)
+        assert row["주의 요인"] == ", ".join(title for title, _ in warns)
+        assert row["주의 요인 수"] == len(warns)
+        assert row["권장 백신"] == ", ".join(rec_vax)
+        assert row["확인 필요"] == ""
+    counts = dict(zip(summary["항목"], summary["인원"]))
+    assert counts["고령층"] == (roster["연령대"] == "60대 이상").sum()
+
+
+def test_score_roster_reports_unknown_values_and_aliases():
+    roster = pd.DataFrame({
+        "age_group": ["60대 이상", "70대"],
+        "job": ["의료직", "교육/보육"],
+        "conditions": ["천식|통풍", None],
+    })
+    out, _ = risk_engine.score_roster(roster)
+    assert out.loc[0, "주의 요인"] == "고령층, 호흡기계 취약, 직업적 고위험(의료)"
+    assert out.loc[0, "확인 필요"] == "conditions: 통풍"
+    assert out.loc[1, "주의 요인"] == "단체 생활군"
+    assert out.loc[1, "확인 필요"] == "age_group: 70대"
+    # 접종이력 열이 없으면 모두 미접종으로 봄
+    assert out.loc[1, "권장 백신"] == "인플루엔자(독감), 파상풍(10년 주기)"
+
+
+def test_score_roster_requires_age_and_job():
+    with pytest.raises(ValueError, match="직업군"):
+        risk_engine.score_roster(pd.DataFrame({"연령대": ["10대"]}))
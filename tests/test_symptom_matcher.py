@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from symptom_matcher import SYMPTOM_DB, SymptomMatcher
+
+
+def old_detect(prompt, all_diseases, symptom_db=SYMPTOM_DB):
+    """원래 app.py 💬 AI 의료 상담의 이중 루프 (비교 기준). 의심 질병 집합."""
+    detected_diseases = []
+    for disease, keywords in symptom_db.items():
+        if any(disease in d for d in all_diseases):
+            for keyword in keywords:
+                if keyword in prompt:
+                    detected_diseases.append(disease)
+                    break
+    return set(detected_diseases)
+
+
+def nested_rank(prompt, all_diseases, symptom_db=SYMPTOM_DB):
+    # 같은 이중 루프로 질병별 일치 키워드를 모아 (일치 수 내림차순, 사전 순서)로 정렬
+    hits = {disease: {k for k in keywords if k in prompt} for disease, keywords in symptom_db.items()
+            if any(disease in d for d in all_diseases)}
+    order = list(symptom_db)
+    return [(d, ks) for d, ks in sorted(hits.items(), key=lambda item: (-len(item[1]), order.index(item[0])))
+            if ks]
+
+
+ALL_DISEASES = list(SYMPTOM_DB)
+KEYWORDS = sorted({k for ks in SYMPTOM_DB.values() for k in ks})
+FILLERS = ["이", "가", "요", "고", " ", "어제부터", "계속", "나요", "심해요", "로", "같아요", "색"]
+
+
+def random_prompts(n=500, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        parts = rng.sample(KEYWORDS, rng.randint(0, 5)) + rng.sample(FILLERS, rng.randint(1, 4))
+        rng.shuffle(parts)
+        yield "".join(parts) if rng.random() < 0.5 else " ".join(parts)
+
+
+def check(matcher, prompt, all_diseases):
+    result = matcher.match(prompt)
+    assert {d for d, _ in result} == old_detect(prompt, all_diseases), prompt
+    expected = nested_rank(prompt, all_diseases)
+    assert [d for d, _ in result] == [d for d, _ in expected], prompt
+    assert [set(ks) for _, ks in result] == [ks for _, ks in expected], prompt
+
+
+def test_matches_nested_loops_on_random_prompts():
+    matcher = SymptomMatcher(available_diseases=ALL_DISEASES)
+    for prompt in random_prompts():
+        check(matcher, prompt, ALL_DISEASES)
+
+
+@pytest.mark.parametrize("prompt", [
+    "복통 없는 설사가 계속돼요",           # '복통 없는 설사' 안에 '복통', '설사'
+    "발작적 기침과 심한 기침이 나요",       # 두 키워드가 모두 '기침'을 포함
+    "지속적인 발열이 있고 피로해요",        # '발열' ⊂ '지속적인 발열', '피' ⊂ '피로'
+    "검은 딱지가 생겼어요",                 # '딱지' ⊂ '검은 딱지'
+    "고열고열고열",                         # 같은 키워드 반복
+    "회사에서 에어컨 바람을 쐬었어요",       # '회' ⊂ '회사'
+    "",
+])
+def test_matches_nested_loops_on_overlapping_keywords(prompt):
+    check(SymptomMatcher(available_diseases=ALL_DISEASES), prompt, ALL_DISEASES)
+
+
+def test_disease_filter_uses_substring_of_data_names():
+    # 데이터의 질병명에 사전 질병명이 포함되면 사용 (예: '코로나바이러스감염증-19'는 '코로나19'를 포함하지 않음)
+    available = ["결핵", "A형간염", "코로나바이러스감염증-19", "말라리아(삼일열)"]
+    matcher = SymptomMatcher(available_diseases=available)
+    assert matcher.diseases == ("결핵", "A형간염", "말라리아")
+    for prompt in list(random_prompts(200, seed=1)) + ["모기에 물리고 고열과 오한", "기침에 피가 섞여요"]:
+        check(matcher, prompt, available)
+    assert SymptomMatcher(available_diseases=[]).match("고열 기침 발진") == []